@@ -0,0 +1,76 @@
+"""
+Copyright 2022-present fretgfr
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+"""
+Compares `utils.fuzzy.NGramIndex.search` to a plain `difflib.get_close_matches` scan.
+
+Run from the repository root with `python -m benchmarks.fuzzy_bench`.
+"""
+import argparse
+import difflib
+import random
+import string
+import time
+
+from utils.fuzzy import NGramIndex
+
+
+def main(size: int, lookups: int, seed: int) -> None:
+    rng = random.Random(seed)
+    names = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 16))) for _ in range(size)]
+
+    # Every query is a name with one letter changed, like a typo of a tag name.
+    queries = []
+    for name in rng.sample(names, lookups):
+        typo = list(name)
+        typo[rng.randrange(len(typo))] = rng.choice(string.ascii_lowercase)
+        queries.append("".join(typo))
+
+    start = time.perf_counter()
+    index = NGramIndex(names)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    indexed = (time.perf_counter() - start) / lookups
+
+    # The plain scan is slow enough that a sample of the queries is plenty.
+    naive_lookups = max(lookups // 20, 1)
+    start = time.perf_counter()
+    for query in queries[:naive_lookups]:
+        difflib.get_close_matches(query, names, n=3)
+    naive = (time.perf_counter() - start) / naive_lookups
+
+    print(f"{size:,} names, index built in {build * 1000:.1f} ms")
+    print(f"NGramIndex.search:         {indexed * 1000:.3f} ms per lookup")
+    print(f"difflib.get_close_matches: {naive * 1000:.3f} ms per lookup ({naive / indexed:,.0f}x slower)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=50_000, help="number of names to index")
+    parser.add_argument("--lookups", type=int, default=1_000, help="number of queries to time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.size, args.lookups, args.seed)
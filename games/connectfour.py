@@ -31,6 +31,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from utils.views import TrackedView
+
 
 # BRRRRT
 class NumEmotes(Enum):
@@ -123,7 +125,7 @@ class ConnectFourBoard:
         return False
 
 
-class ConnectFourInput(discord.ui.View):
+class ConnectFourInput(TrackedView):
     message: discord.Message
 
     def __init__(self, player_one: discord.Member, player_two: discord.Member) -> None:
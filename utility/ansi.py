@@ -33,6 +33,10 @@ import typing
 import discord
 from discord.ext import commands
 
+from utils.views import TrackedView
+
+ANSI_MAKER_TIMEOUT = 600 # seconds an AnsiMaker can go unused before its buttons are removed
+
 _logger = logging.getLogger(__name__)
 
 """
@@ -138,9 +142,9 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-class AnsiMaker(discord.ui.View):
+class AnsiMaker(TrackedView):
     def __init__(self, ctx, text):
-        super().__init__(timeout=None)
+        super().__init__(timeout=ANSI_MAKER_TIMEOUT)
         self.ctx = ctx
         self.msg = None
         self.text = text
@@ -186,6 +190,13 @@ class AnsiMaker(discord.ui.View):
             self.code = ''
             await interaction.response.edit_message(content=f'```ansi\n{self.code}{self.text}\u001b[0m\n```', view=self, allowed_mentions=discord.AllowedMentions.none())
 
+    async def on_timeout(self) -> None:
+        if self.msg is not None:
+            try:
+                await self.msg.edit(view=None)
+            except discord.NotFound:
+                pass
+
     async def interaction_check(self, interaction: discord.Interaction):
         if interaction.user != self.ctx.author:
             await interaction.response.send_message('This is not your interaction!', ephemeral=True)
@@ -200,6 +211,7 @@ class AnsiMaker(discord.ui.View):
     @discord.ui.button(label='Delete', style=discord.ButtonStyle.danger)
     async def delete(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.message.delete()
+        self.stop()
 
     @discord.ui.button(label='Bold', style=discord.ButtonStyle.primary)
     async def bolder(self, interaction: discord.Interaction, button: discord.ui.Button):
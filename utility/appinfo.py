@@ -34,6 +34,8 @@ import discord
 from discord.ext import commands
 from discord.utils import format_dt
 
+from utils.views import registry as view_registry
+
 """
 This module optionally uses the `psutil` pip package to display system information.
 
@@ -131,6 +133,10 @@ class ApplicationInformationCog(commands.Cog):
         to_run = functools.partial(self._generate_embed, app_info)
         embed = await asyncio.to_thread(to_run)
 
+        # Read here rather than in the thread, views are added and removed on the event loop.
+        live_views = "\n".join(f"{name}: {count:,}" for name, count in sorted(view_registry.counts().items()))
+        embed.add_field(name=f"Live Views ({len(view_registry):,})", value=live_views or "None", inline=False)
+
         end = time.perf_counter()
         embed.set_footer(text=f"Command took {end-start:.2f}s")
         embed.timestamp = discord.utils.utcnow()
@@ -23,17 +23,460 @@ SOFTWARE.
 """
 TODOS: Refactor error handling?
 """
+import asyncio
+import datetime
 import io
 import logging
+import statistics
+import time
 import traceback
+import typing
+from dataclasses import dataclass, field
 
-from discord.ext import commands
+import asqlite
+import discord
+from discord.ext import commands, tasks
+
+from utils.db import transaction
+from utils.extensions import ExtensionWatcher, LazyCommand, LoadTimes, ReloadResult, lazy_commands, load_extension_timed, reload_extensions
+from utils.migrations import apply_migrations
+from utils.paginators import TextFilePageSource, send_text
 
 _logger = logging.getLogger(__name__)
 
+DB_FILENAME = "extensions.sqlite"
+
+EXTENSIONS_MIGRATIONS = [
+    # 1: How long each extension took to load at each startup, run_id is when the startup began.
+    """
+    CREATE TABLE IF NOT EXISTS loadtimes (
+        run_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        import_time REAL NOT NULL,
+        setup_time REAL NOT NULL,
+        cog_load_time REAL NOT NULL,
+        slowest_import TEXT NULL DEFAULT NULL,
+        slowest_import_time REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (run_id, name)
+    );
+    CREATE INDEX IF NOT EXISTS loadtimes_name_idx ON loadtimes (name, run_id);
+    """,
+]
+
+LOAD_TIMES_KEPT = 50 # startups whose load times are kept
+LOAD_TIMES_BASELINE = 5 # earlier startups compared against to spot regressions
+REGRESSION_RATIO = 1.25 # slower than the baseline by this much counts as a regression...
+REGRESSION_MIN = 0.005 # ...as long as it's also at least this many seconds slower
+
+WATCH_INTERVAL = 1.0 # seconds between checks for changed extension files
+WATCH_DEBOUNCE = 2.0 # seconds without further changes before changed extensions are reloaded
+
+def _write_results(results: typing.Iterable[ReloadResult], summary: typing.TextIO, tracebacks: typing.TextIO) -> None:
+    # Writes a line per extension to `summary`, slowest first, and the traceback of each failure to `tracebacks`.
+    for result in sorted(results, key=lambda result: result.elapsed, reverse=True):
+        if result.blocked_by is not None:
+            summary.write(f"{result.name} was not reloaded, {result.blocked_by} failed.\n")
+        elif isinstance(result.error, commands.ExtensionNotFound):
+            summary.write(f"{result.name} not found.\n")
+        elif isinstance(result.error, commands.ExtensionNotLoaded):
+            summary.write(f"{result.name} is not loaded.\n")
+        elif isinstance(result.error, commands.NoEntryPointError):
+            summary.write(f"{result.name} has no entry point.\n")
+        elif result.error is not None:
+            summary.write(f"{result.name} failed to load, kept the previous version.\n")
+
+            error = getattr(result.error, 'original', result.error)
+
+            tracebacks.write(f"{result.name}:\n")
+            traceback.print_exception(type(error), error, error.__traceback__, file=tracebacks)
+        else:
+            summary.write(f"{result.name} reloaded successfully in {result.elapsed * 1000:.0f}ms.\n")
+
+@dataclass(slots=True)
+class LoadTimesRecord:
+    run_id: int # UTC TIMESTAMP of the startup
+    name: str
+    import_time: float
+    setup_time: float
+    cog_load_time: float
+    slowest_import: typing.Optional[str]
+    slowest_import_time: float
+
+    @property
+    def total(self) -> float:
+        return self.import_time + self.setup_time + self.cog_load_time
+
+    @classmethod
+    async def record_run(cls, run_id: int, times: typing.Iterable[LoadTimes]) -> None:
+        """coro that saves a startup's load times, and forgets startups older than the last `LOAD_TIMES_KEPT`."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur, transaction(db):
+                await cur.executemany("""
+                INSERT OR REPLACE INTO loadtimes (run_id, name, import_time, setup_time, cog_load_time, slowest_import, slowest_import_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [(run_id, t.name, t.import_time, t.setup_time, t.cog_load_time, t.slowest_import, t.slowest_import_time) for t in times])
+                await cur.execute("""DELETE FROM loadtimes WHERE run_id NOT IN
+                (SELECT DISTINCT run_id FROM loadtimes ORDER BY run_id DESC LIMIT ?)""", LOAD_TIMES_KEPT)
+
+    @classmethod
+    async def latest_runs(cls, limit: int) -> "typing.List[typing.List[LoadTimesRecord]]":
+        """coro that gets the load times of the latest `limit` startups, newest first."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("""SELECT * FROM loadtimes WHERE run_id IN
+                (SELECT DISTINCT run_id FROM loadtimes ORDER BY run_id DESC LIMIT ?) ORDER BY run_id DESC""", limit)
+
+                res = await cur.fetchall()
+
+        runs: typing.Dict[int, typing.List[LoadTimesRecord]] = {}
+        for row in res:
+            runs.setdefault(row["run_id"], []).append(cls(**row))
+        return list(runs.values())
+
+    @classmethod
+    async def history(cls, name: str, limit: int) -> "typing.List[LoadTimesRecord]":
+        """coro that gets an extension's load times from the latest `limit` startups it was loaded in, newest first."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT * FROM loadtimes WHERE name = ? ORDER BY run_id DESC LIMIT ?", name, limit)
+
+                res = await cur.fetchall()
+
+        return [cls(**row) for row in res]
+
+@dataclass(slots=True)
+class LazyExtension:
+    """An extension waiting for one of its commands to be used before it's loaded."""
+    name: str
+    stubs: typing.List[commands.Command] # stand ins for its commands, removed once it's loaded
+    register_time: float # seconds spent finding its commands and adding the stubs
+    load_time: typing.Optional[float] = None # seconds loading it took, what startup saved by not loading it then
+    first_call: typing.Optional[float] = None # seconds its first command waited on it being loaded
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+def _totals_by_name(runs: typing.Iterable[typing.Iterable[LoadTimesRecord]]) -> typing.Dict[str, typing.List[float]]:
+    totals: typing.Dict[str, typing.List[float]] = {}
+    for run in runs:
+        for record in run:
+            totals.setdefault(record.name, []).append(record.total)
+    return totals
+
 class ExtManagement(commands.Cog):
+    """Extension management.
+
+    To load rarely used extensions only when they're first needed, load this extension first, then use
+    `await bot.get_cog("ExtManagement").load_lazily(name)` instead of `bot.load_extension(name)` for them.
+
+    To keep track of how long each extension takes to load, load this extension first, then load the rest
+    with `await bot.get_cog("ExtManagement").load_extensions_timed(names)`.
+    """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.lazy: typing.Dict[str, LazyExtension] = {} # extension name -> what's known about loading it lazily
+        self.watcher = ExtensionWatcher(bot)
+        self.watch_owner: typing.Optional[discord.abc.User] = None # who turned watching on, reload summaries are sent to them
+        self._changed: typing.Set[str] = set() # modules changed since the last reload
+        self._last_change = 0.0
+
+    async def cog_load(self) -> None:
+        async with asqlite.connect(DB_FILENAME) as db:
+            await apply_migrations(db, EXTENSIONS_MIGRATIONS)
+
+    async def cog_unload(self) -> None:
+        # Let a reload that's under way finish, it may be the one reloading this extension.
+        self.watch_loop.stop()
+
+    async def load_extensions_timed(self, names: typing.Iterable[str]) -> typing.List[LoadTimes]:
+        """coro that loads extensions one at a time, timing each one's import, setup and cog_load, and saves the
+        times so `loadtimes` can compare them with earlier startups.
+
+        An extension that fails to load is logged and skipped, like a failure wouldn't stop the others loading.
+
+        Parameters
+        ----------
+        names : Iterable[str]
+            The extensions to load.
+
+        Returns
+        -------
+        List[LoadTimes]
+            The times of the extensions that loaded.
+        """
+        run_id = int(discord.utils.utcnow().timestamp())
+        times: typing.List[LoadTimes] = []
+        for name in names:
+            try:
+                times.append(await load_extension_timed(self.bot, name))
+            except commands.ExtensionError:
+                _logger.exception(f"Loading extension {name} failed")
+
+        await LoadTimesRecord.record_run(run_id, times)
+        _logger.info(f"Loaded {len(times)} extensions in {sum(t.total for t in times):.2f}s")
+        return times
+
+    @tasks.loop(seconds=WATCH_INTERVAL)
+    async def watch_loop(self) -> None:
+        if self.watcher.extensions != self.bot.extensions.keys(): # Loaded or unloaded since it last looked.
+            await asyncio.to_thread(self.watcher.track)
+
+        changed = await asyncio.to_thread(self.watcher.scan)
+        if changed:
+            # Editors often save several files, or one file several times, so wait for changes to settle.
+            self._changed |= changed
+            self._last_change = time.monotonic()
+            return
+
+        if not self._changed or time.monotonic() - self._last_change < WATCH_DEBOUNCE:
+            return
+
+        modules, self._changed = self._changed, set()
+        names = await asyncio.to_thread(self.watcher.affected, modules)
+        _logger.info(f"Reloading {names} after changes to {modules}")
+
+        results = await reload_extensions(self.bot, names, changed=modules)
+        await asyncio.to_thread(self.watcher.track) # Anything newly imported.
+
+        summary = io.StringIO()
+        tracebacks = io.StringIO()
+        summary.write(f"Changed: {', '.join(sorted(modules))}\n")
+        _write_results(results, summary, tracebacks)
+        if type(self).__module__ in names:
+            summary.write("This extension was reloaded, so watching stopped. Use watchextensions to start it again.\n")
+
+        if self.watch_owner is not None:
+            content = summary.getvalue()
+            files = [discord.File(io.BytesIO(tracebacks.getvalue().encode()), filename="tracebacks.txt")] if tracebacks.getvalue() else []
+            if len(content) > 2000:
+                files.append(discord.File(io.BytesIO(content.encode()), filename="reload.txt"))
+                content = "Reloaded changed extensions, see reload.txt."
+            try:
+                await self.watch_owner.send(content, files=files)
+            except discord.HTTPException:
+                _logger.warning(f"Couldn't send the reload summary to {self.watch_owner}", exc_info=True)
+
+    @watch_loop.error
+    async def watch_loop_error(self, error: BaseException) -> None:
+        _logger.error("Watching extension files failed, stopped watching", exc_info=error)
+
+    @commands.command(aliases=("watchexts", ))
+    @commands.is_owner()
+    async def watchextensions(self, ctx: commands.Context, enabled: typing.Optional[bool] = None) -> None:
+        """Reloads extensions when their files change, along with the extensions that depend on them.
+
+        A summary of each reload is sent to you in DMs.
+
+        Parameters
+        -----------
+        enabled: Optional[bool]
+            Whether to watch for changes. Switches watching on or off if not given.
+        """
+        if enabled is None:
+            enabled = not self.watch_loop.is_running()
+
+        if not enabled:
+            self.watch_loop.cancel()
+            self._changed.clear()
+            await ctx.send("Stopped watching extension files.")
+            return
+
+        self.watch_owner = ctx.author
+        await asyncio.to_thread(self.watcher.track)
+        if not self.watch_loop.is_running():
+            self.watch_loop.start()
+        await ctx.send(f"Watching the files of {len(self.bot.extensions)} extensions, and the modules they import, for changes.")
+
+    async def load_lazily(self, name: str) -> bool:
+        """coro that adds stand in commands for an extension, which load it the first time one is used.
+
+        Extensions that need to be loaded from the start, because they have listeners, app commands or tasks,
+        are loaded straight away instead.
+
+        Parameters
+        ----------
+        name : str
+            The extension to load.
+
+        Returns
+        -------
+        bool
+            Whether the extension will be loaded later.
+
+        Raises
+        ------
+        commands.ExtensionError
+            The extension couldn't be found, or it was loaded straight away and failed.
+        commands.CommandRegistrationError
+            One of its commands' names is already taken.
+        """
+        if name in self.bot.extensions or name in self.lazy:
+            raise commands.ExtensionAlreadyLoaded(name)
+
+        start = time.perf_counter()
+        found = await asyncio.to_thread(lazy_commands, name)
+        if found is None:
+            _logger.info(f"Extension {name} can't be loaded lazily, loading it now")
+            await self.bot.load_extension(name)
+            return False
+
+        extension = LazyExtension(name, [], 0.0)
+        try:
+            for command in found:
+                extension.stubs.append(stub := self._make_stub(extension, command))
+                self.bot.add_command(stub)
+        except commands.CommandRegistrationError:
+            self._remove_stubs(extension)
+            raise
+
+        extension.register_time = time.perf_counter() - start
+        self.lazy[name] = extension
+        _logger.info(f"Extension {name} will be loaded when one of {[command.name for command in found]} is used")
+        return True
+
+    def _make_stub(self, extension: LazyExtension, command: LazyCommand) -> commands.Command:
+        async def stub(ctx: commands.Context, *, args: str = "") -> None:
+            start = time.perf_counter()
+            await self._load_lazy(extension)
+
+            real_ctx = await self.bot.get_context(ctx.message) # Now finds the extension's own command.
+            if extension.first_call is None:
+                extension.first_call = time.perf_counter() - start
+            await self.bot.invoke(real_ctx)
+
+        help = f"{command.help or ''}\n\nLoads {extension.name} the first time it's used.".strip()
+        return commands.Command(stub, name=command.name, aliases=command.aliases, help=help)
+
+    def _remove_stubs(self, extension: LazyExtension) -> None:
+        for stub in extension.stubs:
+            if self.bot.get_command(stub.name) is stub:
+                self.bot.remove_command(stub.name)
+
+    async def _load_lazy(self, extension: LazyExtension) -> None:
+        # Swaps an extension's stubs for the extension, putting them back if it fails to load.
+        async with extension.lock: # A command used again while the first use is loading it waits for it.
+            if extension.name in self.bot.extensions:
+                return
+
+            self._remove_stubs(extension)
+            start = time.perf_counter()
+            try:
+                await self.bot.load_extension(extension.name)
+            except BaseException:
+                for stub in extension.stubs:
+                    self.bot.add_command(stub)
+                raise
+
+            extension.load_time = time.perf_counter() - start
+            _logger.info(f"Loaded extension {extension.name} lazily in {extension.load_time * 1000:.1f}ms")
+
+    @commands.command(aliases=("lazyext", ))
+    @commands.is_owner()
+    async def lazyloadextension(self, ctx: commands.Context, *, ext_name: str) -> None:
+        """Loads an extension the first time one of its commands is used.
+
+        Parameters
+        -----------
+        ext_name: str
+            The extension path to load.
+        """
+        try:
+            if await self.load_lazily(ext_name):
+                commands_list = ", ".join(stub.name for stub in self.lazy[ext_name].stubs)
+                await ctx.send(f"{ext_name} will be loaded when one of its commands is used: {commands_list}")
+            else:
+                await ctx.send(f"{ext_name} has listeners, app commands or tasks, so it was loaded now.")
+        except commands.ExtensionNotFound:
+            await ctx.send(f"{ext_name} not found.")
+        except commands.ExtensionAlreadyLoaded:
+            await ctx.send(f"{ext_name} is already loaded.")
+        except commands.CommandRegistrationError as error:
+            await ctx.send(f"{ext_name} can't be loaded lazily, its command {error.name} is already taken.")
+        except commands.ExtensionError as error:
+            await ctx.send(f"{ext_name} failed to load:")
+
+            buff = TextFilePageSource()
+            error = getattr(error, 'original', error)
+
+            traceback.print_exception(type(error), error, error.__traceback__, file=buff)
+
+            await send_text(ctx, buff, filename=f"{ext_name}.txt")
+
+    @commands.command(aliases=("lazyexts", ))
+    @commands.is_owner()
+    async def lazyextensions(self, ctx: commands.Context) -> None:
+        """Shows the extensions being loaded lazily, what startup saved, and how long their first use waited."""
+        if not self.lazy:
+            await ctx.send("No extensions are being loaded lazily.")
+            return
+
+        def ms(seconds: typing.Optional[float]) -> str:
+            return "-" if seconds is None else f"{seconds * 1000:.1f}ms"
+
+        width = max(len(name) for name in self.lazy)
+        table = TextFilePageSource()
+        table.write(f"{'Extension':<{width}}  {'State':<7}  {'Stubs':>8}  {'Load':>8}  {'1st call':>8}\n")
+        for extension in self.lazy.values():
+            state = "loaded" if extension.name in self.bot.extensions else "waiting"
+            table.write(f"{extension.name:<{width}}  {state:<7}  {ms(extension.register_time):>8}  {ms(extension.load_time):>8}  {ms(extension.first_call):>8}\n")
+
+        loaded = [extension for extension in self.lazy.values() if extension.load_time is not None]
+        waiting = len(self.lazy) - len(loaded)
+        saved = sum(extension.load_time for extension in loaded) - sum(extension.register_time for extension in self.lazy.values())
+        table.write(f"\nStartup saved {ms(saved)} on the extensions loaded since, plus all of the load time of {waiting} not loaded yet.")
+
+        await send_text(ctx, table, filename="lazy.txt")
+
+    @commands.command(aliases=("loadtimes", ))
+    @commands.is_owner()
+    async def extensionloadtimes(self, ctx: commands.Context, *, ext_name: typing.Optional[str] = None) -> None:
+        """Shows how long each extension took to load at the latest startup, slowest first,
+        compared with the startups before it.
+
+        Parameters
+        -----------
+        ext_name: Optional[str]
+            An extension to show the load times of across startups instead.
+        """
+        def ms(seconds: float) -> str:
+            return f"{seconds * 1000:.1f}ms"
+
+        table = TextFilePageSource()
+
+        if ext_name is not None:
+            history = await LoadTimesRecord.history(ext_name, LOAD_TIMES_KEPT)
+            if not history:
+                await ctx.send(f"No load times recorded for {ext_name}.")
+                return
+
+            table.write(f"{'Startup':<16}  {'Import':>9}  {'Setup':>9}  {'cog_load':>9}  {'Total':>9}  Slowest import\n")
+            for record in history:
+                started = datetime.datetime.fromtimestamp(record.run_id, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M")
+                slowest = f"{record.slowest_import} ({ms(record.slowest_import_time)})" if record.slowest_import else "-"
+                table.write(f"{started:<16}  {ms(record.import_time):>9}  {ms(record.setup_time):>9}  {ms(record.cog_load_time):>9}  {ms(record.total):>9}  {slowest}\n")
+
+            await send_text(ctx, table, filename=f"{ext_name}-loadtimes.txt")
+            return
+
+        runs = await LoadTimesRecord.latest_runs(LOAD_TIMES_BASELINE + 1)
+        if not runs:
+            await ctx.send("No load times recorded yet, load extensions with `ExtManagement.load_extensions_timed` at startup.")
+            return
+
+        latest, earlier = runs[0], runs[1:]
+        baselines = {name: statistics.median(totals) for name, totals in _totals_by_name(earlier).items()}
+
+        width = max(len(record.name) for record in latest)
+        table.write(f"{'Extension':<{width}}  {'Import':>9}  {'Setup':>9}  {'cog_load':>9}  {'Total':>9}  {'Baseline':>9}  Slowest import\n")
+        for record in sorted(latest, key=lambda record: record.total, reverse=True):
+            baseline = baselines.get(record.name)
+            regressed = baseline is not None and record.total > baseline * REGRESSION_RATIO and record.total - baseline >= REGRESSION_MIN
+            slowest = f"{record.slowest_import} ({ms(record.slowest_import_time)})" if record.slowest_import else "-"
+            table.write(
+                f"{record.name:<{width}}  {ms(record.import_time):>9}  {ms(record.setup_time):>9}  {ms(record.cog_load_time):>9}  {ms(record.total):>9}  "
+                f"{ms(baseline) if baseline is not None else '-':>9}  {slowest}{'  <- slower' if regressed else ''}\n"
+            )
+
+        table.write(f"\nTotal {ms(sum(record.total for record in latest))}. Baseline is the median of the {len(earlier)} startups before this one.")
+        await send_text(ctx, table, filename="loadtimes.txt")
 
     @commands.command()
     @commands.is_owner()
@@ -63,60 +506,43 @@ class ExtManagement(commands.Cog):
         except commands.NoEntryPointError:
             await ctx.send(f"{ext_name} has no entry point.")
         except commands.ExtensionFailed as error:
-            buff = io.StringIO()
+            buff = TextFilePageSource()
             error = getattr(error, 'original', error)
 
             traceback.print_exception(type(error), error, error.__traceback__, file=buff)
 
-            buff.seek(0) # Back to start
-            paginator = commands.Paginator()
-            for line in buff:
-                paginator.add_line(line)
             await ctx.send(f"{ext_name} failed to load:")
-            for page in paginator.pages:
-                await ctx.send(page)
+            await send_text(ctx, buff, filename=f"{ext_name}.txt")
 
     @commands.command(aliases=("rlexts", ))
     @commands.is_owner()
     async def reloadallextensions(self, ctx: commands.Context, db_manager: bool=False) -> None:
         """Reloads all extensions that are currently loaded.
 
+        Extensions are reloaded after the ones they import, and ones that don't depend on each other are reloaded at the same time.
+        An extension that fails keeps its previously loaded version, and the ones depending on it aren't reloaded.
+
         Parameters
         -----------
         db_manager: bool
             Whether to reload the db_manager cog. Defaults to False.
         """
         _logger.info(f"Reloading all extensions from command {db_manager=}")
-        extensions_list = [item for item in self.bot.extensions]
-        output_str = ""
-        for extension in extensions_list:
-            if not db_manager:
-                if "dbmanager" in extension:
-                    continue
-            try:
-                await self.bot.reload_extension(extension)
-                output_str += f"{extension} reloaded successfully.\n"
-            except commands.ExtensionNotFound:
-                output_str += f"{extension} not found.\n"
-            except commands.ExtensionAlreadyLoaded:
-                output_str += f"{extension} is already loaded.\n"
-            except commands.NoEntryPointError:
-                output_str += f"{extension} has no entry point.\n"
-            except commands.ExtensionFailed as error:
-                output_str += f"{extension} failed to load.\n"
-
-                buff = io.StringIO()
-                error = getattr(error, 'original', error)
-
-                traceback.print_exception(type(error), error, error.__traceback__, file=buff)
-
-                buff.seek(0) # Back to start
-                paginator = commands.Paginator()
-                for line in buff:
-                    paginator.add_line(line)
-                for page in paginator.pages:
-                    await ctx.send(page)
-        await ctx.send(output_str)
+        extensions_list = [item for item in self.bot.extensions if db_manager or "dbmanager" not in item]
+
+        start = time.perf_counter()
+        results = await reload_extensions(self.bot, extensions_list)
+        elapsed = time.perf_counter() - start
+
+        summary = TextFilePageSource()
+        tracebacks = TextFilePageSource() # Every failure's traceback, sent after the summary.
+        _write_results(results, summary, tracebacks)
+
+        reloaded = sum(result.ok for result in results)
+        summary.write(f"\nReloaded {reloaded}/{len(results)} extensions in {elapsed:.2f}s ({sum(result.elapsed for result in results):.2f}s if done one at a time).")
+
+        await send_text(ctx, summary, filename="reload.txt")
+        await send_text(ctx, tracebacks, filename="tracebacks.txt")
 
     @commands.command(aliases=("lext", ))
     @commands.is_owner()
@@ -133,7 +559,10 @@ class ExtManagement(commands.Cog):
         await ctx.send(f"Loading extension: {ext_name}")
 
         try:
-            await self.bot.load_extension(ext_name)
+            if (lazy := self.lazy.get(ext_name)) is not None and ext_name not in self.bot.extensions:
+                await self._load_lazy(lazy)
+            else:
+                await self.bot.load_extension(ext_name)
             await ctx.send(f"{ext_name} loaded successfully.")
         except commands.ExtensionNotFound:
             await ctx.send(f"{ext_name} not found.")
@@ -144,17 +573,12 @@ class ExtManagement(commands.Cog):
         except commands.ExtensionFailed as error:
             await ctx.send(f"{ext_name} failed to load:")
 
-            buff = io.StringIO()
+            buff = TextFilePageSource()
             error = getattr(error, 'original', error)
 
             traceback.print_exception(type(error), error, error.__traceback__, file=buff)
 
-            buff.seek(0) # Back to start
-            paginator = commands.Paginator()
-            for line in buff:
-                paginator.add_line(line)
-            for page in paginator.pages:
-                await ctx.send(page)
+            await send_text(ctx, buff, filename=f"{ext_name}.txt")
 
     @commands.command(aliases=("ulext", ))
     @commands.is_owner()
@@ -170,6 +594,11 @@ class ExtManagement(commands.Cog):
 
         await ctx.send(f"Unloading extension: {ext_name}")
 
+        if (lazy := self.lazy.pop(ext_name, None)) is not None and ext_name not in self.bot.extensions:
+            self._remove_stubs(lazy)
+            await ctx.send(f"{ext_name} hadn't been loaded yet, removed its stand in commands.")
+            return
+
         try:
             await self.bot.unload_extension(ext_name)
             await ctx.send(f"{ext_name} unloaded successfully.")
@@ -19,175 +19,385 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import ast
 import asyncio
 import contextlib
+import cProfile
+import hashlib
+import inspect
+import io
+import json
+import linecache
 import logging
+import marshal
 import math
+import os
+import pstats
 import random
+import re
+import signal
+import statistics
+import sys
+import time
 import traceback
+import tracemalloc
+import types
 import typing
-from io import StringIO
+from collections import OrderedDict
+from pathlib import Path
 
 import discord
 from discord import embeds
 from discord.ext import commands
 
-_logger = logging.getLogger(__name__)
+from utils.paginators import TextFilePageSource, send_text
+
+WORKER_POOL_SIZE = 2 # worker processes kept started for `py --worker`
+WORKER_CPU_LIMIT = 30 # seconds of CPU time a worker snippet can use
+WORKER_MEMORY_LIMIT = 512 * 1024 * 1024 # bytes of address space each worker can use
+WORKER_TIMEOUT = 120.0 # seconds a worker snippet can run for
+WORKER_ROOT = Path(__file__).resolve().parents[1] # the directory `utils` is in, for `python -m utils.evalworker`
+STREAM_INTERVAL = 2.0 # seconds between updates of a worker snippet's live output
+STREAM_TAIL_LENGTH = 1500 # characters of the latest output shown while a worker snippet runs
+
+PROFILE_TOP = 30 # functions listed by `py --profile`
+TRACEMALLOC_TOP = 25 # allocation sites listed by `py --tracemalloc`
+TRACEMALLOC_FRAMES = 10 # frames kept per allocation while tracing
+TIMEIT_RUNS = 10 # timed runs for `py --timeit`
+TIMEIT_WARMUP = 2 # untimed runs before `py --timeit` starts timing, at least 1
+EVAL_TIMEOUT = 600 # seconds a snippet can run for in the bot's own process
+SESSION_IDLE_TIMEOUT = 60 * 60 # seconds an owner's py session is kept without being used
+SNIPPET_CACHE_SIZE = 128 # compiled snippets kept, by source
+RESULT_NAME = "__py_result__" # where a snippet's final expression is stored while it runs
+
+EVAL_FLAGS = {"--worker", "--profile", "--tracemalloc", "--timeit", "--reset"}
+MEASURE_FLAGS = {"--profile", "--tracemalloc", "--timeit"} # only one of these can be used at a time
+_FLAG_RE = re.compile(r"\s*(--[\w-]+)(?:=(\d+))?(?:\s+|$)")
 
-class ToPageModal(discord.ui.Modal, title="Go to page...t"):
-    new_page = discord.ui.TextInput(label="Page", placeholder="What page are we going to?", min_length=1)
-
-    def __init__(self, *, max_pages: typing.Optional[int]) -> None:
-        super().__init__()
-        _logger.debug(f"Creating new ToPageModal with {max_pages=}")
-        if max_pages is not None:
-            pages_str = str(max_pages)
-            self.new_page.placeholder = f"Enter a number between 1 and {pages_str}"
-            self.new_page.max_length = len(pages_str)
-
-    async def on_submit(self, interaction: discord.Interaction) -> None:
-        _logger.debug(f"{self!r} on_submit processing.")
-        self.interaction = interaction
-        self.stop()
-
-class CommandsPaginatorView(discord.ui.View):
-    """Wraps a `commands.Paginator`'s pages into a View"""
-    def __init__(self, owner: discord.Member | discord.User, paginator: commands.Paginator) -> None:
-        super().__init__(timeout=300)
-        assert len(paginator.pages) > 0
-        self.message: discord.Message | None = None # should be set when the paginator is sent.
-        self.owner = owner
-        self.paginator = paginator
-        self.max_index = len(paginator.pages) - 1 # List indecies
-        self.current_index = 0
-
-        self._update_state()
-
-    async def on_timeout(self) -> None:
-        _logger.debug(f"{self!r} timed out.")
-        if self.message is not None:
-            try:
-                await self.message.edit(view=None)
-            except discord.NotFound:
-                pass
-
-    async def on_error(self, interaction: discord.Interaction, error: Exception, _: discord.ui.Item) -> None:
-        trace = "".join(traceback.format_exception(type(error), error, error.__traceback__))
-
-        _logger.error(f"Ignoring exception in view: {interaction.user.id=}")
-        _logger.error(trace)
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        _logger.debug(f"{self!r} received interaction from {interaction.user.id=}")
-        if interaction.user.id == self.owner.id:
-            return True
-        await interaction.response.send_message(f"This paginator belongs to {self.owner.mention}.", ephemeral=True)
-        return False
-
-    def _update_state(self) -> None:
-        _logger.debug(f"{self!r} _update called.")
-        # Disable unusable buttons
-        if self.current_index == self.max_index:
-            self.fwd_btn.style = discord.ButtonStyle.grey
-            self.fwd_btn.disabled = True
-            self.to_last_btn.disabled = True
-        else:
-            self.fwd_btn.style = discord.ButtonStyle.green
-            self.fwd_btn.disabled = False
-            self.to_last_btn.disabled = False
-
-        if self.current_index == 0:
-            self.back_btn.style = discord.ButtonStyle.grey
-            self.back_btn.disabled = True
-            self.to_first_btn.disabled = True
-        else:
-            self.back_btn.style = discord.ButtonStyle.green
-            self.back_btn.disabled = False
-            self.to_first_btn.disabled = False
-
-        self.count_btn.label = f"{self.current_index + 1}/{self.max_index + 1}" # Start at 1 instead of 0.
-
-    async def update(self, interaction: discord.Interaction) -> None:
-        _logger.debug(f"{self!r} update called.")
-        self._update_state()
-        await interaction.response.edit_message(content=self.paginator.pages[self.current_index], view=self)
-
-    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.gray, disabled=True)
-    async def to_first_btn(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        _logger.debug(f"{self!r} to_first_btn clicked.")
-        self.current_index = 0
-        await self.update(interaction)
-
-    @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.green, disabled=True)
-    async def back_btn(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        _logger.debug(f"{self!r} back_btn clicked.")
-        if self.current_index >= 1:
-            self.current_index -= 1
-        await self.update(interaction)
-
-    @discord.ui.button(label="1", style=discord.ButtonStyle.blurple, disabled=True)
-    async def count_btn(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        _logger.debug(f"{self!r} count_btn clicked.")
-        # Should never be called. Just defer in case it gets called.
-        await interaction.response.defer()
-
-    @discord.ui.button(emoji="➡️", style=discord.ButtonStyle.green)
-    async def fwd_btn(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        _logger.debug(f"{self!r} fwd_btn clicked.")
-        if self.current_index < self.max_index:
-            self.current_index += 1
-        await self.update(interaction)
-
-    @discord.ui.button(emoji="⏭️", style= discord.ButtonStyle.gray)
-    async def to_last_btn(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        _logger.debug(f"{self!r} to_last_btn clicked.")
-        self.current_index = self.max_index
-        await self.update(interaction)
-
-    @discord.ui.button(label="Go To Page...", style=discord.ButtonStyle.blurple)
-    async def goto_modal(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        _logger.debug(f"{self!r} goto_modal clicked.")
-        if self.message is None:
-            return
+_logger = logging.getLogger(__name__)
 
-        modal = ToPageModal(max_pages=self.max_index + 1) # Their index is one higher than ours.
-        await interaction.response.send_modal(modal)
-        timed_out = await modal.wait()
+class EvalWorkerError(commands.CommandError):
+    pass
+
+class EvalWorker:
+    """A worker process that runs snippets, see `utils/evalworker.py` for what is sent back and forth."""
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self.process = process
+
+    @classmethod
+    async def spawn(cls, *, memory_limit: int) -> "EvalWorker":
+        pythonpath = os.pathsep.join(filter(None, (str(WORKER_ROOT), os.environ.get("PYTHONPATH"))))
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "utils.evalworker", "--memory-limit", str(memory_limit),
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, env={**os.environ, "PYTHONPATH": pythonpath},
+            limit=1024 * 1024, # bytes in one message, output is sent in chunks of at most 16K characters, well under this
+        )
+        return cls(process)
+
+    async def run(self, code: str, *, cpu_limit: int, on_output: typing.Callable[[str], None]) -> typing.Optional[str]:
+        """coro that runs a snippet, passing its output to `on_output` as it arrives.
+
+        Returns
+        -------
+        Optional[str]
+            The formatted traceback if the snippet raised, otherwise None.
+
+        Raises
+        ------
+        EvalWorkerError
+            The worker process died, e.g. by going over its CPU time limit, or sent something that couldn't be read.
+        """
+        assert self.process.stdin is not None and self.process.stdout is not None
 
-        if timed_out:
-            await interaction.followup.send('Took too long', ephemeral=True)
-            return
-        elif self.is_finished():
-            await modal.interaction.response.send_message('Took too long', ephemeral=True)
-            return
+        self.process.stdin.write((json.dumps({"code": code, "cpu_limit": cpu_limit}) + "\n").encode())
+        await self.process.stdin.drain()
 
-        value = str(modal.new_page.value)
-        if not value.isdigit():
-            await modal.interaction.response.send_message(f'Expected a number not {value!r}', ephemeral=True)
+        while True:
+            try:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+            except ValueError as error: # Over the line length limit, or not JSON. The pool replaces the worker.
+                raise EvalWorkerError("The worker sent a message that couldn't be read.") from error
+
+            if "output" in message:
+                on_output(message["output"])
+            elif message.get("done"):
+                return message["error"]
+
+        returncode = await self.process.wait()
+        if returncode == -getattr(signal, "SIGXCPU", 0):
+            raise EvalWorkerError(f"Went over the CPU time limit of {cpu_limit} seconds.")
+        elif returncode == -signal.SIGKILL:
+            raise EvalWorkerError("The worker was killed, likely by running out of memory.")
+        raise EvalWorkerError(f"The worker exited unexpectedly with code {returncode}.")
+
+    def kill(self) -> None:
+        if self.process.returncode is None:
+            self.process.kill()
+
+class EvalWorkerPool:
+    """Worker processes kept started, so snippets don't wait on Python starting up.
+
+    A worker is used by one snippet at a time, and replaced if anything goes wrong while it's in use.
+    """
+    def __init__(self, *, size: int = WORKER_POOL_SIZE, memory_limit: int = WORKER_MEMORY_LIMIT) -> None:
+        self.size = size
+        self.memory_limit = memory_limit
+        self._idle: asyncio.Queue[EvalWorker] = asyncio.Queue()
+        self._workers: typing.Set[EvalWorker] = set()
+        self._spawning: typing.Set[asyncio.Task[None]] = set()
+
+    def start(self) -> None:
+        for _ in range(self.size):
+            self._spawn_later()
+
+    def _spawn_later(self) -> None:
+        task = asyncio.create_task(self._spawn())
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    async def _spawn(self) -> None:
+        try:
+            worker = await EvalWorker.spawn(memory_limit=self.memory_limit)
+        except Exception:
+            _logger.exception("Failed to start an eval worker.")
             return
 
-        value = int(value)
-        if not 0 < value <= self.max_index + 1:
-            if not modal.interaction.response.is_done():
-                error = modal.new_page.placeholder.replace("Enter", "Expected") # type: ignore
-                await modal.interaction.response.send_message(error, ephemeral=True)
-                return
-
-        self.current_index = value - 1 # Our index is one lower than theirs
-        await self.update(modal.interaction)
+        self._workers.add(worker)
+        self._idle.put_nowait(worker)
 
-    @discord.ui.button(label="Quit", style=discord.ButtonStyle.red)
-    async def stop_btn(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        await interaction.response.edit_message(view=None)
-        self.stop()
+    async def run(self, code: str, *, cpu_limit: int = WORKER_CPU_LIMIT, timeout: float = WORKER_TIMEOUT, on_output: typing.Callable[[str], None]) -> typing.Optional[str]:
+        """coro that runs a snippet on the next free worker, see `EvalWorker.run`.
 
-    @property
-    def initial(self) -> str:
-        return self.paginator.pages[0]
+        Raises
+        ------
+        EvalWorkerError
+            No worker was free within `timeout`, the snippet ran for longer than `timeout`, or the worker died.
+        """
+        if not self._workers and not self._spawning:
+            raise EvalWorkerError("No eval workers could be started, see the logs.")
+
+        # Bounded too, the workers being waited on may fail to start after the check above.
+        try:
+            worker = await asyncio.wait_for(self._idle.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise EvalWorkerError(f"No eval worker was free after {timeout:g} seconds, see the logs.") from None
+
+        healthy = False
+
+        try:
+            error = await asyncio.wait_for(worker.run(code, cpu_limit=cpu_limit, on_output=on_output), timeout=timeout)
+            healthy = True
+            return error
+        except asyncio.TimeoutError:
+            raise EvalWorkerError(f"Timed out after {timeout:g} seconds.") from None
+        finally:
+            if healthy:
+                self._idle.put_nowait(worker)
+            else: # Timed out, died or cancelled part way through a snippet, start over with a new one.
+                worker.kill()
+                self._workers.discard(worker)
+                self._spawn_later()
+
+    async def close(self) -> None:
+        for task in self._spawning:
+            task.cancel()
+
+        for worker in self._workers:
+            worker.kill()
+            await worker.process.wait()
+
+        self._workers.clear()
+
+def _parse_flags(code: str, /) -> typing.Tuple[typing.Dict[str, typing.Optional[int]], str]:
+    # Takes known flags off the front of the code, `--flag` or `--flag=N`.
+    flags: typing.Dict[str, typing.Optional[int]] = {}
+
+    while (match := _FLAG_RE.match(code)) and match.group(1) in EVAL_FLAGS:
+        flags[match.group(1)] = int(match.group(2)) if match.group(2) else None
+        code = code[match.end():]
+
+    return flags, code
+
+class SnippetCache:
+    """Compiled snippets by source, so running the same code again skips parsing and compiling it.
+
+    Snippets are compiled with top level await allowed. A final expression is stored as `RESULT_NAME`
+    instead of being thrown away, so it can be shown like the REPL does.
+    """
+    def __init__(self, *, maxsize: int = SNIPPET_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._code: OrderedDict[str, types.CodeType] = OrderedDict() # source -> code, least recently used first
+
+    @staticmethod
+    def filename(source: str) -> str:
+        return f"<py-{hashlib.sha1(source.encode()).hexdigest()[:10]}>"
+
+    def get(self, source: str) -> types.CodeType:
+        """Returns the compiled snippet, compiling it if it isn't cached.
+
+        Raises
+        ------
+        SyntaxError
+            The snippet isn't valid Python.
+        """
+        if (code := self._code.get(source)) is not None:
+            self._code.move_to_end(source)
+            return code
+
+        filename = self.filename(source)
+        tree = ast.parse(source, filename, "exec")
+        if tree.body and isinstance(last := tree.body[-1], ast.Expr):
+            tree.body[-1] = ast.copy_location(ast.Assign(targets=[ast.Name(RESULT_NAME, ast.Store())], value=last.value), last)
+            ast.fix_missing_locations(tree)
+
+        code = compile(tree, filename, "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename) # Lets tracebacks show the snippet's lines.
+
+        self._code[source] = code
+        while len(self._code) > self.maxsize:
+            old, _ = self._code.popitem(last=False)
+            linecache.cache.pop(self.filename(old), None)
+        return code
+
+    def clear(self) -> None:
+        for source in self._code:
+            linecache.cache.pop(self.filename(source), None)
+        self._code.clear()
+
+class ReplSession:
+    """The namespace one owner's snippets run in, kept between runs of `py`.
+
+    Like the REPL, the value of a snippet's final expression is kept as `_` unless it's None.
+    """
+    def __init__(self, bot: commands.Bot) -> None:
+        self.namespace: typing.Dict[str, typing.Any] = {
+            "__name__": "__main__", "discord": discord, "random": random, "commands": commands, "embeds": embeds,
+            "utils": discord.utils, "math": math, "bot": bot, "asyncio": asyncio, "aio": asyncio,
+        }
+        self.result: typing.Any = None # the final expression's value from the latest run
+        self.last_used = time.monotonic()
+
+    def runner(self, code: types.CodeType, ctx: commands.Context) -> typing.Callable[[], typing.Awaitable[None]]:
+        # Returns something that runs the snippet in this session each time it's awaited.
+        self.namespace["ctx"] = ctx
+        self.last_used = time.monotonic()
+
+        async def run() -> None:
+            self.result = None
+            result = eval(code, self.namespace)
+            if inspect.iscoroutine(result): # The snippet used top level await.
+                await result
+
+            self.result = self.namespace.pop(RESULT_NAME, None)
+            if self.result is not None:
+                self.namespace["_"] = self.result
+
+        return run
+
+def _format_duration(seconds: float, /) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e3), ("\N{MICRO SIGN}s", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.3f}{unit}"
+    return f"{seconds * 1e9:.0f}ns"
+
+def _format_size(size: float, /) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+async def _profile(run: typing.Callable[[], typing.Awaitable[typing.Any]], output: typing.TextIO, *, top: int) -> discord.File:
+    """coro that runs a snippet under cProfile, writes the `top` functions by cumulative time to `output`,
+    and returns the full stats as a pstats dump.
+
+    Anything else running on the event loop while the snippet awaits is profiled too.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await run()
+    finally:
+        profiler.disable()
+
+    stats = pstats.Stats(profiler, stream=output)
+    output.write("\n--- cProfile, by cumulative time ---\n")
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+    profiler.create_stats() # the unstripped stats, for loading with pstats.Stats or snakeviz
+    return discord.File(io.BytesIO(marshal.dumps(profiler.stats)), filename="profile.pstats")
+
+async def _trace_allocations(run: typing.Callable[[], typing.Awaitable[typing.Any]], output: typing.TextIO, *, top: int) -> None:
+    """coro that runs a snippet with tracemalloc and writes the `top` lines with the most memory
+    allocated (and still held) between snapshots before and after it to `output`."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    try:
+        before = tracemalloc.take_snapshot()
+        await run()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+
+    output.write(f"\n--- tracemalloc, top {top} lines by allocated size ---\n")
+    for stat in diff[:top]:
+        frame = stat.traceback[0]
+        output.write(f"{frame.filename}:{frame.lineno}: {_format_size(stat.size_diff)} in {stat.count_diff:+} blocks (now {_format_size(stat.size)})\n")
+    output.write(f"Total: {_format_size(sum(stat.size_diff for stat in diff))} in {sum(stat.count_diff for stat in diff):+} blocks\n")
+
+async def _timeit(run: typing.Callable[[], typing.Awaitable[typing.Any]], output: typing.TextIO, *, runs: int) -> None:
+    """coro that runs a snippet `TIMEIT_WARMUP` times, then times it over `runs` more and writes statistics to `output`.
+
+    Only output from the first run is kept. Times are wall clock, so include awaits.
+    """
+    await run() # the first warmup run, the only one whose output is kept
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        for _ in range(TIMEIT_WARMUP - 1):
+            await run()
+
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await run()
+            times.append(time.perf_counter() - start)
+
+    output.write(f"\n--- {runs} runs after {TIMEIT_WARMUP} warmup ---\n")
+    output.write(f"min {_format_duration(min(times))}, max {_format_duration(max(times))}, median {_format_duration(statistics.median(times))}\n")
+    output.write(f"mean {_format_duration(statistics.fmean(times))} \N{PLUS-MINUS SIGN} {_format_duration(statistics.stdev(times) if runs > 1 else 0.0)}\n")
 
 class PyTest(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.worker_pool = EvalWorkerPool()
+        self.snippets = SnippetCache()
+        self.sessions: typing.Dict[int, ReplSession] = {} # owner id -> their session
+
+    async def cog_load(self) -> None:
+        self.worker_pool.start()
+
+    async def cog_unload(self) -> None:
+        await self.worker_pool.close()
+        self.snippets.clear()
+        self.sessions.clear()
+
+    def _session(self, user_id: int, *, reset: bool = False) -> ReplSession:
+        # Gets a user's session, starting a new one if they don't have one or asked for a reset. Idle sessions are dropped.
+        now = time.monotonic()
+        for key in [key for key, session in self.sessions.items() if now - session.last_used > SESSION_IDLE_TIMEOUT]:
+            del self.sessions[key]
+
+        if reset or user_id not in self.sessions:
+            self.sessions[user_id] = ReplSession(self.bot)
+        return self.sessions[user_id]
 
     @commands.command(aliases=['ex', 'exec'])
     @commands.is_owner()
@@ -198,8 +408,14 @@ class PyTest(commands.Cog):
         -----------
         code: str
             The code to run. Can be formatted without a codeblock, in a python codeblock, or in a bare codeblock.
+            Variables are kept between runs, and the value of a final expression is shown and kept as `_`.
+            Start it with `--reset` to start over with a fresh namespace.
+            Start it with `--worker` to run it in a separate process, without `bot`, `ctx` or your variables.
+            Start it with `--profile[=N]`, `--tracemalloc[=N]` or `--timeit[=N]` to profile it, trace what it allocates,
+            or time N runs of it.
         """
-        mystdout = StringIO() #will hold the output of the code run
+        flags, code = _parse_flags(code)
+        mystdout = TextFilePageSource(max_size=400) #will hold the output of the code run, spooled to disk
 
         async with ctx.channel.typing():
             if code.startswith("```python") and code.endswith("```"):
@@ -211,27 +427,82 @@ class PyTest(commands.Cog):
             else:
                 code = code
 
-            async def aexec(code, ctx):
-                ldict = {}
-                bot = self.bot
+            measures = MEASURE_FLAGS.intersection(flags)
+            if len(measures) > 1:
+                raise commands.BadArgument(f"Only one of {', '.join(sorted(measures))} can be used at a time.")
 
-                exec(f'async def __ex(): ' + ''.join(f'\n {l}' for l in code.split('\n')), {"discord": discord, "random": random, "commands": commands, "embeds": embeds, "utils": discord.utils, "math": math, 'ctx': ctx, 'bot': bot, 'asyncio': asyncio, 'aio': asyncio}, ldict)
-                return await ldict['__ex']() #await the created coro
-            with contextlib.redirect_stdout(mystdout), contextlib.redirect_stderr(mystdout):
-                await asyncio.wait_for(aexec(code, ctx), timeout=600) #Should time it out after 600 seconds
+            if "--worker" in flags:
+                if measures:
+                    raise commands.BadArgument(f"{measures.pop()} can't be used with --worker.")
+                await self._run_in_worker(ctx, code, mystdout)
+                return
+
+            session = self._session(ctx.author.id, reset="--reset" in flags)
+            files = []
+            try:
+                run = session.runner(self.snippets.get(code), ctx) # compiled once, so repeated runs don't time compiling it
+                with contextlib.redirect_stdout(mystdout), contextlib.redirect_stderr(mystdout):
+                    if "--profile" in flags:
+                        measured = _profile(run, mystdout, top=flags["--profile"] or PROFILE_TOP)
+                    elif "--tracemalloc" in flags:
+                        measured = _trace_allocations(run, mystdout, top=flags["--tracemalloc"] or TRACEMALLOC_TOP)
+                    elif "--timeit" in flags:
+                        measured = _timeit(run, mystdout, runs=flags["--timeit"] or TIMEIT_RUNS)
+                    else:
+                        measured = run()
+
+                    result = await asyncio.wait_for(measured, timeout=EVAL_TIMEOUT) #Should time it out after EVAL_TIMEOUT seconds
+                    if "--profile" in flags:
+                        files.append(result) # the pstats dump
+                    if session.result is not None:
+                        mystdout.write(f"{session.result!r}\n")
+            except BaseException:
+                await mystdout.close()
+                raise
+            await ctx.message.add_reaction("\N{WHITE HEAVY CHECK MARK}")
+
+        if files:
+            await ctx.send(files=files)
+        await send_text(ctx, mystdout) # Paginated, or as a file if it's very large.
+
+    async def _run_in_worker(self, ctx: commands.Context, code: str, output: TextFilePageSource) -> None:
+        # Runs code on the worker pool, showing the latest output while it runs, then sends all of it.
+        tail = ""
+        changed = False
+
+        def on_output(text: str) -> None:
+            nonlocal tail, changed
+            output.write(text)
+            tail = (tail + text)[-STREAM_TAIL_LENGTH:]
+            changed = True
+
+        start = time.perf_counter()
+        status = await ctx.send("Running in a worker process...")
+        run = asyncio.create_task(self.worker_pool.run(code, on_output=on_output))
+
+        try:
+            while not run.done():
+                await asyncio.wait({run}, timeout=STREAM_INTERVAL)
+                if changed and not run.done():
+                    changed = False
+                    shown = tail.replace("```", "`\u200b``") # Don't let output close the codeblock.
+                    await status.edit(content=f"Running in a worker process...\n```\n{shown}\n```")
+
+            error = run.result()
+        except BaseException:
+            run.cancel()
+            await send_text(ctx, output) # Whatever it printed before things went wrong.
+            raise
+
+        await status.edit(content=f"Finished in a worker process in {time.perf_counter() - start:.2f}s.")
+
+        if error is not None:
+            output.write(error)
+            await ctx.message.add_reaction("\N{CROSS MARK}")
+        else:
             await ctx.message.add_reaction("\N{WHITE HEAVY CHECK MARK}")
 
-        if mystdout.getvalue():
-            paginator = commands.Paginator(max_size=400)
-            for line in mystdout.getvalue().split("\n"):
-                paginator.add_line(line)
-
-            if len(paginator.pages) > 1: # paginate
-                paginator_view = CommandsPaginatorView(ctx.author, paginator)
-                initial_page = paginator_view.initial
-                paginator_view.message = await ctx.send(initial_page, view=paginator_view)
-            else: # no need to paginate
-                await ctx.send(paginator.pages[0])
+        await send_text(ctx, output)
 
     @py.error
     async def err_handler(self, ctx, error):
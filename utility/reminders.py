@@ -34,6 +34,7 @@ import discord
 from discord.ext import commands, tasks
 
 from utils.converters import TimeConverter
+from utils.paginators import EmbedPaginator, PageSource
 
 DB_FILENAME = "reminders.sqlite"
 
@@ -46,9 +47,15 @@ CREATE TABLE IF NOT EXISTS reminders (
     timestamp BIGINT NOT NULL,
     body TEXT NOT NULL,
     completed INTEGER NOT NULL DEFAULT FALSE
-)
+);
+
+CREATE INDEX IF NOT EXISTS reminders_owner_timestamp_idx
+ON reminders (guild_id, owner_id, completed, timestamp, id);
 """
 
+REMINDERS_PER_PAGE = 10
+BODY_PREVIEW_LENGTH = 50
+
 _logger = logging.getLogger(__name__)
 
 @dataclass(slots=True)
@@ -92,6 +99,46 @@ class ReminderEntry:
 
                 return cls(**res) if res is not None else None
 
+    @staticmethod
+    async def count_for(*, guild_id: int, owner_id: int) -> int:
+        """Counts the pending reminders for a given owner in a given guild."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT COUNT(*) FROM reminders WHERE guild_id = ? AND owner_id = ? AND completed = FALSE", guild_id, owner_id)
+                res = await cur.fetchone()
+
+                return res[0]
+
+    @staticmethod
+    async def key_at(*, guild_id: int, owner_id: int, offset: int) -> tuple[float, int] | None:
+        """Gets the (timestamp, id) key of the pending reminder at a given offset.
+
+        This only reads the index, so it can be used to seek to a page
+        without loading the reminders before it.
+        """
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("""SELECT timestamp, id FROM reminders WHERE guild_id = ? AND owner_id = ? AND completed = FALSE
+                ORDER BY timestamp ASC, id ASC LIMIT 1 OFFSET ?""", guild_id, owner_id, offset)
+                res = await cur.fetchone()
+
+                return (res['timestamp'], res['id']) if res is not None else None
+
+    @classmethod
+    async def list_after(cls, *, guild_id: int, owner_id: int, after: tuple[float, int] | None, limit: int) -> list[ReminderEntry]:
+        """Gets up to `limit` pending reminders that come after the given (timestamp, id) key."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                if after is None:
+                    await cur.execute("""SELECT * FROM reminders WHERE guild_id = ? AND owner_id = ? AND completed = FALSE
+                    ORDER BY timestamp ASC, id ASC LIMIT ?""", guild_id, owner_id, limit)
+                else:
+                    await cur.execute("""SELECT * FROM reminders WHERE guild_id = ? AND owner_id = ? AND completed = FALSE
+                    AND (timestamp, id) > (?, ?) ORDER BY timestamp ASC, id ASC LIMIT ?""", guild_id, owner_id, *after, limit)
+                results = await cur.fetchall()
+
+                return [cls(**res) for res in results]
+
     @staticmethod
     async def cancel(id: int, /) -> int:
         """'cancels' a reminder. In reality this just marks it as completed."""
@@ -127,6 +174,56 @@ class ReminderEntry:
                 return self
 
 
+class ReminderPageSource(PageSource[discord.Embed]):
+    """Lazily pages through a member's reminders using keyset pagination.
+
+    Only the page being shown is read from the database. The key of the last
+    reminder on every page seen so far is kept so that moving forward is a
+    single indexed range query, jumping to an unseen page seeks its key
+    from the index first.
+    """
+    def __init__(self, *, guild_id: int, owner_id: int, total: int, per_page: int = REMINDERS_PER_PAGE) -> None:
+        self.guild_id = guild_id
+        self.owner_id = owner_id
+        self.total = total
+        self.per_page = per_page
+        self._page_ends: dict[int, tuple[float, int]] = {} # page index -> key of its last reminder
+
+    def get_max_pages(self) -> int:
+        return max(1, -(-self.total // self.per_page)) # ceil
+
+    async def _key_before(self, index: int) -> tuple[float, int] | None:
+        if index == 0:
+            return None
+
+        if (key := self._page_ends.get(index - 1)) is not None:
+            return key
+
+        return await ReminderEntry.key_at(guild_id=self.guild_id, owner_id=self.owner_id, offset=index * self.per_page - 1)
+
+    async def get_page(self, index: int) -> discord.Embed:
+        after = await self._key_before(index)
+        reminders = await ReminderEntry.list_after(guild_id=self.guild_id, owner_id=self.owner_id, after=after, limit=self.per_page)
+
+        if reminders:
+            self._page_ends[index] = (reminders[-1].timestamp, reminders[-1].id)
+
+        out = ""
+        for reminder in reminders:
+            timestamp = datetime.datetime.fromtimestamp(reminder.timestamp, tz=datetime.timezone.utc)
+            preview = reminder.body.replace("\n", " ")
+            if len(preview) > BODY_PREVIEW_LENGTH:
+                preview = preview[:BODY_PREVIEW_LENGTH - 3] + "..."
+            preview = discord.utils.escape_markdown(preview)
+
+            out += f"ID ({reminder.id}): {discord.utils.format_dt(timestamp)}\n{preview}\n"
+
+        embed = discord.Embed(description=out or "No reminders on this page.", title="Your Reminders", color=discord.Color.blue())
+        embed.set_footer(text=f"{self.total:,} reminders")
+
+        return embed
+
+
 # For a generic example of how this would look, see `templates/future_tasks_template.py`
 class RemindersCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -134,7 +231,7 @@ class RemindersCog(commands.Cog):
 
     async def cog_load(self) -> None:
         async with asqlite.connect(DB_FILENAME) as db:
-            await db.execute(REMINDER_SETUP_SQL)
+            await db.executescript(REMINDER_SETUP_SQL)
         self.reminder_loop.start()
 
     async def cog_unload(self) -> None:
@@ -211,25 +308,18 @@ class RemindersCog(commands.Cog):
     @reminder.command()
     async def list(self, ctx: commands.Context) -> None:
         """Lists the reminders that you have set."""
-        async with asqlite.connect(DB_FILENAME) as db:
-            async with db.cursor() as cur:
-                await cur.execute("SELECT * FROM reminders WHERE guild_id = ? AND owner_id = ? AND completed = FALSE ORDER BY timestamp ASC LIMIT 10", ctx.guild.id, ctx.author.id)
+        total = await ReminderEntry.count_for(guild_id=ctx.guild.id, owner_id=ctx.author.id)
 
-                results = await cur.fetchall()
-
-                if results:
-                    out = ""
-                    for res in results:
-                        id = res['id']
-                        timestamp = datetime.datetime.fromtimestamp(res['timestamp'], tz=datetime.timezone.utc)
-
-                        out += f"ID ({id}): {discord.utils.format_dt(timestamp)}\n"
+        if not total:
+            await ctx.reply("You don't have any reminders set.")
+            return
 
-                    embed = discord.Embed(description=out, title="Your Reminders", color=discord.Color.blue())
+        source = ReminderPageSource(guild_id=ctx.guild.id, owner_id=ctx.author.id, total=total)
 
-                    await ctx.reply(embed=embed)
-                else:
-                    await ctx.reply("You don't have any reminders set.")
+        if source.get_max_pages() > 1:
+            await EmbedPaginator.start(ctx, owner=ctx.author, pages=source)
+        else:
+            await ctx.reply(embed=await source.get_page(0))
 
     @reminder.command()
     async def cancel(self, ctx: commands.Context, id: int) -> None:
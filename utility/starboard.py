@@ -24,21 +24,27 @@ from __future__ import annotations
 """
 INCOMPLETE
     TODO:
-        - Handle message edits
-        - Handle message deletes
-        - Cooldown for updating the status of a message so it can't be spammed on and off?
         - Ensure error handling is correct
 
 This module uses the following third party libs installed via pip: asqlite (https://github.com/Rapptz/asqlite)
 """
 
 import asyncio
+import datetime
 import logging
+import weakref
+from collections import OrderedDict
+from typing import Collection
 from dataclasses import dataclass
 
 import asqlite
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+
+from utils.cache import GuildConfigCache
+from utils.db import transaction
+from utils.migrations import apply_migrations
+from utils.paginators import EmbedPaginator, PageSource
 
 DB_FILENAME = "starboard.sqlite"
 
@@ -51,13 +57,59 @@ CREATE TABLE IF NOT EXISTS starredmessage (
     starboard_message_id INTEGER NULL DEFAULT NULL
 );
 
+CREATE INDEX IF NOT EXISTS starredmessage_channel_id_idx ON starredmessage (channel_id);
+CREATE INDEX IF NOT EXISTS starredmessage_starboard_message_id_idx ON starredmessage (starboard_message_id);
+CREATE INDEX IF NOT EXISTS starredmessage_guild_id_idx ON starredmessage (guild_id);
+
 CREATE TABLE IF NOT EXISTS starboardguild (
     id INTEGER PRIMARY KEY,
     starboard_channel_id INTEGER,
     stars_required INTEGER
 );
+
+CREATE TABLE IF NOT EXISTS starboardbackfill (
+    channel_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    last_message_id INTEGER NULL DEFAULT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX IF NOT EXISTS starboardbackfill_guild_id_idx ON starboardbackfill (guild_id);
 """
 
+# Applied in order on top of STARBOARD_SETUP_SQL by `utils.migrations.apply_migrations`. Only ever append to this.
+STARBOARD_MIGRATIONS = [
+    # 1: Author and creation time for leaderboards. created_at is backfilled from the message id's snowflake.
+    # author_id is recorded as messages are posted to the starboard or backfilled.
+    """
+    ALTER TABLE starredmessage ADD COLUMN author_id INTEGER NULL DEFAULT NULL;
+    ALTER TABLE starredmessage ADD COLUMN created_at INTEGER NULL DEFAULT NULL;
+
+    UPDATE starredmessage SET created_at = ((message_id >> 22) + 1420070400000) / 1000;
+
+    CREATE INDEX IF NOT EXISTS starredmessage_guild_stars_idx ON starredmessage (guild_id, stars DESC, channel_id, author_id);
+    CREATE INDEX IF NOT EXISTS starredmessage_guild_created_at_idx ON starredmessage (guild_id, created_at, stars, channel_id, author_id);
+    CREATE INDEX IF NOT EXISTS starredmessage_guild_author_idx ON starredmessage (guild_id, author_id, stars);
+    """,
+    # 2: Leaderboards page on (stars, message_id), so ties are ordered by message_id in the index too.
+    # created_at is included so time limited leaderboards are read from the index as well.
+    """
+    DROP INDEX IF EXISTS starredmessage_guild_stars_idx;
+
+    CREATE INDEX IF NOT EXISTS starredmessage_guild_stars_message_idx ON starredmessage (guild_id, stars, message_id, channel_id, author_id, created_at);
+    """,
+]
+
+STAR_FLUSH_INTERVAL = 10.0 # seconds between batched writes of star counts
+STAR_FLUSH_BATCH_SIZE = 100 # pending messages that trigger a write before the interval is up
+MAX_CACHED_MESSAGES = 10_000 # clean star counts kept in memory
+STARBOARD_EDIT_DELAY = 5.0 # seconds star changes are collected for before the starboard post is edited
+BACKFILL_BATCH_SIZE = 100 # messages written per checkpoint, matches the history page size
+BACKFILL_CONCURRENCY = 2 # channels read at once during a backfill
+BACKFILL_PROGRESS_INTERVAL = 15.0 # seconds between progress updates
+LEADERBOARD_PER_PAGE = 10
+
 _logger = logging.getLogger(__name__)
 
 @dataclass(slots=True)
@@ -67,43 +119,242 @@ class StarredMessage:
     guild_id: int
     stars: int
     starboard_message_id: int | None
+    author_id: int | None = None
+    created_at: int | None = None # UTC TIMESTAMP
 
     @classmethod
-    async def create_or_increment(cls, *, message_id: int, channel_id: int, guild_id: int, initial_stars: int = 1, starboard_message_id: int | None = None) -> StarredMessage:
+    async def get_by_message_id(cls, message_id: int, /) -> StarredMessage | None:
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
-                await cur.execute("""
-                INSERT INTO starredmessage (message_id, channel_id, guild_id, stars, starboard_message_id)
-                VALUES (?, ?, ?, ?, ?) ON CONFLICT(message_id) DO UPDATE SET stars = stars + 1 RETURNING *
-                """, message_id, channel_id, guild_id, initial_stars, starboard_message_id)
-
-                await db.commit()
+                await cur.execute("SELECT * FROM starredmessage WHERE message_id = ?", message_id)
 
                 res = await cur.fetchone()
 
-                return cls(**dict(res))
+                return cls(**dict(res)) if res is not None else None
+
+    @staticmethod
+    async def bulk_save(messages: list[StarredMessage], /) -> None:
+        """Writes the star counts of the given messages in a single transaction."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur, transaction(db):
+                await cur.executemany("""
+                INSERT INTO starredmessage (message_id, channel_id, guild_id, stars, starboard_message_id, author_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(message_id) DO UPDATE SET stars = excluded.stars, starboard_message_id = excluded.starboard_message_id,
+                author_id = COALESCE(excluded.author_id, author_id), created_at = COALESCE(excluded.created_at, created_at)
+                """, [(sm.message_id, sm.channel_id, sm.guild_id, sm.stars, sm.starboard_message_id, sm.author_id, sm.created_at) for sm in messages])
 
     @classmethod
-    async def decrement_or_ignore(cls, message_id: int, /) -> StarredMessage | None:
+    async def bulk_set_stars(cls, counts: list[StarredMessage], /) -> list[StarredMessage]:
+        """Overwrites the star counts of the given messages in a single transaction.
+
+        Starboard message ids are left alone, and messages without stars are only
+        updated if they already have an entry.
+
+        Parameters
+        ----------
+        counts : list[StarredMessage]
+            The messages and star counts to set.
+
+        Returns
+        -------
+        list[StarredMessage]
+            The entries for the given messages after the update.
+        """
+        if not counts:
+            return []
+
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
-                await cur.execute("UPDATE starredmessage SET stars = stars - 1 WHERE message_id = ? RETURNING *", message_id)
+                async with transaction(db):
+                    await cur.executemany("""
+                    INSERT INTO starredmessage (message_id, channel_id, guild_id, stars, author_id, created_at) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(message_id) DO UPDATE SET stars = excluded.stars, author_id = COALESCE(excluded.author_id, author_id)
+                    """, [(sm.message_id, sm.channel_id, sm.guild_id, sm.stars, sm.author_id, sm.created_at) for sm in counts if sm.stars > 0])
+                    await cur.executemany("UPDATE starredmessage SET stars = 0 WHERE message_id = ?", [(sm.message_id,) for sm in counts if sm.stars == 0])
 
-                await db.commit()
+                await cur.execute(f"SELECT * FROM starredmessage WHERE message_id IN ({', '.join('?' * len(counts))})", *(sm.message_id for sm in counts))
+                results = await cur.fetchall()
+
+                return [cls(**dict(res)) for res in results]
+
+    @staticmethod
+    async def top_key_at(guild_id: int, /, *, since: int | None = None, offset: int) -> tuple[int, int] | None:
+        """Gets the (stars, message_id) key of the message at a given offset of the guild's leaderboard.
+
+        This only reads the index, so it can be used to seek to a page
+        without loading the messages before it.
+        """
+        where, params = "guild_id = ? AND stars > 0", [guild_id]
+        if since is not None:
+            where, params = where + " AND created_at >= ?", params + [since]
+
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute(f"SELECT stars, message_id FROM starredmessage WHERE {where} ORDER BY stars DESC, message_id DESC LIMIT 1 OFFSET ?", *params, offset)
 
                 res = await cur.fetchone()
 
-                return cls(**dict(res)) if res is not None else None
+                return (res['stars'], res['message_id']) if res is not None else None
 
     @classmethod
-    async def get_by_message_id(cls, message_id: int, /) -> StarredMessage | None:
+    async def top_in_guild(cls, guild_id: int, /, *, since: int | None = None, after: tuple[int, int] | None = None, limit: int) -> list[StarredMessage]:
+        """Gets the most starred messages in a guild that come after the given (stars, message_id) key,
+        optionally only those created since a UTC timestamp.
+
+        Only the columns the leaderboard shows are read so the query is answered from
+        the index, starboard_message_id and created_at are left as None.
+        """
+        where, params = "guild_id = ? AND stars > 0", [guild_id]
+        if since is not None:
+            where, params = where + " AND created_at >= ?", params + [since]
+        if after is not None:
+            where, params = where + " AND (stars, message_id) < (?, ?)", params + list(after)
+
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
-                await cur.execute("SELECT * FROM starredmessage WHERE message_id = ?", message_id)
+                await cur.execute(f"""SELECT message_id, channel_id, guild_id, stars, author_id FROM starredmessage
+                WHERE {where} ORDER BY stars DESC, message_id DESC LIMIT ?""", *params, limit)
+
+                results = await cur.fetchall()
+
+                return [cls(**dict(res), starboard_message_id=None) for res in results]
+
+    @staticmethod
+    async def count_in_guild(guild_id: int, /, *, since: int | None = None) -> int:
+        """Counts the starred messages in a guild, optionally only those created since a UTC timestamp."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                if since is None:
+                    await cur.execute("SELECT COUNT(*) FROM starredmessage WHERE guild_id = ? AND stars > 0", guild_id)
+                else:
+                    await cur.execute("SELECT COUNT(*) FROM starredmessage WHERE guild_id = ? AND created_at >= ? AND stars > 0", guild_id, since)
 
                 res = await cur.fetchone()
 
-                return cls(**dict(res)) if res is not None else None
+                return res[0]
+
+    @staticmethod
+    async def top_author_key_at(guild_id: int, /, *, offset: int) -> tuple[int, int] | None:
+        """Gets the (total stars, author_id) key of the author at a given offset of the guild's leaderboard."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("""SELECT author_id, SUM(stars) AS total FROM starredmessage WHERE guild_id = ? AND author_id IS NOT NULL AND stars > 0
+                GROUP BY author_id ORDER BY total DESC, author_id DESC LIMIT 1 OFFSET ?""", guild_id, offset)
+
+                res = await cur.fetchone()
+
+                return (res['total'], res['author_id']) if res is not None else None
+
+    @staticmethod
+    async def top_authors_in_guild(guild_id: int, /, *, after: tuple[int, int] | None = None, limit: int) -> list[tuple[int, int, int]]:
+        """Gets the authors with the most stars in a guild that come after the given (total stars, author_id) key.
+
+        Returns
+        -------
+        list[tuple[int, int, int]]
+            (author_id, total stars, starred messages) of every author on the page.
+        """
+        having, params = "", []
+        if after is not None:
+            having, params = "HAVING (total, author_id) < (?, ?)", list(after)
+
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute(f"""SELECT author_id, SUM(stars) AS total, COUNT(*) AS messages FROM starredmessage
+                WHERE guild_id = ? AND author_id IS NOT NULL AND stars > 0 GROUP BY author_id {having}
+                ORDER BY total DESC, author_id DESC LIMIT ?""", guild_id, *params, limit)
+
+                results = await cur.fetchall()
+
+                return [(res['author_id'], res['total'], res['messages']) for res in results]
+
+    @staticmethod
+    async def count_authors_in_guild(guild_id: int, /) -> int:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT COUNT(DISTINCT author_id) FROM starredmessage WHERE guild_id = ? AND author_id IS NOT NULL AND stars > 0", guild_id)
+
+                res = await cur.fetchone()
+
+                return res[0]
+
+    @staticmethod
+    async def delete_by_message_ids(message_ids: Collection[int], /) -> list[tuple[int, int | None]]:
+        """Deletes the entries for the given starred messages.
+
+        Returns
+        -------
+        list[tuple[int, int | None]]
+            The (message_id, starboard_message_id) of every deleted entry.
+        """
+        if not message_ids:
+            return []
+
+        params = ", ".join("?" * len(message_ids))
+
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute(f"""DELETE FROM starredmessage WHERE message_id IN ({params})
+                RETURNING message_id, starboard_message_id""", *message_ids)
+
+                results = await cur.fetchall()
+
+                await db.commit()
+
+                return [(res['message_id'], res['starboard_message_id']) for res in results]
+
+    @staticmethod
+    async def clear_starboard_message_ids(starboard_message_ids: Collection[int], /) -> list[int]:
+        """Forgets the given starboard posts, keeping the star counts of their messages.
+
+        Returns
+        -------
+        list[int]
+            The message ids of the starred messages that had one of the posts.
+        """
+        if not starboard_message_ids:
+            return []
+
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute(f"""UPDATE starredmessage SET starboard_message_id = NULL
+                WHERE starboard_message_id IN ({', '.join('?' * len(starboard_message_ids))}) RETURNING message_id""", *starboard_message_ids)
+
+                results = await cur.fetchall()
+
+                await db.commit()
+
+                return [res['message_id'] for res in results]
+
+    @staticmethod
+    async def delete_in_channel(channel_id: int, /) -> list[tuple[int, int | None]]:
+        """Deletes the entries for every message in a channel.
+
+        Returns
+        -------
+        list[tuple[int, int | None]]
+            The (message_id, starboard_message_id) of every deleted entry.
+        """
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("DELETE FROM starredmessage WHERE channel_id = ? RETURNING message_id, starboard_message_id", channel_id)
+
+                results = await cur.fetchall()
+
+                await db.commit()
+
+                return [(res['message_id'], res['starboard_message_id']) for res in results]
+
+    @staticmethod
+    async def delete_in_guild(guild_id: int, /) -> int:
+        """Deletes the entries for every message in a guild, returns the number deleted."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("DELETE FROM starredmessage WHERE guild_id = ?", guild_id)
+
+                await db.commit()
+
+                return cur.get_cursor().rowcount
 
     async def update_starboard_message_id(self, starboard_message_id: int | None, /) -> StarredMessage:
         async with asqlite.connect(DB_FILENAME) as db:
@@ -116,11 +367,47 @@ class StarredMessage:
 
                 return self
 
-    async def embed(self, bot: commands.Bot, /) -> discord.Embed:
-        channel = bot.get_channel(self.channel_id)
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.message_id}"
+
+    @property
+    def starboard_content(self) -> str:
+        """The content of this message's starboard post, holds the live star count."""
+        return f"\N{WHITE MEDIUM STAR} **{self.stars}** <#{self.channel_id}> ID: {self.message_id}"
 
+    def embed(self, message: discord.Message, /) -> discord.Embed:
+        """Renders the starboard embed for the starred message.
 
-        embed = discord.Embed(title="This is a test", description="this is a test")
+        The star count lives in `starboard_content`, so the embed only needs
+        to be rebuilt when the starred message itself changes.
+
+        Parameters
+        ----------
+        message : discord.Message
+            The starred message.
+        """
+        embed = discord.Embed(description=message.content, color=discord.Color.gold(), timestamp=message.created_at)
+        embed.set_author(name=message.author.display_name, icon_url=message.author.display_avatar.url)
+
+        if message.embeds:
+            data = message.embeds[0]
+            if data.type == "image" and data.url:
+                embed.set_image(url=data.url)
+            elif not message.content and data.description:
+                embed.description = data.description
+
+        files = []
+        for attachment in message.attachments:
+            if embed.image.url is None and attachment.content_type is not None and attachment.content_type.startswith("image/") and not attachment.is_spoiler():
+                embed.set_image(url=attachment.url)
+            else:
+                files.append(f"[{attachment.filename}]({attachment.url})")
+
+        if files:
+            embed.add_field(name="Attachments", value=discord.utils.escape_mentions("\n".join(files))[:1024], inline=False)
+
+        embed.add_field(name="Original", value=f"[Jump to message]({message.jump_url})", inline=False)
 
         return embed
 
@@ -155,6 +442,16 @@ class StarboardGuild:
 
                 return cls(**dict(res)) if res is not None else None
 
+    @classmethod
+    async def get_all(cls) -> list[StarboardGuild]:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT * FROM starboardguild")
+
+                results = await cur.fetchall()
+
+                return [cls(**dict(res)) for res in results]
+
     async def update_channel_id(self, new_channel_id: int, /) -> StarboardGuild:
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
@@ -166,6 +463,15 @@ class StarboardGuild:
 
                 return self
 
+    async def delete(self) -> int:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("DELETE FROM starboardguild WHERE id = ?", self.id)
+
+                await db.commit()
+
+                return cur.get_cursor().rowcount
+
     async def update_required_stars(self, new_stars_required: int, /) -> StarboardGuild:
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
@@ -178,79 +484,755 @@ class StarboardGuild:
                 return self
 
 
+@dataclass(slots=True)
+class BackfillCheckpoint:
+    channel_id: int
+    guild_id: int
+    last_message_id: int | None
+    processed: int
+    completed: int
+
+    @classmethod
+    async def get_or_create(cls, *, channel_id: int, guild_id: int) -> BackfillCheckpoint:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("""INSERT INTO starboardbackfill (channel_id, guild_id) VALUES (?, ?)
+                ON CONFLICT(channel_id) DO UPDATE SET guild_id = excluded.guild_id RETURNING *""", channel_id, guild_id)
+
+                res = await cur.fetchone()
+
+                await db.commit()
+
+                return cls(**dict(res))
+
+    @staticmethod
+    async def clear_for_guild(guild_id: int, /) -> int:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("DELETE FROM starboardbackfill WHERE guild_id = ?", guild_id)
+
+                await db.commit()
+
+                return cur.get_cursor().rowcount
+
+    async def save(self) -> BackfillCheckpoint:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("UPDATE starboardbackfill SET last_message_id = ?, processed = ?, completed = ? WHERE channel_id = ?",
+                self.last_message_id, self.processed, self.completed, self.channel_id)
+
+                await db.commit()
+
+                return self
+
+
+class StarCounter:
+    """Holds star counts in memory and writes them to the database in batches.
+
+    Once a message is loaded its in-memory count is authoritative, so threshold
+    checks never wait on a write. Changed messages are marked dirty until `flush`
+    writes them, dirty messages are never evicted.
+    """
+    def __init__(self, *, max_cached: int = MAX_CACHED_MESSAGES) -> None:
+        self.max_cached = max_cached
+        self._messages: OrderedDict[int, StarredMessage] = OrderedDict()
+        self._dirty: set[int] = set()
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        """The number of messages with counts that have not been written yet."""
+        return len(self._dirty)
+
+    async def get(self, message_id: int, /) -> StarredMessage | None:
+        """Gets the StarredMessage for a message id, loading it from the database if needed."""
+        if (sm := self._messages.get(message_id)) is not None:
+            self._messages.move_to_end(message_id)
+            return sm
+
+        sm = await StarredMessage.get_by_message_id(message_id)
+
+        # Another reaction may have loaded this message while we were waiting.
+        if message_id in self._messages:
+            return self._messages[message_id]
+
+        if sm is not None:
+            self._messages[message_id] = sm
+            self._evict()
+
+        return sm
+
+    async def increment(self, *, message_id: int, channel_id: int, guild_id: int) -> StarredMessage:
+        sm = await self.get(message_id)
+
+        if sm is None:
+            created_at = int(discord.utils.snowflake_time(message_id).timestamp())
+            sm = StarredMessage(message_id=message_id, channel_id=channel_id, guild_id=guild_id, stars=0, starboard_message_id=None, created_at=created_at)
+            self._messages[message_id] = sm
+
+        sm.stars += 1
+        self._dirty.add(message_id)
+
+        return sm
+
+    async def decrement(self, message_id: int, /) -> StarredMessage | None:
+        sm = await self.get(message_id)
+
+        if sm is None:
+            return None
+
+        sm.stars = max(sm.stars - 1, 0)
+        self._dirty.add(message_id)
+
+        return sm
+
+    def mark_dirty(self, message_id: int, /) -> None:
+        """Marks a cached message as changed so the next flush writes it."""
+        if message_id in self._messages:
+            self._dirty.add(message_id)
+
+    async def set_starboard_message_id(self, sm: StarredMessage, starboard_message_id: int | None, /) -> None:
+        """Records a message's starboard post.
+
+        Cached messages are changed in memory and written by the next flush, so the
+        post id is saved along with counts that haven't been written yet and a flush
+        in progress can't overwrite it with an older value.
+
+        Parameters
+        ----------
+        sm : StarredMessage
+            The starred message.
+        starboard_message_id : int | None
+            The id of its starboard post, None if it no longer has one.
+        """
+        sm.starboard_message_id = starboard_message_id
+
+        if (cached := self._messages.get(sm.message_id)) is not None:
+            cached.starboard_message_id = starboard_message_id
+            self._dirty.add(sm.message_id)
+            return
+
+        # Evicted since it was loaded, evicted messages are always written already.
+        async with self._flush_lock:
+            await sm.update_starboard_message_id(starboard_message_id)
+
+    async def flush(self) -> int:
+        """Writes all pending star counts to the database.
+
+        Returns
+        -------
+        int
+            The number of messages written.
+        """
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+
+            dirty, self._dirty = self._dirty, set()
+            batch = [self._messages[message_id] for message_id in dirty if message_id in self._messages]
+
+            try:
+                await StarredMessage.bulk_save(batch)
+            except BaseException:
+                # Keep them pending so they are written on the next flush.
+                self._dirty |= dirty
+                raise
+
+            self._evict()
+
+            return len(batch)
+
+    async def reconcile(self, counts: list[StarredMessage], /) -> list[StarredMessage]:
+        """Overwrites star counts with ones counted elsewhere, e.g. from channel history.
+
+        Parameters
+        ----------
+        counts : list[StarredMessage]
+            The messages and star counts to set.
+
+        Returns
+        -------
+        list[StarredMessage]
+            The entries for the given messages after the update.
+        """
+        async with self._flush_lock:
+            for count in counts:
+                if (sm := self._messages.get(count.message_id)) is not None:
+                    sm.stars = count.stars
+                    sm.author_id = sm.author_id or count.author_id
+                    # Left dirty if it was, bulk_set_stars only writes counts so a pending post id would be lost.
+
+            results = await StarredMessage.bulk_set_stars(counts)
+
+            # Hand back the cached objects so later changes are made on the ones the counter holds.
+            return [self._messages.get(sm.message_id, sm) for sm in results]
+
+    async def delete(self, message_ids: Collection[int], /) -> list[tuple[int, int | None]]:
+        """Deletes the given starred messages from memory and the database.
+
+        Returns
+        -------
+        list[tuple[int, int | None]]
+            The (message_id, starboard_message_id) of every deleted entry.
+        """
+        # Holding the flush lock stops a flush in progress from writing the entries back.
+        async with self._flush_lock:
+            deleted = {message_id: self._messages[message_id].starboard_message_id for message_id in message_ids if message_id in self._messages}
+            deleted.update(await StarredMessage.delete_by_message_ids(message_ids))
+
+            self._forget(deleted)
+
+            return list(deleted.items())
+
+    async def clear_starboard_posts(self, starboard_message_ids: Collection[int], /) -> list[int]:
+        """Forgets the given starboard posts in memory and the database, the star counts are kept.
+
+        Returns
+        -------
+        list[int]
+            The message ids of the starred messages that had one of the posts.
+        """
+        async with self._flush_lock:
+            cleared = {sm.message_id for sm in self._messages.values() if sm.starboard_message_id in starboard_message_ids}
+            for message_id in cleared:
+                self._messages[message_id].starboard_message_id = None
+
+            cleared.update(await StarredMessage.clear_starboard_message_ids(starboard_message_ids))
+
+            return list(cleared)
+
+    async def delete_in_channel(self, channel_id: int, /) -> list[tuple[int, int | None]]:
+        """Deletes every message in a channel from memory and the database.
+
+        Returns
+        -------
+        list[tuple[int, int | None]]
+            The (message_id, starboard_message_id) of every deleted entry.
+        """
+        async with self._flush_lock:
+            deleted = {sm.message_id: sm.starboard_message_id for sm in self._messages.values() if sm.channel_id == channel_id}
+            deleted.update(await StarredMessage.delete_in_channel(channel_id))
+
+            self._forget(deleted)
+
+            return list(deleted.items())
+
+    async def delete_in_guild(self, guild_id: int, /) -> int:
+        """Deletes every message in a guild from memory and the database, returns the number deleted."""
+        async with self._flush_lock:
+            self._forget([sm.message_id for sm in self._messages.values() if sm.guild_id == guild_id])
+
+            return await StarredMessage.delete_in_guild(guild_id)
+
+    def _forget(self, message_ids: Collection[int], /) -> None:
+        for message_id in message_ids:
+            self._messages.pop(message_id, None)
+            self._dirty.discard(message_id)
+
+    def _evict(self) -> None:
+        excess = len(self._messages) - self.max_cached
+        if excess <= 0:
+            return
+
+        # Least recently used first, stops as soon as enough clean messages are found.
+        stale = []
+        for message_id in self._messages:
+            if len(stale) >= excess:
+                break
+            if message_id not in self._dirty:
+                stale.append(message_id)
+
+        for message_id in stale:
+            del self._messages[message_id]
+
+
+class MessageLeaderboardSource(PageSource[discord.Embed]):
+    """Pages through a guild's most starred messages, reading one page per press.
+
+    Pages are read with keyset pagination on (stars, message_id), the key of the
+    last message on every page seen so far is kept so moving forward never
+    rescans earlier pages.
+    """
+    def __init__(self, *, guild_id: int, total: int, since: int | None, title: str) -> None:
+        self.guild_id = guild_id
+        self.total = total
+        self.since = since
+        self.title = title
+        self._page_ends: dict[int, tuple[int, int]] = {} # page index -> key of its last message
+
+    def get_max_pages(self) -> int:
+        return max(1, -(-self.total // LEADERBOARD_PER_PAGE)) # ceil
+
+    async def _key_before(self, index: int) -> tuple[int, int] | None:
+        if index == 0:
+            return None
+
+        if (key := self._page_ends.get(index - 1)) is not None:
+            return key
+
+        return await StarredMessage.top_key_at(self.guild_id, since=self.since, offset=index * LEADERBOARD_PER_PAGE - 1)
+
+    async def get_page(self, index: int) -> discord.Embed:
+        offset = index * LEADERBOARD_PER_PAGE
+        messages = await StarredMessage.top_in_guild(self.guild_id, since=self.since, after=await self._key_before(index), limit=LEADERBOARD_PER_PAGE)
+
+        if messages:
+            self._page_ends[index] = (messages[-1].stars, messages[-1].message_id)
+
+        out = "\n".join(
+            f"{rank}. \N{WHITE MEDIUM STAR} **{sm.stars}** [Jump]({sm.jump_url})" + (f" by <@{sm.author_id}>" if sm.author_id else "")
+            for rank, sm in enumerate(messages, offset + 1)
+        )
+
+        return discord.Embed(title=self.title, description=out or "Nothing here.", color=discord.Color.gold())
+
+
+class AuthorLeaderboardSource(PageSource[discord.Embed]):
+    """Pages through the authors with the most stars in a guild, reading one page per press.
+
+    Uses keyset pagination on (total stars, author_id) like `MessageLeaderboardSource`.
+    """
+    def __init__(self, *, guild_id: int, total: int) -> None:
+        self.guild_id = guild_id
+        self.total = total
+        self._page_ends: dict[int, tuple[int, int]] = {} # page index -> key of its last author
+
+    def get_max_pages(self) -> int:
+        return max(1, -(-self.total // LEADERBOARD_PER_PAGE)) # ceil
+
+    async def _key_before(self, index: int) -> tuple[int, int] | None:
+        if index == 0:
+            return None
+
+        if (key := self._page_ends.get(index - 1)) is not None:
+            return key
+
+        return await StarredMessage.top_author_key_at(self.guild_id, offset=index * LEADERBOARD_PER_PAGE - 1)
+
+    async def get_page(self, index: int) -> discord.Embed:
+        offset = index * LEADERBOARD_PER_PAGE
+        authors = await StarredMessage.top_authors_in_guild(self.guild_id, after=await self._key_before(index), limit=LEADERBOARD_PER_PAGE)
+
+        if authors:
+            self._page_ends[index] = (authors[-1][1], authors[-1][0])
+
+        out = "\n".join(
+            f"{rank}. <@{author_id}>: \N{WHITE MEDIUM STAR} **{total}** across {messages} messages"
+            for rank, (author_id, total, messages) in enumerate(authors, offset + 1)
+        )
+
+        return discord.Embed(title="Most Starred Authors", description=out or "Nothing here.", color=discord.Color.gold())
+
+
+class StarboardBackfill:
+    """Seeds and reconciles star counts by streaming channel history.
+
+    Star counts come with the messages returned by the history endpoint, so no
+    request is made per message. History is read `BACKFILL_BATCH_SIZE` messages
+    at a time and each batch is written before the next is read, so memory stays
+    flat however long the channel is. Progress is checkpointed per channel after
+    every batch and a later run resumes from there, including in channels that
+    were already completed, so it only reads messages sent since. Rewriting a
+    batch is harmless since counts are set rather than incremented.
+
+    Counts of messages before the checkpoint are not read again, clearing the
+    checkpoints with `starboard backfill reset` makes the next run reconcile them.
+    """
+    def __init__(self, cog: StarboardCog, guild: discord.Guild, channels: list[discord.TextChannel]) -> None:
+        self.cog = cog
+        self.guild = guild
+        self.channels = channels
+        self.channels_done = 0
+        self.processed = 0
+        self.starred = 0
+        self.failed: list[discord.TextChannel] = []
+
+    @property
+    def progress_text(self) -> str:
+        return (f"Backfilled {self.channels_done}/{len(self.channels)} channels, "
+                f"{self.processed:,} messages read, {self.starred:,} starred messages found.")
+
+    async def run(self) -> None:
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+
+        async def run_one(channel: discord.TextChannel) -> None:
+            async with semaphore:
+                try:
+                    await self._backfill_channel(channel)
+                except discord.HTTPException:
+                    _logger.exception(f"Failed to backfill {channel.id=}")
+                    self.failed.append(channel)
+
+        await asyncio.gather(*(run_one(channel) for channel in self.channels))
+
+    async def _backfill_channel(self, channel: discord.TextChannel, /) -> None:
+        checkpoint = await BackfillCheckpoint.get_or_create(channel_id=channel.id, guild_id=self.guild.id)
+
+        # Completed channels are read on from where they finished, so only messages sent since are fetched.
+        after = discord.Object(id=checkpoint.last_message_id) if checkpoint.last_message_id is not None else None
+        batch: list[discord.Message] = []
+
+        async for message in channel.history(limit=None, after=after, oldest_first=True):
+            batch.append(message)
+
+            if len(batch) >= BACKFILL_BATCH_SIZE:
+                await self._save_batch(checkpoint, batch)
+                batch = []
+
+        await self._save_batch(checkpoint, batch)
+
+        if not checkpoint.completed:
+            checkpoint.completed = True
+            await checkpoint.save()
+
+        self.channels_done += 1
+
+    async def _save_batch(self, checkpoint: BackfillCheckpoint, batch: list[discord.Message], /) -> None:
+        if not batch:
+            return
+
+        counts = []
+        for message in batch:
+            reaction = discord.utils.find(lambda r: str(r.emoji) == self.cog.STAR_EMOJI, message.reactions)
+            counts.append(StarredMessage(
+                message_id=message.id,
+                channel_id=message.channel.id,
+                guild_id=self.guild.id,
+                stars=reaction.count if reaction is not None else 0,
+                starboard_message_id=None,
+                author_id=message.author.id,
+                created_at=int(message.created_at.timestamp()),
+            ))
+
+        results = await self.cog.star_counter.reconcile(counts)
+
+        checkpoint.last_message_id = batch[-1].id
+        checkpoint.processed += len(batch)
+        await checkpoint.save()
+
+        self.processed += len(batch)
+        self.starred += sum(1 for count in counts if count.stars > 0)
+
+        sg = await self.cog.guild_configs.get(self.guild.id)
+        if sg is None:
+            return
+
+        for sm in results:
+            if sm.starboard_message_id is not None:
+                self.cog.schedule_refresh(sm.message_id)
+            elif sm.stars >= sg.stars_required:
+                await self.cog.refresh_starboard_message(sm.message_id)
+
+
 class StarboardCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         # \U00002b50 -> ⭐️
         self.STAR_EMOJI = "\U00002b50"
+        self.star_counter = StarCounter()
+        self.guild_configs: GuildConfigCache[StarboardGuild] = GuildConfigCache(StarboardGuild.get_or_none)
+        self._message_locks: weakref.WeakValueDictionary[int, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._scheduled_refreshes: dict[int, asyncio.Task[None]] = {}
+        self._rerender: set[int] = set() # messages that were edited since their post was last refreshed
+        self._backfills: dict[int, asyncio.Task[None]] = {} # guild id -> running backfill
 
     async def cog_load(self) -> None:
         async with asqlite.connect(DB_FILENAME) as db:
             await db.executescript(STARBOARD_SETUP_SQL)
+            await apply_migrations(db, STARBOARD_MIGRATIONS)
+        self.guild_configs.prime({sg.id: sg for sg in await StarboardGuild.get_all()})
+        self.flush_stars_loop.start()
+
+    async def cog_unload(self) -> None:
+        # Let a running flush finish rather than cancelling it part way, then write whatever is left.
+        self.flush_stars_loop.stop()
+        flushed = await self.star_counter.flush()
+        _logger.info(f"Flushed {flushed} star counts on unload.")
+
+        for task in self._scheduled_refreshes.values():
+            task.cancel()
+
+        for task in self._backfills.values():
+            task.cancel()
+
+    @tasks.loop(seconds=STAR_FLUSH_INTERVAL)
+    async def flush_stars_loop(self) -> None:
+        try:
+            flushed = await self.star_counter.flush()
+        except Exception:
+            _logger.exception("Failed to flush star counts, they will be retried.")
+            return
+
+        if flushed:
+            _logger.debug(f"Flushed {flushed} star counts.")
+
+    def _lock_for(self, message_id: int, /) -> asyncio.Lock:
+        # Held for as long as someone is using it, then dropped from the mapping.
+        lock = self._message_locks.get(message_id)
+        if lock is None:
+            lock = self._message_locks[message_id] = asyncio.Lock()
+        return lock
+
+    async def _fetch_source_message(self, sm: StarredMessage, /) -> discord.Message | None:
+        message = discord.utils.get(self.bot.cached_messages, id=sm.message_id)
+        if message is not None:
+            return message
+
+        channel = self.bot.get_channel(sm.channel_id)
+        if not isinstance(channel, discord.abc.Messageable):
+            return None
+
+        try:
+            return await channel.fetch_message(sm.message_id)
+        except discord.HTTPException:
+            return None
+
+    async def refresh_starboard_message(self, message_id: int, /, *, rerender: bool = False) -> None:
+        """Brings the starboard post for a message in line with its current star count.
+
+        Posts, edits or removes the post as needed. This holds a per-message lock
+        so concurrent reactions can never post the same message twice.
+
+        Parameters
+        ----------
+        message_id : int
+            The id of the starred message.
+        rerender : bool, optional
+            Whether to rebuild the embed of an existing post, by default False
+        """
+        async with self._lock_for(message_id):
+            sm = await self.star_counter.get(message_id)
+            if sm is None:
+                return
+
+            sg = await self.guild_configs.get(sm.guild_id)
+            if sg is None:
+                return
+
+            starboard = self.bot.get_channel(sg.starboard_channel_id)
+            if not isinstance(starboard, discord.TextChannel):
+                _logger.error(f"Invalid channel id for guild {sm.guild_id}")
+                return
+
+            if sm.stars >= sg.stars_required:
+                if sm.starboard_message_id is None:
+                    message = await self._fetch_source_message(sm)
+                    if message is None:
+                        return
+
+                    if sm.author_id is None:
+                        sm.author_id = message.author.id
+                        self.star_counter.mark_dirty(sm.message_id)
+
+                    try:
+                        msg = await starboard.send(sm.starboard_content, embed=sm.embed(message))
+                    except discord.HTTPException:
+                        _logger.error(f"Could not send message in {starboard.id=}")
+                        return
+
+                    await self.star_counter.set_starboard_message_id(sm, msg.id)
+                else:
+                    embed = discord.utils.MISSING
+                    if rerender and (message := await self._fetch_source_message(sm)) is not None:
+                        embed = sm.embed(message)
+
+                    try:
+                        await starboard.get_partial_message(sm.starboard_message_id).edit(content=sm.starboard_content, embed=embed)
+                    except discord.NotFound:
+                        # The post was removed by hand, it's reposted on the next star.
+                        await self.star_counter.set_starboard_message_id(sm, None)
+                    except discord.HTTPException:
+                        _logger.error(f"Could not edit starboard message {sm.starboard_message_id=}")
+
+            elif sm.starboard_message_id is not None:
+                try:
+                    await starboard.get_partial_message(sm.starboard_message_id).delete()
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException:
+                    _logger.error(f"Could not delete starboard message {sm.starboard_message_id=}")
+                    return
+
+                await self.star_counter.set_starboard_message_id(sm, None)
+
+    def schedule_refresh(self, message_id: int, /, *, rerender: bool = False) -> None:
+        """Refreshes a message's starboard post after `STARBOARD_EDIT_DELAY`.
+
+        Any changes made before then are covered by the same refresh, so a burst
+        of stars results in a single edit.
+
+        Parameters
+        ----------
+        message_id : int
+            The id of the starred message.
+        rerender : bool, optional
+            Whether the embed needs rebuilding because the message was edited, by default False
+        """
+        if rerender:
+            self._rerender.add(message_id)
+
+        if message_id in self._scheduled_refreshes:
+            return
+
+        self._scheduled_refreshes[message_id] = asyncio.create_task(self._refresh_later(message_id))
+
+    async def _refresh_later(self, message_id: int, /) -> None:
+        await asyncio.sleep(STARBOARD_EDIT_DELAY)
+
+        # Changes from here on need a refresh of their own.
+        self._scheduled_refreshes.pop(message_id, None)
+        rerender = message_id in self._rerender
+        self._rerender.discard(message_id)
+
+        try:
+            await self.refresh_starboard_message(message_id, rerender=rerender)
+        except Exception:
+            _logger.exception(f"Failed to refresh starboard message for {message_id=}")
 
     @commands.Cog.listener(name="on_raw_reaction_add")
     async def starboard_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
         if not payload.guild_id: return
         if not str(payload.emoji) == self.STAR_EMOJI: return
 
-        sg = await StarboardGuild.get_or_none(payload.guild_id)
+        sg = await self.guild_configs.get(payload.guild_id)
 
         if sg is None:
             return
 
-        sm = await StarredMessage.create_or_increment(message_id=payload.message_id, channel_id=payload.channel_id, guild_id=payload.guild_id)
+        sm = await self.star_counter.increment(message_id=payload.message_id, channel_id=payload.channel_id, guild_id=payload.guild_id)
 
-        if sm.stars >= sg.stars_required:
-            channel = self.bot.get_guild(payload.guild_id).get_channel(sg.starboard_channel_id)
-
-            if not channel:
-                _logger.error(f"Invalid channel id for guild {payload.guild_id}")
-                return
-
-            embed = await sm.embed(self.bot)
-
-            if sm.starboard_message_id is None:
-                try:
-                    msg = await channel.send(embed=embed) # TODO
-                except (discord.HTTPException, discord.Forbidden):
-                    _logger.error(f"Could not send message in {channel.id=}")
-                    return
-
-                await sm.update_starboard_message_id(msg.id)
+        if self.star_counter.pending >= STAR_FLUSH_BATCH_SIZE:
+            await self.star_counter.flush()
 
+        if sm.stars >= sg.stars_required and sm.starboard_message_id is None:
+            # Crossing the threshold is posted right away, only count changes are debounced.
+            await self.refresh_starboard_message(sm.message_id)
+        elif sm.starboard_message_id is not None:
+            self.schedule_refresh(sm.message_id)
 
     @commands.Cog.listener(name="on_raw_reaction_remove")
     async def starboard_reaction_remove(self, payload: discord.RawReactionActionEvent) -> None:
         if not payload.guild_id: return
         if not str(payload.emoji) == self.STAR_EMOJI: return
 
-        sg = await StarboardGuild.get_or_none(payload.guild_id)
+        sg = await self.guild_configs.get(payload.guild_id)
 
         if sg is None:
             return
 
-        sm = await StarredMessage.decrement_or_ignore(payload.message_id)
+        sm = await self.star_counter.decrement(payload.message_id)
 
         if sm is None:
             return
 
-        if sm.stars < sg.stars_required and sm.starboard_message_id is not None:
-            pm = self.bot.get_guild(payload.guild_id).get_channel(sg.starboard_channel_id).get_partial_message(sm.starboard_message_id)
-            await pm.delete()
-            await sm.update_starboard_message_id(None)
+        # Removal is debounced too, so stars can't be spammed on and off.
+        if sm.starboard_message_id is not None:
+            self.schedule_refresh(sm.message_id)
+
+
+    def _cancel_refresh(self, message_id: int, /) -> None:
+        self._rerender.discard(message_id)
+        if (task := self._scheduled_refreshes.pop(message_id, None)) is not None:
+            task.cancel()
+
+    async def _delete_starboard_posts(self, starboard: discord.TextChannel, post_ids: Collection[int], /) -> None:
+        # Bulk deletes only work on messages from the last 14 days, older posts are deleted one at a time.
+        cutoff = discord.utils.utcnow() - datetime.timedelta(days=14)
+        recent = [starboard.get_partial_message(post_id) for post_id in post_ids if discord.utils.snowflake_time(post_id) > cutoff]
+        old = [starboard.get_partial_message(post_id) for post_id in post_ids if discord.utils.snowflake_time(post_id) <= cutoff]
+
+        for chunk in discord.utils.as_chunks(recent, 100):
+            try:
+                await starboard.delete_messages(chunk)
+            except discord.HTTPException:
+                old.extend(chunk)
+
+        for message in old:
+            try:
+                await message.delete()
+            except discord.NotFound:
+                pass
+            except discord.HTTPException:
+                _logger.error(f"Could not delete starboard message {message.id=}")
+
+    async def _cleanup_deleted(self, guild_id: int, deleted: list[tuple[int, int | None]], /, *, already_deleted: Collection[int] = ()) -> None:
+        for message_id, _ in deleted:
+            self._cancel_refresh(message_id)
+
+        post_ids = [post_id for _, post_id in deleted if post_id is not None and post_id not in already_deleted]
+        if not post_ids:
+            return
+
+        sg = await self.guild_configs.get(guild_id)
+        if sg is None:
+            return
 
+        starboard = self.bot.get_channel(sg.starboard_channel_id)
+        if isinstance(starboard, discord.TextChannel):
+            await self._delete_starboard_posts(starboard, post_ids)
+
+    async def _handle_deleted(self, guild_id: int, channel_id: int, message_ids: Collection[int], /) -> None:
+        sg = await self.guild_configs.get(guild_id)
+        if sg is None:
+            return
+
+        if channel_id == sg.starboard_channel_id:
+            # Posts removed by hand keep their star counts and are reposted on the next star.
+            for message_id in await self.star_counter.clear_starboard_posts(message_ids):
+                self._cancel_refresh(message_id)
+
+        deleted = await self.star_counter.delete(message_ids)
+        await self._cleanup_deleted(guild_id, deleted, already_deleted=message_ids)
 
     @commands.Cog.listener(name="on_raw_message_delete")
-    async def starboard_reaction(self, payload: discord.RawMessageDeleteEvent) -> None:
-        # remove that cool data from the message_id in the db
+    async def starboard_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        if not payload.guild_id: return
+
+        await self._handle_deleted(payload.guild_id, payload.channel_id, (payload.message_id,))
+
+    @commands.Cog.listener(name="on_raw_bulk_message_delete")
+    async def starboard_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
         if not payload.guild_id: return
 
+        await self._handle_deleted(payload.guild_id, payload.channel_id, payload.message_ids)
+
+    @commands.Cog.listener(name="on_guild_channel_delete")
+    async def starboard_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        sg = await self.guild_configs.get(channel.guild.id)
+        if sg is None: return
+
+        if channel.id == sg.starboard_channel_id:
+            # Every post went with the channel, so the whole starboard goes in one pass.
+            # Refreshes that are still scheduled find nothing to do once the entries are gone.
+            # A running backfill would write counts back, and its checkpoints would be resumed by a later setup.
+            if (task := self._backfills.get(channel.guild.id)) is not None:
+                task.cancel()
+                await asyncio.wait({task})
+
+            removed = await self.star_counter.delete_in_guild(channel.guild.id)
+            await BackfillCheckpoint.clear_for_guild(channel.guild.id)
+            await sg.delete()
+            self.guild_configs.set(channel.guild.id, None)
+
+            _logger.info(f"Starboard channel deleted in guild {channel.guild.id}, removed {removed} starred messages.")
+            return
+
+        deleted = await self.star_counter.delete_in_channel(channel.id)
+        await self._cleanup_deleted(channel.guild.id, deleted)
 
     @commands.Cog.listener(name="on_raw_message_edit")
-    async def starboard_reaction(self, payload: discord.RawMessageUpdateEvent) -> None:
-        # idk, maybe remove that data as well?
+    async def starboard_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
         if not payload.guild_id: return
 
+        sg = await self.guild_configs.get(payload.guild_id)
+        # Every star count change edits a post, those never need a refresh of their own.
+        if sg is None or payload.channel_id == sg.starboard_channel_id: return
+
+        sm = await self.star_counter.get(payload.message_id)
+
+        if sm is not None and sm.starboard_message_id is not None:
+            self.schedule_refresh(sm.message_id, rerender=True)
+
 
     @commands.group()
     @commands.guild_only()
@@ -261,14 +1243,15 @@ class StarboardCog(commands.Cog):
 
     @starboard.command()
     async def setup(self, ctx: commands.Context, channel: discord.TextChannel, required_stars: int) -> None:
-        await StarboardGuild.setup(_id=ctx.guild.id, starboard_channel_id=channel.id, stars_required=required_stars)
+        sg = await StarboardGuild.setup(_id=ctx.guild.id, starboard_channel_id=channel.id, stars_required=required_stars)
+        self.guild_configs.set(ctx.guild.id, sg)
 
         await ctx.send("Starboard is now setup.")
 
     @starboard.command()
     async def config(self, ctx: commands.Context, channel: discord.TextChannel = None, required_stars: int = None) -> None:
 
-        current = await StarboardGuild.get_or_none(ctx.guild.id)
+        current = await self.guild_configs.get(ctx.guild.id)
 
         if not current:
             await ctx.send("Starboard has not been set up, please use the `setup` command.")
@@ -281,8 +1264,151 @@ class StarboardCog(commands.Cog):
             required_stars = max(min(required_stars, 50), 1) # CLAMP
             await current.update_required_stars(required_stars)
 
+        self.guild_configs.set(ctx.guild.id, current)
+
         await ctx.send("Settings updated.")
 
+    @commands.group(invoke_without_command=True)
+    @commands.guild_only()
+    async def stars(self, ctx: commands.Context) -> None:
+        """Starboard leaderboards."""
+        await ctx.send_help(ctx.command)
+
+    @stars.command(name="top")
+    async def stars_top(self, ctx: commands.Context, days: int | None = 7) -> None:
+        """Shows the most starred messages.
+
+        Parameters
+        ----------
+        days : int, optional
+            How many days back to look, 0 for all time. Defaults to 7.
+        """
+        assert ctx.guild
+
+        await self.star_counter.flush() # Include stars that haven't been written yet.
+
+        since = None
+        title = "Most Starred Messages"
+        if days:
+            since = int((discord.utils.utcnow() - datetime.timedelta(days=days)).timestamp())
+            title += f" (last {days} days)"
+
+        total = await StarredMessage.count_in_guild(ctx.guild.id, since=since)
+        if not total:
+            await ctx.send("No starred messages found.")
+            return
+
+        source = MessageLeaderboardSource(guild_id=ctx.guild.id, total=total, since=since, title=title)
+        await self._send_leaderboard(ctx, source)
+
+    @stars.command(name="authors")
+    async def stars_authors(self, ctx: commands.Context) -> None:
+        """Shows the members whose messages have the most stars."""
+        assert ctx.guild
+
+        await self.star_counter.flush()
+
+        total = await StarredMessage.count_authors_in_guild(ctx.guild.id)
+        if not total:
+            await ctx.send("No starred authors found.")
+            return
+
+        await self._send_leaderboard(ctx, AuthorLeaderboardSource(guild_id=ctx.guild.id, total=total))
+
+    async def _send_leaderboard(self, ctx: commands.Context, source: PageSource[discord.Embed], /) -> None:
+        if source.get_max_pages() > 1:
+            await EmbedPaginator.start(ctx, owner=ctx.author, pages=source)
+        else:
+            await ctx.send(embed=await source.get_page(0), allowed_mentions=discord.AllowedMentions.none())
+
+    async def _run_backfill(self, job: StarboardBackfill, status: discord.Message, /) -> None:
+        runner = asyncio.create_task(job.run())
+
+        try:
+            while not runner.done():
+                await asyncio.wait({runner}, timeout=BACKFILL_PROGRESS_INTERVAL)
+                if not runner.done():
+                    try:
+                        await status.edit(content=job.progress_text)
+                    except discord.HTTPException:
+                        pass
+
+            runner.result()
+        except asyncio.CancelledError:
+            runner.cancel()
+            await status.edit(content=f"Backfill cancelled, run it again to resume. {job.progress_text}")
+            raise
+        except Exception:
+            _logger.exception(f"Backfill failed in guild {job.guild.id}")
+            await status.edit(content=f"Backfill failed, run it again to resume. {job.progress_text}")
+        else:
+            out = f"Backfill complete. {job.progress_text}"
+            if job.failed:
+                out += "\nCould not read: " + ", ".join(channel.mention for channel in job.failed)
+            await status.edit(content=out)
+        finally:
+            self._backfills.pop(job.guild.id, None)
+
+    @starboard.group(invoke_without_command=True)
+    async def backfill(self, ctx: commands.Context, *channels: discord.TextChannel) -> None:
+        """Seeds and reconciles star counts from channel history.
+
+        Runs in the background and resumes where a previous run left off, so a later
+        run picks up messages sent since. Use `reset` first to recount older messages.
+
+        Parameters
+        ----------
+        channels : discord.TextChannel, optional
+            The channels to backfill, defaults to every channel I can read.
+        """
+        assert ctx.guild
+
+        sg = await self.guild_configs.get(ctx.guild.id)
+
+        if not sg:
+            await ctx.send("Starboard has not been set up, please use the `setup` command.")
+            return
+
+        if ctx.guild.id in self._backfills:
+            await ctx.send("A backfill is already running in this server.")
+            return
+
+        targets = list(channels) or [
+            channel for channel in ctx.guild.text_channels
+            if channel.id != sg.starboard_channel_id and channel.permissions_for(ctx.guild.me).read_message_history
+        ]
+
+        job = StarboardBackfill(self, ctx.guild, targets)
+        status = await ctx.send(f"Starting backfill. {job.progress_text}")
+
+        self._backfills[ctx.guild.id] = asyncio.create_task(self._run_backfill(job, status))
+
+    @backfill.command(name="cancel")
+    async def backfill_cancel(self, ctx: commands.Context) -> None:
+        """Cancels the running backfill, it can be resumed later."""
+        assert ctx.guild
+
+        task = self._backfills.get(ctx.guild.id)
+
+        if task is None:
+            await ctx.send("No backfill is running in this server.")
+            return
+
+        task.cancel()
+        await ctx.send("Backfill cancelled.")
+
+    @backfill.command(name="reset")
+    async def backfill_reset(self, ctx: commands.Context) -> None:
+        """Forgets backfill progress so the next backfill reads every channel from the start."""
+        assert ctx.guild
+
+        if ctx.guild.id in self._backfills:
+            await ctx.send("Cancel the running backfill first.")
+            return
+
+        removed = await BackfillCheckpoint.clear_for_guild(ctx.guild.id)
+        await ctx.send(f"Cleared backfill progress for {removed} channels.")
+
 
 async def setup(bot: commands.Bot):
     _logger.info("Loading cog StarboardCog")
@@ -23,16 +23,33 @@ from __future__ import annotations
 
 """
 This module uses the following third party libs installed via pip: asqlite (https://github.com/Rapptz/asqlite)
+
+The `/tag` slash commands need to be synced before they can be used, see `utility/sync.py`.
 """
 
+import asyncio
+import csv
+import hashlib
+import io
+import json
 import logging
-from dataclasses import dataclass
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import IO, AsyncIterator, Iterator, Literal
 
+import aiohttp
 import asqlite
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 
-from utils.paginators import EmbedPaginator
+from utils.cache import MISSING, GuildLRUCache
+from utils.db import transaction
+from utils.fuzzy import NGramIndex, PrefixIndex
+from utils.migrations import apply_migrations
+from utils.paginators import AsyncIteratorPageSource, EmbedPaginator, PageSource
 
 ALLOWED_MENTIONS = discord.AllowedMentions.none()
 
@@ -48,8 +65,187 @@ CREATE TABLE IF NOT EXISTS tags (
 )
 """
 
+# Applied in order on top of TAGS_SETUP_SQL by `utils.migrations.apply_migrations`. Only ever append to this.
+TAGS_MIGRATIONS = [
+    # 1: Trigram full text index over tag names and content for `tag search`, kept in sync by triggers.
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tags_fts USING fts5(name, content, content='tags', content_rowid='rowid', tokenize='trigram');
+
+    CREATE TRIGGER IF NOT EXISTS tags_fts_insert AFTER INSERT ON tags BEGIN
+        INSERT INTO tags_fts (rowid, name, content) VALUES (new.rowid, new.name, new.content);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS tags_fts_delete AFTER DELETE ON tags BEGIN
+        INSERT INTO tags_fts (tags_fts, rowid, name, content) VALUES ('delete', old.rowid, old.name, old.content);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS tags_fts_update AFTER UPDATE ON tags BEGIN
+        INSERT INTO tags_fts (tags_fts, rowid, name, content) VALUES ('delete', old.rowid, old.name, old.content);
+        INSERT INTO tags_fts (rowid, name, content) VALUES (new.rowid, new.name, new.content);
+    END;
+
+    INSERT INTO tags_fts (tags_fts) VALUES ('rebuild');
+    """,
+    # 2: Content is stored once per distinct body in `tagcontent`, keyed by its hash, and tags point at it.
+    # Aliases point at a canonical tag and follow it through renames and deletes.
+    # Needs the `content_hash` SQL function, see `_init_connection`.
+    """
+    DROP TRIGGER IF EXISTS tags_fts_insert;
+    DROP TRIGGER IF EXISTS tags_fts_delete;
+    DROP TRIGGER IF EXISTS tags_fts_update;
+    DROP TABLE IF EXISTS tags_fts;
+
+    CREATE TABLE tagcontent (
+        hash TEXT PRIMARY KEY,
+        content TEXT NOT NULL
+    );
+
+    INSERT OR IGNORE INTO tagcontent (hash, content) SELECT content_hash(content), content FROM tags;
+
+    CREATE TABLE tags_new (
+        name TEXT NOT NULL,
+        owner_id BIGINT NOT NULL,
+        guild_id BIGINT NOT NULL,
+        content_hash TEXT NOT NULL REFERENCES tagcontent (hash),
+        PRIMARY KEY(guild_id, name)
+    );
+
+    INSERT INTO tags_new (name, owner_id, guild_id, content_hash) SELECT name, owner_id, guild_id, content_hash(content) FROM tags;
+    DROP TABLE tags;
+    ALTER TABLE tags_new RENAME TO tags;
+
+    CREATE INDEX tags_content_hash_idx ON tags (content_hash);
+
+    CREATE TABLE tagalias (
+        name TEXT NOT NULL,
+        owner_id BIGINT NOT NULL,
+        guild_id BIGINT NOT NULL,
+        target TEXT NOT NULL,
+        PRIMARY KEY(guild_id, name)
+    );
+
+    CREATE INDEX tagalias_target_idx ON tagalias (guild_id, target);
+
+    CREATE TRIGGER tagalias_follow_rename AFTER UPDATE OF name ON tags BEGIN
+        UPDATE tagalias SET target = new.name WHERE guild_id = old.guild_id AND target = old.name;
+    END;
+
+    CREATE TRIGGER tagalias_follow_delete AFTER DELETE ON tags BEGIN
+        DELETE FROM tagalias WHERE guild_id = old.guild_id AND target = old.name;
+    END;
+
+    CREATE VIEW tags_fts_source AS
+    SELECT tags.rowid AS tag_rowid, tags.name AS name, tagcontent.content AS content
+    FROM tags JOIN tagcontent ON tagcontent.hash = tags.content_hash;
+
+    CREATE VIRTUAL TABLE tags_fts USING fts5(name, content, content='tags_fts_source', content_rowid='tag_rowid', tokenize='trigram');
+
+    CREATE TRIGGER tags_fts_insert AFTER INSERT ON tags BEGIN
+        INSERT INTO tags_fts (rowid, name, content) VALUES (new.rowid, new.name, (SELECT content FROM tagcontent WHERE hash = new.content_hash));
+    END;
+
+    CREATE TRIGGER tags_fts_delete AFTER DELETE ON tags BEGIN
+        INSERT INTO tags_fts (tags_fts, rowid, name, content) VALUES ('delete', old.rowid, old.name, (SELECT content FROM tagcontent WHERE hash = old.content_hash));
+    END;
+
+    CREATE TRIGGER tags_fts_update AFTER UPDATE ON tags BEGIN
+        INSERT INTO tags_fts (tags_fts, rowid, name, content) VALUES ('delete', old.rowid, old.name, (SELECT content FROM tagcontent WHERE hash = old.content_hash));
+        INSERT INTO tags_fts (rowid, name, content) VALUES (new.rowid, new.name, (SELECT content FROM tagcontent WHERE hash = new.content_hash));
+    END;
+
+    INSERT INTO tags_fts (tags_fts) VALUES ('rebuild');
+    """,
+    # 3: Use counts for `tag top` and `tag stale`. The FTS update trigger is narrowed first so
+    # writing use counts doesn't rewrite the tag's FTS row. Existing tags count as used now.
+    """
+    DROP TRIGGER tags_fts_update;
+
+    CREATE TRIGGER tags_fts_update AFTER UPDATE OF name, content_hash ON tags BEGIN
+        INSERT INTO tags_fts (tags_fts, rowid, name, content) VALUES ('delete', old.rowid, old.name, (SELECT content FROM tagcontent WHERE hash = old.content_hash));
+        INSERT INTO tags_fts (rowid, name, content) VALUES (new.rowid, new.name, (SELECT content FROM tagcontent WHERE hash = new.content_hash));
+    END;
+
+    ALTER TABLE tags ADD COLUMN uses INTEGER NOT NULL DEFAULT 0;
+    ALTER TABLE tags ADD COLUMN last_used_at INTEGER;
+    UPDATE tags SET last_used_at = CAST(strftime('%s', 'now') AS INTEGER);
+
+    CREATE INDEX tags_uses_idx ON tags (guild_id, uses DESC, name);
+    CREATE INDEX tags_last_used_at_idx ON tags (guild_id, last_used_at, name);
+    """,
+    # 4: `tag list` pages through a member's tags in name order.
+    """
+    CREATE INDEX tags_owner_id_idx ON tags (guild_id, owner_id, name);
+    """,
+]
+
+# Gets a tag with its content, following an alias to its canonical tag, in one query.
+# Parameters: guild_id, name, guild_id, name
+RESOLVE_TAG_SQL = """
+SELECT tags.name, tags.owner_id, tags.guild_id, tagcontent.content FROM tags
+JOIN tagcontent ON tagcontent.hash = tags.content_hash
+WHERE tags.guild_id = ? AND tags.name = COALESCE((SELECT target FROM tagalias WHERE guild_id = ? AND name = ?), ?)
+"""
+
+TAGS_PER_PAGE = 20
+MIN_FTS_QUERY_LENGTH = 3 # The trigram tokenizer can't match anything shorter.
+
+TAG_CACHE_SIZE = 10_000 # tags cached across all guilds
+TAG_CACHE_SIZE_PER_GUILD = 1_000
+
+USAGE_FLUSH_INTERVAL = 60 # seconds between writes of pending tag uses
+STALE_TAG_DAYS = 90 # default for `tag stale`
+
+TRANSFER_BATCH_SIZE = 500 # tags per transaction when importing, rows per fetch when exporting
+TRANSFER_CHUNK_SIZE = 64 * 1024 # bytes read from an attachment at a time
+EXPORT_FIELDS = ("name", "owner_id", "content", "uses")
+
+ImportPolicy = Literal["skip", "overwrite", "rename"]
+ExportFormat = Literal["jsonl", "csv"]
+
 _logger = logging.getLogger(__name__)
 
+def content_hash(content: str, /) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def _init_connection(conn: sqlite3.Connection) -> None:
+    conn.create_function("content_hash", 1, content_hash, deterministic=True)
+
+async def _store_content(cur: asqlite.Cursor, content: str, /) -> str:
+    # Stores content if it isn't stored yet, returns its hash. Call inside the writing transaction.
+    digest = content_hash(content)
+    await cur.execute("INSERT INTO tagcontent (hash, content) VALUES (?, ?) ON CONFLICT(hash) DO NOTHING", digest, content)
+    return digest
+
+async def _release_content(cur: asqlite.Cursor, digest: str, /) -> None:
+    # Removes content that no tag uses anymore. Call inside the writing transaction.
+    await cur.execute("DELETE FROM tagcontent WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM tags WHERE content_hash = ?)", digest, digest)
+
+async def _name_taken(cur: asqlite.Cursor, *, name: str, guild_id: int) -> bool:
+    # Tags and aliases share one namespace.
+    await cur.execute("""SELECT EXISTS (SELECT 1 FROM tags WHERE guild_id = ? AND name = ?)
+    OR EXISTS (SELECT 1 FROM tagalias WHERE guild_id = ? AND name = ?)""", guild_id, name, guild_id, name)
+    res = await cur.fetchone()
+    return bool(res[0])
+
+
+@dataclass(slots=True)
+class TagImportResult:
+    created: int = 0 # includes renamed tags
+    overwritten: int = 0
+    renamed: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    names: list[str] = field(default_factory=list) # of created tags, renamed ones under their new name
+
+    def merge(self, other: TagImportResult, /) -> None:
+        """Adds the counts of another result to this one, names are not kept."""
+        self.created += other.created
+        self.overwritten += other.overwritten
+        self.renamed += other.renamed
+        self.skipped += other.skipped
+        self.invalid += other.invalid
+
+
 @dataclass(slots=True)
 class TagEntry:
     name: str
@@ -59,52 +255,639 @@ class TagEntry:
 
     @classmethod
     async def get_or_none(cls, *, name: str, guild_id: int) -> TagEntry | None:
+        """Gets a tag by name, an alias gets the tag it points at."""
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
-                await cur.execute("SELECT * FROM tags WHERE name = ? AND guild_id = ?", name, guild_id)
+                await cur.execute(RESOLVE_TAG_SQL, guild_id, guild_id, name, name)
                 res = await cur.fetchone()
 
                 return cls(**res) if res is not None else None
 
     @classmethod
     async def create(cls, *, name: str, owner_id: int, guild_id: int, content: str) -> TagEntry | None:
+        """Creates a tag, returns None if a tag or alias with that name already exists."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            # Taken for writing up front, so the name can't be taken between checking it and inserting.
+            async with db.cursor() as cur, transaction(db, immediate=True):
+                if await _name_taken(cur, name=name, guild_id=guild_id):
+                    return None
+
+                digest = await _store_content(cur, content)
+                await cur.execute(
+                    "INSERT INTO tags (name, owner_id, guild_id, content_hash, last_used_at) VALUES (?, ?, ?, ?, ?) ON CONFLICT(name, guild_id) DO NOTHING",
+                    name, owner_id, guild_id, digest, int(time.time())
+                )
+                if not cur.get_cursor().rowcount:
+                    await _release_content(cur, digest)
+                    return None
+
+                return cls(name=name, owner_id=owner_id, guild_id=guild_id, content=content)
+
+    @staticmethod
+    async def names_in_guild(guild_id: int, /) -> list[str]:
+        """Gets the name of every tag and alias in a guild."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT name FROM tags WHERE guild_id = ? UNION ALL SELECT name FROM tagalias WHERE guild_id = ?", guild_id, guild_id)
+                results = await cur.fetchall()
+
+                return [res['name'] for res in results]
+
+    async def alias_names(self) -> list[str]:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT name FROM tagalias WHERE guild_id = ? AND target = ?", self.guild_id, self.name)
+                results = await cur.fetchall()
+
+                return [res['name'] for res in results]
+
+    @staticmethod
+    async def iter_names_owned_by(guild_id: int, owner_id: int, /, *, batch_size: int = TAGS_PER_PAGE * 5) -> AsyncIterator[str]:
+        """Yields the names of the tags a member owns in a guild, in order.
+
+        Each batch is its own short query, so nothing is held open while the iterator isn't being read.
+        """
+        last_name = ""
+
+        while True:
+            async with asqlite.connect(DB_FILENAME) as db:
+                async with db.cursor() as cur:
+                    await cur.execute(
+                        "SELECT name FROM tags WHERE guild_id = ? AND owner_id = ? AND name > ? ORDER BY name LIMIT ?",
+                        guild_id, owner_id, last_name, batch_size
+                    )
+                    results = await cur.fetchall()
+
+            for res in results:
+                yield res['name']
+
+            if len(results) < batch_size:
+                return
+
+            last_name = results[-1]['name']
+
+    @staticmethod
+    def _search_sql(query: str, /) -> tuple[str, tuple[str, ...]]:
+        # Returns the FROM/WHERE clause and its parameters for a search, guild_id is the last parameter.
+        if len(query) >= MIN_FTS_QUERY_LENGTH:
+            fts_query = '"' + query.replace('"', '""') + '"' # Match it as one literal phrase.
+            return "FROM tags_fts JOIN tags ON tags.rowid = tags_fts.rowid WHERE tags_fts MATCH ? AND tags.guild_id = ?", (fts_query,)
+
+        # Too short for the trigram index, fall back to a prefix range on the primary key.
+        return "FROM tags WHERE tags.name >= ? AND tags.name < ? AND tags.guild_id = ?", (query, query + "\U0010ffff")
+
+    @staticmethod
+    async def search_count(*, query: str, guild_id: int) -> int:
+        """Counts the tags in a guild whose name or content matches a query."""
+        clause, params = TagEntry._search_sql(query)
+
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute(f"SELECT COUNT(*) {clause}", *params, guild_id)
+                res = await cur.fetchone()
+
+                return res[0]
+
+    @staticmethod
+    async def search(*, query: str, guild_id: int, limit: int, offset: int = 0) -> list[str]:
+        """Gets the names of tags in a guild matching a query, best matches first.
+
+        Name matches are weighted well above content matches.
+        """
+        clause, params = TagEntry._search_sql(query)
+        order = "bm25(tags_fts, 10.0, 1.0)" if len(query) >= MIN_FTS_QUERY_LENGTH else "tags.name"
+
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
-                # TODO upsert?
-                await cur.execute("""INSERT INTO tags (name, owner_id, guild_id, content) VALUES (?, ?, ?, ?)
-                ON CONFLICT(name, guild_id) DO NOTHING RETURNING *""", name, owner_id, guild_id, content)
+                await cur.execute(f"SELECT tags.name {clause} ORDER BY {order} LIMIT ? OFFSET ?", *params, guild_id, limit, offset)
+                results = await cur.fetchall()
 
+                return [res['name'] for res in results]
+
+    @staticmethod
+    async def bulk_add_uses(uses: list[tuple[int, int, int, str]], /) -> None:
+        """Adds to the use counts of tags in a single transaction.
+
+        Parameters
+        ----------
+        uses : list[tuple[int, int, int, str]]
+            (uses to add, last used timestamp, guild_id, name) for each tag.
+        """
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur, transaction(db):
+                await cur.executemany(
+                    "UPDATE tags SET uses = uses + ?, last_used_at = MAX(COALESCE(last_used_at, 0), ?) WHERE guild_id = ? AND name = ?", uses
+                )
+
+    @staticmethod
+    async def count_in_guild(guild_id: int, /) -> int:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT COUNT(*) FROM tags WHERE guild_id = ?", guild_id)
                 res = await cur.fetchone()
-                await db.commit()
 
-                return cls(**res) if res is not None else None
+                return res[0]
 
-    async def delete(self) -> int:
+    @staticmethod
+    async def top_in_guild(guild_id: int, /, *, limit: int, offset: int = 0) -> list[tuple[str, int]]:
+        """Gets the names and use counts of the most used tags in a guild."""
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
-                await cur.execute("DELETE FROM tags WHERE name = ? AND guild_id = ?", self.name, self.guild_id)
-                await db.commit()
+                await cur.execute("SELECT name, uses FROM tags WHERE guild_id = ? ORDER BY uses DESC, name LIMIT ? OFFSET ?", guild_id, limit, offset)
+                results = await cur.fetchall()
 
-                return cur.get_cursor().rowcount
+                return [(res['name'], res['uses']) for res in results]
+
+    @staticmethod
+    async def count_stale_in_guild(guild_id: int, /, *, before: int) -> int:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT COUNT(*) FROM tags WHERE guild_id = ? AND last_used_at < ?", guild_id, before)
+                res = await cur.fetchone()
+
+                return res[0]
+
+    @staticmethod
+    async def stale_in_guild(guild_id: int, /, *, before: int, limit: int, offset: int = 0) -> list[tuple[str, int, int]]:
+        """Gets the tags in a guild that have not been used since a given time, least recently used first.
+
+        Returns
+        -------
+        list[tuple[str, int, int]]
+            (name, uses, last used timestamp) for each tag.
+        """
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute(
+                    "SELECT name, uses, last_used_at FROM tags WHERE guild_id = ? AND last_used_at < ? ORDER BY last_used_at, name LIMIT ? OFFSET ?",
+                    guild_id, before, limit, offset
+                )
+                results = await cur.fetchall()
+
+                return [(res['name'], res['uses'], res['last_used_at']) for res in results]
+
+    @staticmethod
+    async def bulk_import(rows: list[tuple[str, int, str]], /, *, guild_id: int, policy: ImportPolicy) -> TagImportResult:
+        """Creates many tags in a single transaction, so a failure leaves none of them written.
+
+        Parameters
+        ----------
+        rows : list[tuple[str, int, str]]
+            (name, owner_id, content) for each tag.
+        guild_id : int
+            The guild to create the tags in.
+        policy : ImportPolicy
+            What to do when a name is taken. "skip" leaves the existing tag alone, "overwrite" replaces
+            its content and owner and "rename" creates the tag as `name-2`, `name-3`, etc. instead.
+            Names taken by an alias are never overwritten.
+
+        Returns
+        -------
+        TagImportResult
+            What happened to the rows.
+        """
+        result = TagImportResult()
+        now = int(time.time())
+
+        # A name given more than once is written once, with its last row.
+        latest = {name: (name, owner_id, content) for name, owner_id, content in rows}
+        result.skipped += len(rows) - len(latest)
+        rows = list(latest.values())
+        names = json.dumps(list(latest))
+
+        async with asqlite.connect(DB_FILENAME) as db:
+            # One transaction, taken for writing up front so the names looked up can't be taken before they're written.
+            async with db.cursor() as cur, transaction(db, immediate=True):
+                # Look up every name in the batch at once rather than a query per row.
+                await cur.execute("""SELECT name, content_hash FROM tags WHERE guild_id = ? AND name IN (SELECT value FROM json_each(?))
+                UNION ALL SELECT name, NULL FROM tagalias WHERE guild_id = ? AND name IN (SELECT value FROM json_each(?))""", guild_id, names, guild_id, names)
+                taken: dict[str, str | None] = {res['name']: res['content_hash'] for res in await cur.fetchall()} # name -> content hash, None for aliases
+
+                contents: dict[str, str] = {} # hash -> content for the tags being written
+                inserts: list[tuple[str, int, int, str, int]] = []
+                updates: list[tuple[int, str, int, str]] = []
+                replaced: set[str] = set() # hashes that overwritten tags pointed at
+
+                for name, owner_id, content in rows:
+                    digest = content_hash(content)
+
+                    if name in taken:
+                        old_digest = taken[name]
+
+                        if policy == "skip" or (policy == "overwrite" and old_digest is None): # Aliases are never overwritten.
+                            result.skipped += 1
+                            continue
+
+                        if policy == "overwrite":
+                            assert old_digest is not None
+                            replaced.add(old_digest)
+                            taken[name] = digest
+                            contents[digest] = content
+                            updates.append((owner_id, digest, guild_id, name))
+                            result.overwritten += 1
+                            continue
+
+                        suffix = 2
+                        while f"{name}-{suffix}" in taken or await _name_taken(cur, name=f"{name}-{suffix}", guild_id=guild_id):
+                            suffix += 1
+                        name = f"{name}-{suffix}"
+                        result.renamed += 1
+
+                    taken[name] = digest
+                    contents[digest] = content
+                    inserts.append((name, owner_id, guild_id, digest, now))
+                    result.created += 1
+                    result.names.append(name)
+
+                await cur.executemany("INSERT INTO tagcontent (hash, content) VALUES (?, ?) ON CONFLICT(hash) DO NOTHING", list(contents.items()))
+                await cur.executemany("INSERT INTO tags (name, owner_id, guild_id, content_hash, last_used_at) VALUES (?, ?, ?, ?, ?)", inserts)
+                await cur.executemany("UPDATE tags SET owner_id = ?, content_hash = ? WHERE guild_id = ? AND name = ?", updates)
+                # Hashes still used, including by tags written above, are kept by the check in _release_content.
+                for digest in replaced:
+                    await _release_content(cur, digest)
+
+        return result
+
+    @staticmethod
+    async def iter_guild(guild_id: int, /, *, batch_size: int = TRANSFER_BATCH_SIZE) -> AsyncIterator[list[sqlite3.Row]]:
+        """Yields every tag in a guild in batches, without loading them all at once.
+
+        Each row has the columns in `EXPORT_FIELDS`.
+        """
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("""SELECT tags.name, tags.owner_id, tagcontent.content, tags.uses FROM tags
+                JOIN tagcontent ON tagcontent.hash = tags.content_hash WHERE tags.guild_id = ? ORDER BY tags.name""", guild_id)
+
+                while rows := await cur.fetchmany(batch_size):
+                    yield rows
+
+    async def delete(self) -> int:
+        """Deletes this tag and any aliases pointing at it."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur, transaction(db):
+                await cur.execute("DELETE FROM tags WHERE name = ? AND guild_id = ? RETURNING content_hash", self.name, self.guild_id)
+                res = await cur.fetchone()
+
+                if res is None:
+                    return 0
+
+                await _release_content(cur, res['content_hash'])
+
+                return 1
 
     async def update(self, *, new_content: str) -> TagEntry:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur, transaction(db, immediate=True):
+                await cur.execute("SELECT content_hash FROM tags WHERE name = ? AND guild_id = ?", self.name, self.guild_id)
+                old = await cur.fetchone()
+
+                digest = await _store_content(cur, new_content)
+                await cur.execute("UPDATE tags SET content_hash = ? WHERE name = ? AND guild_id = ?", digest, self.name, self.guild_id)
+
+                if old is not None and old['content_hash'] != digest:
+                    await _release_content(cur, old['content_hash'])
+
+                return TagEntry(name=self.name, owner_id=self.owner_id, guild_id=self.guild_id, content=new_content)
+
+    async def rename(self, *, new_name: str) -> TagEntry | None:
+        """Renames this tag, returns None if a tag or alias with the new name already exists."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur, transaction(db, immediate=True):
+                if await _name_taken(cur, name=new_name, guild_id=self.guild_id):
+                    return None
+
+                await cur.execute("UPDATE OR IGNORE tags SET name = ? WHERE name = ? AND guild_id = ?", new_name, self.name, self.guild_id)
+                renamed = cur.get_cursor().rowcount
+
+                return TagEntry(name=new_name, owner_id=self.owner_id, guild_id=self.guild_id, content=self.content) if renamed else None
+
+
+@dataclass(slots=True)
+class TagAlias:
+    name: str
+    owner_id: int
+    guild_id: int
+    target: str
+
+    @classmethod
+    async def get_or_none(cls, *, name: str, guild_id: int) -> TagAlias | None:
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur:
+                await cur.execute("SELECT * FROM tagalias WHERE name = ? AND guild_id = ?", name, guild_id)
+                res = await cur.fetchone()
+
+                return cls(**res) if res is not None else None
+
+    @classmethod
+    async def create(cls, *, name: str, owner_id: int, guild_id: int, target: str) -> TagAlias | None:
+        """Creates an alias for a canonical tag, returns None if the name is taken."""
+        async with asqlite.connect(DB_FILENAME) as db:
+            async with db.cursor() as cur, transaction(db, immediate=True):
+                if await _name_taken(cur, name=name, guild_id=guild_id):
+                    return None
+
+                await cur.execute(
+                    "INSERT INTO tagalias (name, owner_id, guild_id, target) VALUES (?, ?, ?, ?) ON CONFLICT DO NOTHING", name, owner_id, guild_id, target
+                )
+                if not cur.get_cursor().rowcount:
+                    return None
+
+                return cls(name=name, owner_id=owner_id, guild_id=guild_id, target=target)
+
+    async def delete(self) -> int:
         async with asqlite.connect(DB_FILENAME) as db:
             async with db.cursor() as cur:
-                await cur.execute("UPDATE tags SET content = ? WHERE name = ? AND guild_id = ? RETURNING *", new_content, self.name, self.guild_id)
+                await cur.execute("DELETE FROM tagalias WHERE name = ? AND guild_id = ?", self.name, self.guild_id)
                 await db.commit()
 
-                res = await cur.fetchone()
+                return cur.get_cursor().rowcount
+
+
+class TagUsageCounter:
+    """Counts tag uses in memory and writes them to the database in batches.
+
+    Uses are counted against the canonical tag name, so aliases count towards their tag.
+    """
+    def __init__(self) -> None:
+        self._pending: dict[tuple[int, str], tuple[int, int]] = {} # (guild_id, name) -> (uses, last used timestamp)
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        """The number of tags with uses that have not been written yet."""
+        return len(self._pending)
+
+    def record(self, *, guild_id: int, name: str) -> None:
+        key = (guild_id, name)
+        uses, _ = self._pending.get(key, (0, 0))
+        self._pending[key] = (uses + 1, int(time.time()))
+
+    async def flush(self) -> int:
+        """Writes all pending uses to the database.
+
+        Returns
+        -------
+        int
+            The number of tags written.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+
+            try:
+                await TagEntry.bulk_add_uses([(uses, last_used, guild_id, name) for (guild_id, name), (uses, last_used) in pending.items()])
+            except BaseException:
+                # Merge them back in so they are written on the next flush.
+                for key, (uses, last_used) in pending.items():
+                    newer_uses, newer_last_used = self._pending.get(key, (0, 0))
+                    self._pending[key] = (uses + newer_uses, max(last_used, newer_last_used))
+                raise
+
+            return len(pending)
+
+
+async def _download(attachment: discord.Attachment, fp: IO[bytes], /) -> None:
+    # Attachment.read would hold the whole file in memory, this writes it to `fp` a chunk at a time.
+    async with aiohttp.ClientSession() as session:
+        async with session.get(attachment.url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(TRANSFER_CHUNK_SIZE):
+                fp.write(chunk)
+
+def _parse_tags(fp: IO[str], *, fmt: ExportFormat, default_owner_id: int) -> Iterator[tuple[str, int, str] | None]:
+    # Yields (name, owner_id, content) for each record, or None for records that aren't valid tags.
+    if fmt == "csv":
+        records: Iterator[object] = csv.DictReader(fp)
+    else:
+        records = (_loads_or_none(line) for line in fp if line.strip())
+
+    for record in records:
+        if not isinstance(record, dict):
+            yield None
+            continue
+
+        name, content, owner_id = record.get("name"), record.get("content"), record.get("owner_id")
+        if not isinstance(name, str) or not isinstance(content, str) or not name.strip() or not content:
+            yield None
+            continue
+
+        try:
+            owner_id = int(owner_id) if owner_id not in (None, "") else default_owner_id
+        except (TypeError, ValueError):
+            owner_id = default_owner_id
+
+        yield name.strip(), owner_id, content
+
+def _loads_or_none(line: str, /) -> object:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+def _format_of(filename: str, /) -> ExportFormat | None:
+    extension = filename.rpartition(".")[2].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    return None
+
+
+@dataclass(slots=True)
+class TagNameIndex:
+    """In-memory indexes over a guild's tag names, for suggestions and autocomplete."""
+    fuzzy: NGramIndex
+    prefix: PrefixIndex
+
+    @classmethod
+    def from_names(cls, names: list[str], /) -> TagNameIndex:
+        return cls(fuzzy=NGramIndex(names), prefix=PrefixIndex(names))
+
+    def add(self, name: str, /) -> None:
+        self.fuzzy.add(name)
+        self.prefix.add(name)
+
+    def remove(self, name: str, /) -> None:
+        self.fuzzy.remove(name)
+        self.prefix.remove(name)
+
+
+class TagSearchSource(PageSource[discord.Embed]):
+    """Pages through ranked search results, only querying the page being shown."""
+    def __init__(self, *, query: str, guild_id: int, total: int) -> None:
+        self.query = query
+        self.guild_id = guild_id
+        self.total = total
+
+    def get_max_pages(self) -> int:
+        return max(1, -(-self.total // TAGS_PER_PAGE)) # ceil
+
+    async def get_page(self, index: int) -> discord.Embed:
+        offset = index * TAGS_PER_PAGE
+        names = await TagEntry.search(query=self.query, guild_id=self.guild_id, limit=TAGS_PER_PAGE, offset=offset)
+
+        out = "\n".join(f"{rank}.) {name}" for rank, name in enumerate(names, offset + 1))
+        return discord.Embed(color=discord.Color.blue(), description=out or "No more results.", title=self.query)
+
+
+class TagListSource(AsyncIteratorPageSource[str, discord.Embed]):
+    """Pages through the tags a member owns, reading them as the pages are shown."""
+    def __init__(self, *, member: discord.Member, guild_id: int) -> None:
+        super().__init__(lambda: TagEntry.iter_names_owned_by(guild_id, member.id), per_page=TAGS_PER_PAGE)
+        self.member = member
+
+    async def format_page(self, entries: list[str], index: int) -> discord.Embed:
+        offset = index * TAGS_PER_PAGE
+        out = "\n".join(f"{rank}.) {name}" for rank, name in enumerate(entries, offset + 1))
+        return discord.Embed(color=discord.Color.blue(), description=out or f"{self.member} has no tags.", title=f"{self.member}'s Tags")
+
+
+class TagLeaderboardSource(PageSource[discord.Embed]):
+    """Pages through a guild's most used tags, reading one page per press."""
+    def __init__(self, *, guild_id: int, total: int) -> None:
+        self.guild_id = guild_id
+        self.total = total
 
-                return TagEntry(**res)
+    def get_max_pages(self) -> int:
+        return max(1, -(-self.total // TAGS_PER_PAGE)) # ceil
+
+    async def get_page(self, index: int) -> discord.Embed:
+        offset = index * TAGS_PER_PAGE
+        tags = await TagEntry.top_in_guild(self.guild_id, limit=TAGS_PER_PAGE, offset=offset)
+
+        out = "\n".join(f"{rank}.) {name} ({uses:,} uses)" for rank, (name, uses) in enumerate(tags, offset + 1))
+        return discord.Embed(color=discord.Color.blue(), description=out or "No more results.", title="Most Used Tags")
+
+
+class StaleTagSource(PageSource[discord.Embed]):
+    """Pages through the tags in a guild that haven't been used recently, least recently used first."""
+    def __init__(self, *, guild_id: int, total: int, before: int, days: int) -> None:
+        self.guild_id = guild_id
+        self.total = total
+        self.before = before
+        self.days = days
+
+    def get_max_pages(self) -> int:
+        return max(1, -(-self.total // TAGS_PER_PAGE)) # ceil
+
+    async def get_page(self, index: int) -> discord.Embed:
+        offset = index * TAGS_PER_PAGE
+        tags = await TagEntry.stale_in_guild(self.guild_id, before=self.before, limit=TAGS_PER_PAGE, offset=offset)
+
+        out = "\n".join(
+            f"{rank}.) {name}, last used <t:{last_used}:R> ({uses:,} uses)"
+            for rank, (name, uses, last_used) in enumerate(tags, offset + 1)
+        )
+        return discord.Embed(color=discord.Color.blue(), description=out or "No more results.", title=f"Tags Unused For {self.days} Days")
 
 
 class TagsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # (guild_id, name) -> TagEntry, or None for tags that don't exist.
+        self.tag_cache: GuildLRUCache[str, TagEntry] = GuildLRUCache(max_size=TAG_CACHE_SIZE, max_per_guild=TAG_CACHE_SIZE_PER_GUILD)
+        # guild_id -> indexes of tag names, built on a guild's first use and kept up to date after that.
+        self.name_indexes: dict[int, TagNameIndex] = {}
+        self._name_index_builds: dict[int, asyncio.Task[TagNameIndex]] = {}
+        self._name_changes_during_build: dict[int, list[tuple[str, bool]]] = {} # (name, created) to replay once built
+        self.tag_usage = TagUsageCounter()
+
+    async def get_tag(self, *, name: str, guild_id: int) -> TagEntry | None:
+        """Gets a tag through the cache, only going to the database on a cache miss."""
+        tag = self.tag_cache.get(guild_id, name)
+
+        if tag is MISSING:
+            tag = await TagEntry.get_or_none(name=name, guild_id=guild_id)
+            self.tag_cache.put(guild_id, name, tag)
+
+        return tag
+
+    async def get_name_index(self, guild_id: int, /) -> TagNameIndex:
+        """Gets the name indexes for a guild, building them if this is the guild's first use.
+
+        Concurrent callers share one build, so a burst of autocomplete requests
+        only loads the guild's names once.
+        """
+        if (index := self.name_indexes.get(guild_id)) is not None:
+            return index
+
+        task = self._name_index_builds.get(guild_id)
+        if task is None:
+            self._name_changes_during_build[guild_id] = []
+            task = self._name_index_builds[guild_id] = asyncio.create_task(self._build_name_index(guild_id))
+
+        return await asyncio.shield(task)
+
+    async def _build_name_index(self, guild_id: int, /) -> TagNameIndex:
+        try:
+            index = TagNameIndex.from_names(await TagEntry.names_in_guild(guild_id))
+
+            # Tags created or deleted while we were loading may be missing from what we loaded.
+            for name, created in self._name_changes_during_build.get(guild_id, []):
+                if created:
+                    index.add(name)
+                else:
+                    index.remove(name)
+
+            self.name_indexes[guild_id] = index
+            return index
+        finally:
+            self._name_index_builds.pop(guild_id, None)
+            self._name_changes_during_build.pop(guild_id, None)
+
+    async def suggest_tags(self, *, name: str, guild_id: int) -> list[str]:
+        """Gets the names of the tags closest to a given name."""
+        index = await self.get_name_index(guild_id)
+        return index.fuzzy.search(name, k=3)
+
+    def _index_created(self, guild_id: int, name: str, /) -> None:
+        if (index := self.name_indexes.get(guild_id)) is not None:
+            index.add(name)
+        elif (changes := self._name_changes_during_build.get(guild_id)) is not None:
+            changes.append((name, True))
+
+    def _index_deleted(self, guild_id: int, name: str, /) -> None:
+        if (index := self.name_indexes.get(guild_id)) is not None:
+            index.remove(name)
+        elif (changes := self._name_changes_during_build.get(guild_id)) is not None:
+            changes.append((name, False))
+
+    async def send_not_found(self, ctx: commands.Context, name: str, /) -> None:
+        assert ctx.guild
+
+        out = f"Could not find tag with name `{name}`."
+
+        suggestions = await self.suggest_tags(name=name, guild_id=ctx.guild.id)
+        if suggestions:
+            out += " Did you mean: " + ", ".join(f"`{suggestion}`" for suggestion in suggestions) + "?"
+
+        await ctx.send(out, allowed_mentions=ALLOWED_MENTIONS)
 
     async def cog_load(self) -> None:
-        async with asqlite.connect(DB_FILENAME) as db:
-            await db.execute(TAGS_SETUP_SQL)
+        async with asqlite.connect(DB_FILENAME, init=_init_connection) as db:
+            await db.executescript(TAGS_SETUP_SQL)
+            await apply_migrations(db, TAGS_MIGRATIONS)
+        self.flush_usage_loop.start()
+
+    async def cog_unload(self) -> None:
+        # Let a running flush finish rather than cancelling it part way, then write whatever is left.
+        self.flush_usage_loop.stop()
+        flushed = await self.tag_usage.flush()
+        _logger.info(f"Flushed uses of {flushed} tags on unload.")
+
+    @tasks.loop(seconds=USAGE_FLUSH_INTERVAL)
+    async def flush_usage_loop(self) -> None:
+        try:
+            flushed = await self.tag_usage.flush()
+        except Exception:
+            _logger.exception("Failed to flush tag uses, they will be retried.")
+            return
+
+        if flushed:
+            _logger.debug(f"Flushed uses of {flushed} tags.")
 
     @commands.group(invoke_without_command=True)
     @commands.guild_only()
@@ -118,12 +901,13 @@ class TagsCog(commands.Cog):
         """
         assert ctx.guild
 
-        tag = await TagEntry.get_or_none(name=name, guild_id=ctx.guild.id)
+        tag = await self.get_tag(name=name, guild_id=ctx.guild.id)
 
         if tag is not None:
+            self.tag_usage.record(guild_id=ctx.guild.id, name=tag.name)
             await ctx.send(tag.content, allowed_mentions=ALLOWED_MENTIONS)
         else:
-            await ctx.send(f"Could not find tag with name `{name}`.")
+            await self.send_not_found(ctx, name)
 
     @tag.command(aliases=("make",))
     async def create(self, ctx: commands.Context, name: str, *, content: str) -> None:
@@ -141,6 +925,8 @@ class TagsCog(commands.Cog):
         tag = await TagEntry.create(name=name, owner_id=ctx.author.id, guild_id=ctx.guild.id, content=content)
 
         if tag is not None:
+            self.tag_cache.put(ctx.guild.id, name, tag)
+            self._index_created(ctx.guild.id, name)
             await ctx.send(f"Tag with name `{name}` successfully created.")
         else:
             await ctx.send(f"Tag with name `{name}` already exists.")
@@ -157,16 +943,36 @@ class TagsCog(commands.Cog):
         assert ctx.guild
         assert isinstance(ctx.author, discord.Member)
 
-        original = await TagEntry.get_or_none(name=name, guild_id=ctx.guild.id)
+        original = await self.get_tag(name=name, guild_id=ctx.guild.id)
         if not original:
             await ctx.send(f"Tag with name `{name}` not found.")
             return
 
+        if original.name != name: # `name` is an alias, only the alias is deleted.
+            alias = await TagAlias.get_or_none(name=name, guild_id=ctx.guild.id)
+            if alias is None:
+                await ctx.send(f"Tag with name `{name}` not found.")
+                return
+
+            if alias.owner_id != ctx.author.id and not ctx.author.guild_permissions.manage_messages:
+                await ctx.send(f"You do not own the alias named `{name}`.")
+                return
+
+            await alias.delete()
+            self.tag_cache.put(ctx.guild.id, name, None)
+            self._index_deleted(ctx.guild.id, name)
+            await ctx.send(f"Alias `{name}` deleted.")
+            return
+
         if original.owner_id != ctx.author.id and not ctx.author.guild_permissions.manage_messages:
             await ctx.send(f"You do not own the tag named `{name}`.")
             return
 
+        aliases = await original.alias_names()
         removed = await original.delete()
+        for deleted_name in (name, *aliases): # Aliases are deleted along with their tag.
+            self.tag_cache.put(ctx.guild.id, deleted_name, None)
+            self._index_deleted(ctx.guild.id, deleted_name)
         if removed:
             await ctx.send(f"Tag `{name}` deleted.")
         else:
@@ -185,16 +991,23 @@ class TagsCog(commands.Cog):
         """
         assert ctx.guild
 
-        original = await TagEntry.get_or_none(name=name, guild_id=ctx.guild.id)
+        original = await self.get_tag(name=name, guild_id=ctx.guild.id)
         if not original:
             await ctx.send(f"Tag with name `{name}` not found.")
             return
 
+        if original.name != name:
+            await ctx.send(f"`{name}` is an alias of `{original.name}`, update that instead.")
+            return
+
         if original.owner_id != ctx.author.id:
             await ctx.send(f"You do not own the tag named `{name}`.")
             return
 
         updated = await original.update(new_content=new_content)
+        self.tag_cache.put(ctx.guild.id, name, updated)
+        for alias in await original.alias_names():
+            self.tag_cache.remove(ctx.guild.id, alias)
 
         await ctx.send(f"Tag with name {updated.name} content updated.")
 
@@ -209,35 +1022,25 @@ class TagsCog(commands.Cog):
         """
         assert ctx.guild
 
-        async with asqlite.connect(DB_FILENAME) as db:
-            async with db.cursor() as cur:
-                await cur.execute("SELECT name FROM tags WHERE name LIKE ? and guild_id = ?", f"%{query}%", ctx.guild.id)
+        total = await TagEntry.search_count(query=query, guild_id=ctx.guild.id)
+        source = TagSearchSource(query=query, guild_id=ctx.guild.id, total=total)
 
-                results = await cur.fetchall()
-                results = list(enumerate(results, 1))
-                embeds = []
-
-                for result in discord.utils.as_chunks(results, 20):
-                    out = "\n".join(f"{res[0]}.) {res[1]['name']}" for res in result)
-                    embed = discord.Embed(color=discord.Color.blue(), description=out, title=query)
-                    embeds.append(embed)
-
-                if len(embeds) > 1:
-                    await EmbedPaginator.start(ctx, ctx.author, embeds)
-                elif len(embeds) == 1:
-                    await ctx.send(embed=embeds[0])
-                else:
-                    await ctx.send(f"No tags matching search: `{discord.utils.escape_mentions(query)}`")
-
-                # IMPLEMENTATION WITHOUT PAGINATION:
-                # if results:
-                #     out = "\n".join(res['name'] for res in results[:20])
-                #     if (num_results := len(results)) > 20:
-                #         out += f"\n{num_results-20:,} other results."
-                #     embed = discord.Embed(color=discord.Color.blue(), description=out, title=query)
-                #     await ctx.send(embed=embed)
-                # else:
-                #     await ctx.send(f"No results found for `{query}`")
+        if source.get_max_pages() > 1:
+            await EmbedPaginator.start(ctx, owner=ctx.author, pages=source)
+        elif total:
+            await ctx.send(embed=await source.get_page(0))
+        else:
+            await ctx.send(f"No tags matching search: `{discord.utils.escape_mentions(query)}`")
+
+        # IMPLEMENTATION WITHOUT PAGINATION:
+        # if results:
+        #     out = "\n".join(res['name'] for res in results[:20])
+        #     if (num_results := len(results)) > 20:
+        #         out += f"\n{num_results-20:,} other results."
+        #     embed = discord.Embed(color=discord.Color.blue(), description=out, title=query)
+        #     await ctx.send(embed=embed)
+        # else:
+        #     await ctx.send(f"No results found for `{query}`")
 
     @tag.command()
     async def list(self, ctx: commands.Context, *, member: discord.Member | None = None) -> None:
@@ -253,46 +1056,320 @@ class TagsCog(commands.Cog):
 
         member = member or ctx.author
 
-        async with asqlite.connect(DB_FILENAME) as db:
-            async with db.cursor() as cur:
-                await cur.execute("SELECT name FROM tags WHERE owner_id = ? and guild_id = ? ORDER BY name ASC", member.id, ctx.guild.id)
+        # Only the pages being looked at are read, however many tags the member has.
+        source = TagListSource(member=member, guild_id=ctx.guild.id)
+        first = await source.get_page(0)
 
-                results = await cur.fetchall()
-                results = list(enumerate(results, 1))
-                embeds = []
-
-                for result in discord.utils.as_chunks(results, 20): # `result` will be a list[index, Row]
-                    out = "\n".join(f"{res[0]}.) {res[1]['name']}" for res in result)
-                    embed = discord.Embed(color=discord.Color.blue(), description=out, title=f"{member}'s Tags")
-                    embeds.append(embed)
-
-                if len(embeds) > 1:
-                    paginator = await EmbedPaginator.start(ctx, owner=ctx.author, pages=embeds)
-                elif len(embeds) == 1:
-                    await ctx.send(embed=embeds[0])
-                else:
-                    await ctx.send(f"{member} has no tags.")
-
-                # IMPLEMENTATION WITHOUT PAGINATION:
-                # if results:
-                #     out = "\n".join(res['name'] for res in results[:20])
-                #     if (num_results := len(results)) > 20:
-                #         out += f"\n{num_results-20:,} other results."
-                #     embed = discord.Embed(color=discord.Color.blue(), description=out, title=f"{member}'s Tags")
-                #     await ctx.send(embed=embed)
-                # else:
-                #     await ctx.send(f"No results found for `{member}`")
+        if source.get_max_pages() == 1:
+            await source.close()
+            await ctx.send(embed=first)
+        else:
+            await EmbedPaginator.start(ctx, owner=ctx.author, pages=source)
+
+        # IMPLEMENTATION WITHOUT PAGINATION:
+        # if results:
+        #     out = "\n".join(res['name'] for res in results[:20])
+        #     if (num_results := len(results)) > 20:
+        #         out += f"\n{num_results-20:,} other results."
+        #     embed = discord.Embed(color=discord.Color.blue(), description=out, title=f"{member}'s Tags")
+        #     await ctx.send(embed=embed)
+        # else:
+        #     await ctx.send(f"No results found for `{member}`")
+
+    @tag.command(name="alias")
+    async def make_alias(self, ctx: commands.Context, new_name: str, *, existing: str) -> None:
+        """Creates an alias that points at an existing tag.
+
+        Parameters
+        ----------
+        new_name : str
+            The name of the alias to create.
+        existing : str
+            The name of the tag to point at.
+        """
+        assert ctx.guild
+
+        original = await self.get_tag(name=existing, guild_id=ctx.guild.id)
+        if not original:
+            await ctx.send(f"Tag with name `{existing}` not found.")
+            return
+
+        # Aliases of aliases point straight at the canonical tag.
+        alias = await TagAlias.create(name=new_name, owner_id=ctx.author.id, guild_id=ctx.guild.id, target=original.name)
+        if alias is None:
+            await ctx.send(f"Tag with name `{new_name}` already exists.")
+            return
+
+        self.tag_cache.put(ctx.guild.id, new_name, original)
+        self._index_created(ctx.guild.id, new_name)
+
+        await ctx.send(f"Alias `{new_name}` that points to `{original.name}` successfully created.")
+
+    @tag.command()
+    async def rename(self, ctx: commands.Context, name: str, *, new_name: str) -> None:
+        """Renames a tag that you own.
+
+        Parameters
+        ----------
+        name : str
+            The name of the tag to rename.
+        new_name : str
+            The new name for the tag.
+        """
+        assert ctx.guild
+
+        original = await self.get_tag(name=name, guild_id=ctx.guild.id)
+        if not original:
+            await ctx.send(f"Tag with name `{name}` not found.")
+            return
+
+        if original.name != name:
+            await ctx.send(f"`{name}` is an alias of `{original.name}`, delete it and create a new alias instead.")
+            return
+
+        if original.owner_id != ctx.author.id:
+            await ctx.send(f"You do not own the tag named `{name}`.")
+            return
+
+        await self.tag_usage.flush() # Pending uses are keyed by the old name.
+        renamed = await original.rename(new_name=new_name)
+        if renamed is None:
+            await ctx.send(f"Tag with name `{new_name}` already exists.")
+            return
+
+        self.tag_cache.put(ctx.guild.id, name, None)
+        self.tag_cache.put(ctx.guild.id, new_name, renamed)
+        for alias in await renamed.alias_names(): # Cached with the old name.
+            self.tag_cache.remove(ctx.guild.id, alias)
+        self._index_deleted(ctx.guild.id, name)
+        self._index_created(ctx.guild.id, new_name)
+
+        await ctx.send(f"Tag `{name}` renamed to `{new_name}`.")
+
+    @tag.command(name="top")
+    async def top(self, ctx: commands.Context) -> None:
+        """Shows the most used tags in this server."""
+        assert ctx.guild
+
+        await self.tag_usage.flush() # Include uses that haven't been written yet.
+
+        total = await TagEntry.count_in_guild(ctx.guild.id)
+        if not total:
+            await ctx.send("This server has no tags.")
+            return
+
+        await self._send_source(ctx, TagLeaderboardSource(guild_id=ctx.guild.id, total=total))
+
+    @tag.command(name="stale")
+    @commands.has_permissions(manage_messages=True)
+    async def stale(self, ctx: commands.Context, days: int = STALE_TAG_DAYS) -> None:
+        """Lists tags that haven't been used recently, for pruning.
+
+        Parameters
+        ----------
+        days : int
+            How many days a tag has to go unused to be listed. Defaults to 90.
+        """
+        assert ctx.guild
+
+        await self.tag_usage.flush()
+
+        days = max(days, 1)
+        before = int(time.time()) - days * 86_400
+
+        total = await TagEntry.count_stale_in_guild(ctx.guild.id, before=before)
+        if not total:
+            await ctx.send(f"Every tag has been used in the last {days} days.")
+            return
+
+        await self._send_source(ctx, StaleTagSource(guild_id=ctx.guild.id, total=total, before=before, days=days))
+
+    async def _send_source(self, ctx: commands.Context, source: PageSource[discord.Embed], /) -> None:
+        if source.get_max_pages() > 1:
+            await EmbedPaginator.start(ctx, owner=ctx.author, pages=source)
+        else:
+            await ctx.send(embed=await source.get_page(0))
+
+    @tag.command(name="import")
+    @commands.check_any(commands.is_owner(), commands.has_permissions(administrator=True))
+    async def import_tags(self, ctx: commands.Context, policy: ImportPolicy = "skip") -> None:
+        """Imports tags from an attached JSON Lines or CSV file.
+
+        Each record needs a `name` and `content`, `owner_id` defaults to you.
+
+        Parameters
+        ----------
+        policy : str
+            What to do with tags whose name is taken: skip, overwrite or rename. Defaults to skip.
+        """
+        assert ctx.guild
+
+        if not ctx.message.attachments:
+            await ctx.send("Attach a `.jsonl` or `.csv` file to import.")
+            return
+
+        attachment = ctx.message.attachments[0]
+        fmt = _format_of(attachment.filename)
+        if fmt is None:
+            await ctx.send("Only `.jsonl` and `.csv` files can be imported.")
+            return
+
+        total = TagImportResult()
+
+        async with ctx.typing():
+            with tempfile.TemporaryFile() as raw:
+                await _download(attachment, raw)
+                raw.seek(0)
+
+                text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+                batch: list[tuple[str, int, str]] = []
+
+                try:
+                    for row in _parse_tags(text, fmt=fmt, default_owner_id=ctx.author.id):
+                        if row is None:
+                            total.invalid += 1
+                            continue
+
+                        batch.append(row)
+                        if len(batch) >= TRANSFER_BATCH_SIZE:
+                            total.merge(await self._import_batch(batch, guild_id=ctx.guild.id, policy=policy))
+                            batch = []
+
+                    if batch:
+                        total.merge(await self._import_batch(batch, guild_id=ctx.guild.id, policy=policy))
+                except (UnicodeDecodeError, csv.Error) as e:
+                    await ctx.send(f"Stopped importing, the file could not be read: {e}")
+                finally:
+                    text.detach()
+
+        await ctx.send(
+            f"Imported {total.created:,} tags ({total.renamed:,} renamed), overwrote {total.overwritten:,}, "
+            f"skipped {total.skipped:,} and ignored {total.invalid:,} invalid records."
+        )
+
+    async def _import_batch(self, batch: list[tuple[str, int, str]], /, *, guild_id: int, policy: ImportPolicy) -> TagImportResult:
+        result = await TagEntry.bulk_import(batch, guild_id=guild_id, policy=policy)
+
+        self.tag_cache.clear_guild(guild_id) # Overwritten tags and their aliases may be cached.
+        for name in result.names:
+            self._index_created(guild_id, name)
+
+        return result
+
+    @tag.command(name="export")
+    @commands.check_any(commands.is_owner(), commands.has_permissions(administrator=True))
+    async def export_tags(self, ctx: commands.Context, fmt: ExportFormat = "jsonl") -> None:
+        """Exports this server's tags as a JSON Lines or CSV file.
+
+        Parameters
+        ----------
+        fmt : str
+            The file format: jsonl or csv. Defaults to jsonl.
+        """
+        assert ctx.guild
+
+        await self.tag_usage.flush()
+
+        with tempfile.TemporaryFile() as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            writer = csv.writer(text) if fmt == "csv" else None
+            if writer is not None:
+                writer.writerow(EXPORT_FIELDS)
+
+            exported = 0
+            async with ctx.typing():
+                async for rows in TagEntry.iter_guild(ctx.guild.id):
+                    for row in rows:
+                        if writer is not None:
+                            writer.writerow(tuple(row))
+                        else:
+                            text.write(json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n")
+                    exported += len(rows)
+
+            text.flush()
+            text.detach()
+
+            if not exported:
+                await ctx.send("This server has no tags.")
+                return
+
+            size = raw.tell()
+            if size > ctx.guild.filesize_limit:
+                await ctx.send(f"The export is {size:,} bytes, which is over this server's upload limit of {ctx.guild.filesize_limit:,} bytes.")
+                return
+
+            raw.seek(0)
+            await ctx.send(f"Exported {exported:,} tags.", file=discord.File(raw, filename=f"tags-{ctx.guild.id}.{fmt}"))
 
     @tag.command()
     async def raw(self, ctx: commands.Context, *, name: str) -> None:
         assert ctx.guild
 
-        tag = await TagEntry.get_or_none(name=name, guild_id=ctx.guild.id)
+        tag = await self.get_tag(name=name, guild_id=ctx.guild.id)
 
         if tag is not None:
+            self.tag_usage.record(guild_id=ctx.guild.id, name=tag.name)
             await ctx.send(discord.utils.escape_markdown(tag.content), allowed_mentions=ALLOWED_MENTIONS)
         else:
-            await ctx.send(f"Could not find tag with name `{name}`.")
+            await self.send_not_found(ctx, name)
+
+
+    tag_app = app_commands.Group(name="tag", description="Get tags in this server.", guild_only=True)
+
+    @tag_app.command(name="get")
+    @app_commands.describe(name="The name of the tag to get.")
+    async def tag_app_get(self, interaction: discord.Interaction, name: str) -> None:
+        """Gets a tag with given name."""
+        assert interaction.guild_id
+
+        tag = await self.get_tag(name=name, guild_id=interaction.guild_id)
+
+        if tag is not None:
+            self.tag_usage.record(guild_id=interaction.guild_id, name=tag.name)
+            await interaction.response.send_message(tag.content, allowed_mentions=ALLOWED_MENTIONS)
+        else:
+            await interaction.response.send_message(f"Could not find tag with name `{name}`.", ephemeral=True)
+
+    @tag_app.command(name="raw")
+    @app_commands.describe(name="The name of the tag to get.")
+    async def tag_app_raw(self, interaction: discord.Interaction, name: str) -> None:
+        """Gets the raw content of a tag with given name."""
+        assert interaction.guild_id
+
+        tag = await self.get_tag(name=name, guild_id=interaction.guild_id)
+
+        if tag is not None:
+            self.tag_usage.record(guild_id=interaction.guild_id, name=tag.name)
+            await interaction.response.send_message(discord.utils.escape_markdown(tag.content), allowed_mentions=ALLOWED_MENTIONS)
+        else:
+            await interaction.response.send_message(f"Could not find tag with name `{name}`.", ephemeral=True)
+
+    @tag_app_get.autocomplete("name")
+    @tag_app_raw.autocomplete("name")
+    async def tag_name_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        # Served from memory, only a guild's first request touches the database.
+        if interaction.guild_id is None:
+            return []
+
+        index = await self.get_name_index(interaction.guild_id)
+
+        return [app_commands.Choice(name=name, value=name) for name in index.prefix.complete(current, limit=25) if len(name) <= 100]
+
+    @tag.command(name="cachestats")
+    @commands.is_owner()
+    async def cache_stats(self, ctx: commands.Context) -> None:
+        """Shows how well the tag cache is doing."""
+        assert ctx.guild
+
+        stats = self.tag_cache.stats
+        out = (
+            f"Cached: {len(self.tag_cache):,}/{self.tag_cache.max_size:,} "
+            f"({self.tag_cache.guild_size(ctx.guild.id):,}/{self.tag_cache.max_per_guild:,} in this server)\n"
+            f"Hits: {stats.hits:,}\nNegative hits: {stats.negative_hits:,}\nMisses: {stats.misses:,}\n"
+            f"Evictions: {stats.evictions:,}\nHit rate: {stats.hit_rate:.1%}"
+        )
+
+        await ctx.send(embed=discord.Embed(title="Tag Cache", description=out, color=discord.Color.blue()))
 
 
 async def setup(bot: commands.Bot):
@@ -0,0 +1,196 @@
+"""
+Copyright 2022-present fretgfr
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Mapping, Optional, Set, Tuple, TypeVar
+
+__all__ = ["MISSING", "CacheStats", "GuildConfigCache", "GuildLRUCache"]
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _MissingSentinel:
+    def __repr__(self) -> str:
+        return "MISSING"
+
+# Returned by `GuildLRUCache.get` when nothing is cached, since None is a cached miss.
+MISSING: Any = _MissingSentinel()
+
+
+class GuildConfigCache(Generic[T]):
+    """Caches per-guild settings in memory, including which guilds have none.
+
+    Prime the cache with every stored setting when your cog loads, after that any
+    guild without an entry is known to have no settings and costs no database
+    round-trip. If the cache hasn't been primed, misses fall back to `loader` and
+    the result, including `None`, is cached.
+
+    Keep the cache up to date by calling `set` or `invalidate` whenever you write
+    a guild's settings.
+    """
+    def __init__(self, loader: Callable[[int], Awaitable[Optional[T]]]) -> None:
+        self._loader = loader
+        self._entries: Dict[int, Optional[T]] = {}
+        self._complete = False
+        self._stale: Set[int] = set() # invalidated guilds that must be reloaded even when complete
+
+    def prime(self, entries: Mapping[int, T], /) -> None:
+        """Replaces the cache contents with every stored setting.
+
+        Parameters
+        ----------
+        entries : Mapping[int, T]
+            Every guild that has settings, mapped to those settings.
+        """
+        self._entries = dict(entries)
+        self._complete = True
+        self._stale.clear()
+
+    async def get(self, guild_id: int, /) -> Optional[T]:
+        """Gets the settings for a guild, None if it has none."""
+        try:
+            return self._entries[guild_id]
+        except KeyError:
+            pass
+
+        if self._complete and guild_id not in self._stale:
+            return None
+
+        value = await self._loader(guild_id)
+        if guild_id not in self._entries: # `set` may have been called while loading.
+            self.set(guild_id, value)
+
+        return self._entries.get(guild_id)
+
+    def set(self, guild_id: int, value: Optional[T], /) -> None:
+        """Stores the settings for a guild, `None` means it has none."""
+        self._stale.discard(guild_id)
+
+        if value is None and self._complete:
+            self._entries.pop(guild_id, None)
+        else:
+            self._entries[guild_id] = value
+
+    def invalidate(self, guild_id: int, /) -> None:
+        """Forgets a guild's settings so the next `get` reloads them."""
+        self._entries.pop(guild_id, None)
+
+        if self._complete:
+            self._stale.add(guild_id)
+
+    def __len__(self) -> int:
+        return sum(1 for value in self._entries.values() if value is not None)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    negative_hits: int = 0 # hits on a cached miss
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+
+class GuildLRUCache(Generic[K, V]):
+    """A least recently used cache of per-guild values, limited in size per guild and overall.
+
+    `None` can be stored to remember that something doesn't exist (negative caching),
+    so `get` returns `MISSING` rather than `None` when nothing is cached.
+
+    The cache doesn't load anything itself. Write through it by calling `put` or
+    `remove` whenever the underlying data changes.
+    """
+    def __init__(self, *, max_size: int = 10_000, max_per_guild: int = 1_000) -> None:
+        self.max_size = max_size
+        self.max_per_guild = max_per_guild
+        self.stats = CacheStats()
+        self._guilds: Dict[int, OrderedDict[K, Optional[V]]] = {}
+        self._order: OrderedDict[Tuple[int, K], None] = OrderedDict() # Recency across all guilds.
+
+    def get(self, guild_id: int, key: K, /) -> Optional[V]:
+        """Gets a cached value, `None` for a cached miss or `MISSING` if it isn't cached."""
+        entries = self._guilds.get(guild_id)
+
+        if entries is None or key not in entries:
+            self.stats.misses += 1
+            return MISSING
+
+        entries.move_to_end(key)
+        self._order.move_to_end((guild_id, key))
+
+        value = entries[key]
+        if value is None:
+            self.stats.negative_hits += 1
+        else:
+            self.stats.hits += 1
+
+        return value
+
+    def put(self, guild_id: int, key: K, value: Optional[V], /) -> None:
+        """Caches a value, pass `None` to cache that it doesn't exist."""
+        entries = self._guilds.setdefault(guild_id, OrderedDict())
+        entries[key] = value
+        entries.move_to_end(key)
+        self._order[(guild_id, key)] = None
+        self._order.move_to_end((guild_id, key))
+
+        while len(entries) > self.max_per_guild:
+            oldest, _ = entries.popitem(last=False)
+            del self._order[(guild_id, oldest)]
+            self.stats.evictions += 1
+
+        while len(self._order) > self.max_size:
+            (oldest_guild, oldest), _ = self._order.popitem(last=False)
+            self._remove_from_guild(oldest_guild, oldest)
+            self.stats.evictions += 1
+
+    def remove(self, guild_id: int, key: K, /) -> None:
+        """Forgets a cached value, the next `get` returns `MISSING`."""
+        self._order.pop((guild_id, key), None)
+        self._remove_from_guild(guild_id, key)
+
+    def clear_guild(self, guild_id: int, /) -> None:
+        for key in self._guilds.pop(guild_id, {}):
+            del self._order[(guild_id, key)]
+
+    def _remove_from_guild(self, guild_id: int, key: K, /) -> None:
+        entries = self._guilds.get(guild_id)
+        if entries is None:
+            return
+
+        entries.pop(key, None)
+        if not entries:
+            del self._guilds[guild_id]
+
+    def guild_size(self, guild_id: int, /) -> int:
+        return len(self._guilds.get(guild_id, ()))
+
+    def __len__(self) -> int:
+        return len(self._order)
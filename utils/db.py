@@ -0,0 +1,54 @@
+"""
+Copyright 2022-present fretgfr
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import asqlite
+
+__all__ = ["transaction"]
+
+
+@asynccontextmanager
+async def transaction(db: asqlite.Connection, /, *, immediate: bool = False) -> AsyncIterator[None]:
+    """Runs the statements in the block as one transaction, committed if the block finishes and rolled back if it raises.
+
+    asqlite connections are in autocommit mode, so without this every statement, and every row of an
+    `executemany`, commits on its own, and `db.commit()` does nothing.
+
+    Parameters
+    ----------
+    db : asqlite.Connection
+        The connection to run the transaction on.
+    immediate : bool, optional
+        Whether to take the write lock straight away, so a read at the start of the block
+        can't be made stale by another writer before the block writes. By default False.
+    """
+    await db.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield
+    except BaseException:
+        await db.rollback()
+        raise
+    else:
+        await db.commit()
@@ -0,0 +1,168 @@
+"""
+Copyright 2022-present fretgfr
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+"""
+A worker process that runs Python snippets for the `py` command, away from the bot's event loop.
+
+Started by `utility/py.py` as `python -m utils.evalworker --memory-limit BYTES`, it reads one JSON request per
+line from stdin and writes JSON messages, one per line, to stdout:
+
+    request:  {"code": str, "cpu_limit": int}
+    messages: {"output": str}                               some output, as soon as it's written
+              {"done": true, "error": str | None}           the snippet finished, error is a formatted traceback
+
+Only uses the standard library so it starts quickly, `resource` limits are only applied where it's available.
+"""
+
+import argparse
+import ast
+import asyncio
+import inspect
+import json
+import linecache
+import math
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from types import TracebackType
+from typing import IO, Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError: # Not on Windows.
+    resource = None
+
+__all__ = ["main"]
+
+FILENAME = "<py>" # what snippets are compiled as, so tracebacks can be trimmed to them
+OUTPUT_INTERVAL = 0.25 # seconds between sends of output, so print loops don't send a message per line
+OUTPUT_BUFFER_SIZE = 16 * 1024 # characters held before sending anyway, and the most sent in one message
+
+
+class _OutputStream:
+    # Stands in for stdout and stderr. What's written is sent as output messages by a background
+    # thread every OUTPUT_INTERVAL, so it arrives even while the snippet is busy with something else.
+    def __init__(self, protocol: IO[str]) -> None:
+        self._protocol = protocol
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._lock = threading.RLock()
+        threading.Thread(target=self._flush_periodically, daemon=True).start()
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+
+        if self._buffered >= OUTPUT_BUFFER_SIZE:
+            self.flush()
+
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffered:
+                text = "".join(self._buffer)
+                self._buffer.clear()
+                self._buffered = 0
+
+                # One big write is split up, so no message goes over the bot's line length limit.
+                for start in range(0, len(text), OUTPUT_BUFFER_SIZE):
+                    _send(self._protocol, {"output": text[start:start + OUTPUT_BUFFER_SIZE]})
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(OUTPUT_INTERVAL)
+            self.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _send(protocol: IO[str], message: Dict[str, Any]) -> None:
+    protocol.write(json.dumps(message) + "\n")
+    protocol.flush()
+
+
+def _limit_cpu(seconds: int) -> None:
+    # RLIMIT_CPU counts the whole life of the process, so allow `seconds` more than has been used so far.
+    # Going over sends SIGXCPU, which ends the process, and the pool replaces it.
+    if resource is None:
+        return
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = math.ceil(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (used + seconds, hard))
+
+
+def _snippet_frames(tb: Optional[TracebackType]) -> Optional[TracebackType]:
+    # Skips this module's frames, they aren't interesting to whoever wrote the snippet.
+    while tb is not None and tb.tb_frame.f_code.co_filename != FILENAME:
+        tb = tb.tb_next
+    return tb
+
+
+def _run(code: str) -> None:
+    linecache.cache[FILENAME] = (len(code), None, code.splitlines(True), FILENAME) # Lets tracebacks show the snippet's lines.
+    compiled = compile(code, FILENAME, "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
+    namespace = {"__name__": "__main__", "asyncio": asyncio, "aio": asyncio, "math": math, "random": random}
+
+    result = eval(compiled, namespace)
+    if inspect.iscoroutine(result): # The snippet used top level await.
+        asyncio.run(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--memory-limit", type=int, default=0, help="address space limit in bytes, 0 for none")
+    args = parser.parse_args()
+
+    if resource is not None and args.memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (args.memory_limit, args.memory_limit))
+
+    protocol, requests = sys.stdout, sys.stdin
+    stream = _OutputStream(protocol)
+    sys.stdout = sys.stderr = stream # type: ignore
+    sys.stdin = open(os.devnull) # Snippets calling input() mustn't read the next request.
+
+    for line in requests:
+        request = json.loads(line)
+        _limit_cpu(request["cpu_limit"])
+
+        error = None
+        try:
+            _run(request["code"])
+        except BaseException as e: # Including SystemExit, the worker is reused.
+            error = "".join(traceback.format_exception(type(e), e, _snippet_frames(e.__traceback__) or e.__traceback__))
+
+        with stream._lock: # Output first, so it's all there when the snippet is done.
+            stream.flush()
+            _send(protocol, {"done": True, "error": error})
+
+
+if __name__ == "__main__":
+    main()
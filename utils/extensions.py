@@ -0,0 +1,541 @@
+"""
+Copyright 2022-present fretgfr
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import ast
+import asyncio
+import graphlib
+import hashlib
+import importlib.abc
+import importlib.util
+import logging
+import sys
+import sysconfig
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from discord.ext import commands
+
+__all__ = ["ExtensionWatcher", "LazyCommand", "LoadTimes", "ReloadResult", "dependency_graph", "lazy_commands", "load_extension_timed", "reload_extensions"]
+
+_logger = logging.getLogger(__name__)
+
+# Where installed packages and the standard library live, their imports are never followed.
+_LIBRARY_PATHS = tuple({Path(path).resolve() for key, path in sysconfig.get_paths().items() if key in ("stdlib", "platstdlib", "purelib", "platlib")})
+
+
+@dataclass(slots=True)
+class ReloadResult:
+    """How reloading one extension went."""
+    name: str
+    elapsed: float = 0.0 # seconds
+    error: Optional[Exception] = None # what reloading raised, the previously loaded module is still in use
+    blocked_by: Optional[str] = None # a dependency that failed to reload, so this one wasn't tried
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.blocked_by is None
+
+
+def _source_path(module: ModuleType) -> Optional[Path]:
+    origin = getattr(module.__spec__, "origin", None)
+    if origin is None or not origin.endswith(".py"):
+        return None
+    return Path(origin).resolve()
+
+
+def _is_local(path: Path) -> bool:
+    return not any(path.is_relative_to(library) for library in _LIBRARY_PATHS)
+
+
+def _imports(module: ModuleType) -> Set[str]:
+    # The names of loaded modules that a module's source imports. Read from disk, so an edited file's new imports count.
+    path = _source_path(module)
+    if path is None:
+        return set()
+
+    try:
+        tree = ast.parse(path.read_bytes(), str(path))
+    except (OSError, SyntaxError):
+        return set()
+
+    package = module.__spec__.parent if module.__spec__ else module.__package__
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name("." * node.level + (node.module or ""), package)
+            except ImportError:
+                continue
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names) # `from package import submodule`
+
+    return {name for name in names if name in sys.modules}
+
+
+class _ImportWalker:
+    # Follows imports from module to module, parsing each file once.
+    def __init__(self, extensions: Mapping[str, ModuleType]) -> None:
+        self.extensions = extensions
+        self._imports: Dict[str, Set[str]] = {} # module name -> what it imports
+        self._walks: Dict[str, Tuple[Set[str], Set[str]]] = {}
+
+    def imports(self, name: str) -> Set[str]:
+        if name not in self._imports:
+            self._imports[name] = _imports(sys.modules[name]) if name in sys.modules else set()
+        return self._imports[name]
+
+    def walk(self, name: str) -> Tuple[Set[str], Set[str]]:
+        # The extensions a module depends on, and the local modules that aren't extensions passed through to find them.
+        if name in self._walks:
+            return self._walks[name]
+
+        depends: Set[str] = set()
+        via: Set[str] = set()
+        seen = {name}
+        stack = [name]
+
+        while stack:
+            for imported in self.imports(stack.pop()) - seen:
+                seen.add(imported)
+                if imported in self.extensions:
+                    depends.add(imported)
+                elif (module := sys.modules.get(imported)) is not None and (path := _source_path(module)) is not None and _is_local(path):
+                    via.add(imported)
+                    stack.append(imported)
+
+        self._walks[name] = depends, via
+        return depends, via
+
+
+def dependency_graph(extensions: Mapping[str, ModuleType], /) -> Dict[str, Set[str]]:
+    """Works out which extensions import which, from their source.
+
+    Imports are followed through modules that aren't extensions themselves, like a shared `snipescommon`,
+    but not into the standard library or installed packages.
+
+    Parameters
+    ----------
+    extensions : Mapping[str, ModuleType]
+        The loaded extensions, usually `bot.extensions`.
+
+    Returns
+    -------
+    Dict[str, Set[str]]
+        Each extension's name mapped to the names of the extensions it depends on.
+    """
+    walker = _ImportWalker(extensions)
+    return {name: walker.walk(name)[0] for name in extensions}
+
+
+def _forget_module(name: str, /) -> None:
+    # Removes a module so the next import of it runs it again. `from package import module` checks the
+    # package's attributes before sys.modules, so it's removed from there too.
+    module = sys.modules.pop(name, None)
+    parent_name, _, child = name.rpartition(".")
+    if module is not None and (parent := sys.modules.get(parent_name)) is not None and getattr(parent, child, None) is module:
+        delattr(parent, child)
+
+
+def _forget_stale_modules(walker: _ImportWalker, name: str, reloaded: Set[str], forgotten: Set[str]) -> None:
+    # Modules between an extension and ones that were just reloaded still hold the old versions,
+    # so they're removed from sys.modules and imported again when the extension is.
+    # Each is only removed once, so extensions reloading at the same time share the new copy.
+    for module in walker.walk(name)[1] - forgotten:
+        if walker.walk(module)[0] & reloaded:
+            _forget_module(module)
+            forgotten.add(module)
+
+
+async def _reload_one(bot: commands.Bot, name: str) -> ReloadResult:
+    start = time.perf_counter()
+    try:
+        await bot.reload_extension(name) # Puts the old module back if the new one fails.
+    except Exception as error:
+        _logger.warning(f"Reloading extension {name} failed", exc_info=error)
+        return ReloadResult(name, elapsed=time.perf_counter() - start, error=error)
+    return ReloadResult(name, elapsed=time.perf_counter() - start)
+
+
+def _plan_reload(extensions: Mapping[str, ModuleType], names: List[str], changed: Set[str]) -> Tuple[_ImportWalker, Dict[str, Set[str]], Set[str]]:
+    # Works out what reloading `names` involves, reading every file it needs to up front. This reads files, so it's run in a thread.
+    # Returns the walker with everything it will be asked about cached, each extension's dependencies among `names`,
+    # and the modules that changed or import ones that did, which have to be imported again.
+    wanted = set(names)
+    walker = _ImportWalker(extensions)
+    depends = {name: walker.walk(name)[0] & wanted for name in names}
+
+    local: Set[str] = set()
+    for name in names:
+        local |= walker.walk(name)[1]
+
+    stale = {module for module in local if module in changed or walker.walk(module)[1] & changed}
+    return walker, depends, stale
+
+
+async def reload_extensions(bot: commands.Bot, names: Iterable[str], /, *, changed: Iterable[str] = ()) -> List[ReloadResult]:
+    """coro that reloads extensions, each after the extensions it depends on, and as many at once as that allows.
+
+    An extension that fails to reload keeps running its previously loaded module,
+    and the extensions depending on it aren't reloaded so they keep using it too.
+
+    Parameters
+    ----------
+    bot : commands.Bot
+        The bot the extensions are loaded on.
+    names : Iterable[str]
+        The extensions to reload.
+    changed : Iterable[str], optional
+        Modules that aren't extensions but changed on disk, like a shared `snipescommon`. They, and the modules
+        importing them, are imported again by the extensions, rather than the extensions getting the copies already loaded.
+
+    Returns
+    -------
+    List[ReloadResult]
+        How each extension went, in the order they finished.
+    """
+    names = list(dict.fromkeys(names))
+    walker, depends, stale = await asyncio.to_thread(_plan_reload, dict(bot.extensions), names, set(changed))
+
+    for module in stale: # reload_extension only removes an extension's own modules.
+        _forget_module(module)
+
+    sorter = graphlib.TopologicalSorter(depends)
+    try:
+        sorter.prepare()
+    except graphlib.CycleError as error:
+        _logger.warning(f"Extensions import each other ({' -> '.join(error.args[1])}), reloading them one at a time")
+        sorter = graphlib.TopologicalSorter({name: {previous} for previous, name in zip(names, names[1:])})
+        sorter.prepare()
+
+    results: Dict[str, ReloadResult] = {}
+    running: Dict[asyncio.Task[ReloadResult], str] = {}
+    reloaded: Set[str] = set()
+    forgotten: Set[str] = set(stale)
+
+    try:
+        while sorter.is_active():
+            for name in sorter.get_ready():
+                failed = next((dep for dep in depends[name] if dep in results and not results[dep].ok), None)
+                if failed is not None:
+                    results[name] = ReloadResult(name, blocked_by=failed)
+                    sorter.done(name)
+                else:
+                    _forget_stale_modules(walker, name, reloaded, forgotten)
+                    running[asyncio.create_task(_reload_one(bot, name))] = name
+
+            if running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = results[running.pop(task)] = task.result()
+                    if result.ok:
+                        reloaded.add(result.name)
+                    sorter.done(result.name)
+    except BaseException:
+        if running: # Let started reloads finish or roll back, rather than leave extensions half loaded.
+            await asyncio.wait(running)
+        raise
+
+    return list(results.values())
+
+
+@dataclass(slots=True)
+class _FileState:
+    mtime_ns: int
+    size: int
+    digest: bytes
+
+
+def _file_state(path: Path) -> _FileState:
+    stat = path.stat()
+    return _FileState(stat.st_mtime_ns, stat.st_size, hashlib.sha1(path.read_bytes()).digest())
+
+
+class ExtensionWatcher:
+    """Notices when the files of loaded extensions, or the local modules they import, change on disk.
+
+    Files are only hashed when their modification time or size changes, and only count as changed
+    if their contents did, so saving a file without editing it doesn't cause a reload.
+    """
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._files: Dict[str, Tuple[Path, _FileState]] = {} # module name -> its file and how it was last seen
+        self.extensions: Set[str] = set() # the extensions loaded when `track` was last run
+
+    def track(self) -> None:
+        """Starts watching what's loaded now, keeping what was already known about files still being watched.
+
+        This reads files, so it should be run in a thread.
+        """
+        extensions = dict(self.bot.extensions)
+        self.extensions = set(extensions)
+        walker = _ImportWalker(extensions)
+        modules: Set[str] = set()
+        for name in self.extensions:
+            modules.add(name)
+            modules.update(walker.walk(name)[1])
+
+        files: Dict[str, Tuple[Path, _FileState]] = {}
+        for name in modules:
+            if name in self._files:
+                files[name] = self._files[name]
+            elif (module := sys.modules.get(name)) is not None and (path := _source_path(module)) is not None:
+                try:
+                    files[name] = (path, _file_state(path))
+                except OSError:
+                    pass
+
+        self._files = files
+
+    def scan(self) -> Set[str]:
+        """Checks the watched files, returning the names of the modules whose contents changed since the last check.
+
+        This reads files, so it should be run in a thread.
+        """
+        changed: Set[str] = set()
+        for name, (path, state) in self._files.items():
+            try:
+                stat = path.stat()
+                if (stat.st_mtime_ns, stat.st_size) == (state.mtime_ns, state.size):
+                    continue
+                new = _file_state(path)
+            except OSError: # Deleted, or part way through being replaced. Checked again next time.
+                continue
+
+            if new.digest != state.digest:
+                changed.add(name)
+            self._files[name] = (path, new)
+
+        return changed
+
+    def affected(self, modules: Iterable[str], /) -> Set[str]:
+        """The extensions to reload when modules change: the changed extensions, the extensions importing
+        changed modules, and everything depending on those.
+
+        This reads files, so it should be run in a thread.
+        """
+        modules = set(modules)
+        extensions = dict(self.bot.extensions) # A copy, so extensions loading meanwhile don't change it while it's read.
+        walker = _ImportWalker(extensions)
+        walks = {name: walker.walk(name) for name in extensions}
+
+        affected = {name for name, (_, via) in walks.items() if name in modules or via & modules}
+        while dependents := {name for name, (depends, _) in walks.items() if name not in affected and depends & affected}:
+            affected |= dependents
+
+        return affected
+
+
+@dataclass(slots=True)
+class LazyCommand:
+    """A prefix command found in an extension's source."""
+    name: str
+    aliases: List[str]
+    help: Optional[str] # the first line of its docstring
+
+
+def _dotted(node: ast.expr) -> str:
+    # `commands.Cog.listener` for a decorator like `@commands.Cog.listener()`, "" for anything that isn't a plain name.
+    if isinstance(node, ast.Call):
+        return _dotted(node.func)
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted(node.value)}.{node.attr}"
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _keyword(call: ast.Call, name: str) -> Optional[ast.expr]:
+    return next((keyword.value for keyword in call.keywords if keyword.arg == name), None)
+
+
+def lazy_commands(name: str, /) -> Optional[List[LazyCommand]]:
+    """Finds the top level prefix commands of an extension from its source, without importing it.
+
+    This reads the extension's file, so it should be run in a thread.
+
+    Parameters
+    ----------
+    name : str
+        The extension's name.
+
+    Returns
+    -------
+    Optional[List[LazyCommand]]
+        Its commands, or None if it can't wait until one of them is used to be loaded:
+        it has listeners, app commands, or tasks, which need it loaded from the start, or no commands at all.
+
+    Raises
+    ------
+    commands.ExtensionNotFound
+        There is no extension with that name.
+    """
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        raise commands.ExtensionNotFound(name)
+
+    try:
+        tree = ast.parse(Path(spec.origin).read_bytes(), spec.origin)
+    except (OSError, SyntaxError):
+        return None
+
+    found: List[LazyCommand] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        for decorator in node.decorator_list:
+            dotted = _dotted(decorator)
+            if dotted.endswith(".listener") or dotted.startswith("app_commands.") or ".hybrid_" in dotted or dotted.startswith("tasks."):
+                return None
+            if dotted not in ("commands.command", "commands.group"): # Subcommands are found through their group.
+                continue
+
+            command_name, aliases = node.name, []
+            if isinstance(decorator, ast.Call):
+                given = _keyword(decorator, "name") or next(iter(decorator.args), None)
+                if isinstance(given, ast.Constant) and isinstance(given.value, str):
+                    command_name = given.value
+                if isinstance(given_aliases := _keyword(decorator, "aliases"), (ast.List, ast.Tuple)):
+                    aliases = [alias.value for alias in given_aliases.elts if isinstance(alias, ast.Constant) and isinstance(alias.value, str)]
+
+            doc = ast.get_docstring(node)
+            found.append(LazyCommand(command_name, aliases, doc.splitlines()[0] if doc else None))
+
+    return found or None
+
+
+@dataclass(slots=True)
+class LoadTimes:
+    """How long each part of loading an extension took, in seconds."""
+    name: str
+    import_time: float # running the module, including everything it imported for the first time
+    setup_time: float # its setup function, not counting cog_load
+    cog_load_time: float # adding its cogs, which runs their cog_load
+    slowest_import: Optional[str] = None # the slowest module it imported for the first time
+    slowest_import_time: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.import_time + self.setup_time + self.cog_load_time
+
+
+class _TimedLoader:
+    # Wraps a module's loader to time running it, then puts the real loader back.
+    def __init__(self, loader: Any, times: Dict[str, float]) -> None:
+        self.loader = loader
+        self.times = times
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+    def exec_module(self, module: ModuleType) -> None:
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.times[module.__name__] = time.perf_counter() - start # Includes the modules it imports.
+            module.__loader__ = self.loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self.loader
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    # Times every module imported while it's first on sys.meta_path.
+    def __init__(self) -> None:
+        self.times: Dict[str, float] = {} # module name -> seconds it took to run
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            if (spec := finder.find_spec(fullname, path, target)) is not None:
+                break
+        else:
+            return None
+
+        if hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self.times)
+        return spec
+
+
+async def load_extension_timed(bot: commands.Bot, name: str, /) -> LoadTimes:
+    """coro that loads an extension like `bot.load_extension`, timing its import, setup and cog_load.
+
+    Modules imported by an extension are counted against the first extension that imports them,
+    so this should be used to load extensions one at a time.
+
+    Parameters
+    ----------
+    bot : commands.Bot
+        The bot to load the extension on.
+    name : str
+        The extension to load.
+
+    Returns
+    -------
+    LoadTimes
+        How long each part took.
+
+    Raises
+    ------
+    commands.ExtensionError
+        Loading the extension failed, see `bot.load_extension`.
+    """
+    timer = _ImportTimer()
+    add_cog = bot.add_cog
+    cog_load_time = 0.0
+
+    async def timed_add_cog(*args: Any, **kwargs: Any) -> None:
+        nonlocal cog_load_time
+        start = time.perf_counter()
+        try:
+            await add_cog(*args, **kwargs)
+        finally:
+            cog_load_time += time.perf_counter() - start
+
+    sys.meta_path.insert(0, timer)
+    bot.add_cog = timed_add_cog # type: ignore
+    start = time.perf_counter()
+    try:
+        await bot.load_extension(name)
+    finally:
+        elapsed = time.perf_counter() - start
+        del bot.add_cog # Back to the method.
+        sys.meta_path.remove(timer)
+
+    import_time = timer.times.get(name, 0.0)
+    imported = {module: seconds for module, seconds in timer.times.items() if module != name}
+    slowest = max(imported, key=imported.__getitem__, default=None)
+
+    return LoadTimes(
+        name, import_time=import_time, setup_time=max(elapsed - import_time - cog_load_time, 0.0), cog_load_time=cog_load_time,
+        slowest_import=slowest, slowest_import_time=imported.get(slowest, 0.0) if slowest is not None else 0.0,
+    )
@@ -0,0 +1,62 @@
+"""
+Copyright 2022-present fretgfr
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Sequence
+
+import asqlite
+
+__all__ = ["apply_migrations"]
+
+_logger = logging.getLogger(__name__)
+
+
+async def apply_migrations(db: asqlite.Connection, migrations: Sequence[str], /) -> int:
+    """Applies the migrations a database doesn't have yet, each in its own transaction.
+
+    The database's `user_version` is the number of migrations applied so far,
+    so migrations must only ever be appended to.
+
+    Parameters
+    ----------
+    db : asqlite.Connection
+        The database to migrate.
+    migrations : Sequence[str]
+        The SQL scripts to apply, in order.
+
+    Returns
+    -------
+    int
+        The number of migrations applied.
+    """
+    async with db.cursor() as cur:
+        await cur.execute("PRAGMA user_version")
+        res = await cur.fetchone()
+
+    current = res[0]
+
+    for version, script in enumerate(migrations[current:], start=current + 1):
+        _logger.info(f"Applying migration {version}")
+        await db.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {version};\nCOMMIT;")
+
+    return max(len(migrations) - current, 0)
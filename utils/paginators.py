@@ -21,15 +21,31 @@ SOFTWARE.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import mmap
+import re
+import tempfile
 import traceback
+from array import array
 from abc import ABC, abstractmethod
-from typing import Generic, List, Optional, TypeVar, Any, Dict
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar, Any, Dict
 
 import discord
 from discord.ext import commands
 
+from .views import TrackedView
+
 T = TypeVar('T')
+E = TypeVar('E')
+
+PAGE_CACHE_SIZE = 5 # rendered pages kept by each paginator
+ATTACHMENT_THRESHOLD = 256 * 1024 # bytes of text past which `send_text` sends a file instead of paginating
+DM_UPLOAD_LIMIT = 8 * 1024 * 1024 # bytes, outside of guilds
+SEARCH_SCAN_LIMIT = 250 # pages a single search will read that haven't been indexed yet
+
+_WORD_RE = re.compile(r"\w+")
 
 _logger = logging.getLogger(__name__)
 
@@ -48,20 +64,392 @@ class ToPageModal(discord.ui.Modal, title="Go to page..."):
         self.interaction = interaction
         self.stop()
 
-class BasePaginatorView(ABC, Generic[T], discord.ui.View):
+class SearchModal(discord.ui.Modal, title="Search pages..."):
+    query = discord.ui.TextInput(label="Search", placeholder="Words to look for", min_length=1, max_length=100) # type: ignore
+
+    def __init__(self, *, default: Optional[str] = None) -> None:
+        super().__init__()
+        self.query.default = default
+
+    async def on_submit(self, interaction: discord.Interaction) -> None:
+        self.interaction = interaction
+        self.stop()
+
+def page_text(page: Any, /) -> str:
+    """Gets the searchable text of a page, the text of an Embed or a page's string form."""
+    if isinstance(page, discord.Embed):
+        parts = [page.title, page.description, page.footer.text, page.author.name]
+        for embed_field in page.fields:
+            parts += [embed_field.name, embed_field.value]
+        return "\n".join(part for part in parts if part)
+
+    return str(page)
+
+class PageSource(ABC, Generic[T]):
+    """A base class for supplying pages to a paginator on demand.
+
+    Subclass this when building every page up front is too expensive,
+    e.g. when pages are read from a database one at a time.
+    """
+
+    def get_max_pages(self) -> Optional[int]:
+        """The total number of pages this source can provide.
+
+        Returns
+        -------
+        Optional[int]
+            The number of pages, must be greater than 0.
+            None if it isn't known yet, `get_page` should raise IndexError for pages past the end.
+        """
+        return None
+
+    @abstractmethod
+    async def get_page(self, index: int) -> T:
+        """coro that gets the page at a given index.
+
+        Parameters
+        ----------
+        index : int
+            The 0 based index of the page to get.
+
+        Returns
+        -------
+        T
+            The page data for that index.
+        """
+        ...
+
+    async def close(self) -> None:
+        """coro called when the paginator using this source is done with it.
+
+        Override this to release anything the source holds open, by default does nothing.
+        """
+        return None
+
+
+class ListPageSource(PageSource[T]):
+    """A PageSource over a list of pages that have already been built."""
+    def __init__(self, entries: List[T]) -> None:
+        self.entries = entries
+
+    def get_max_pages(self) -> int:
+        return len(self.entries)
+
+    async def get_page(self, index: int) -> T:
+        return self.entries[index]
+
+
+class AsyncIteratorPageSource(PageSource[T], Generic[E, T]):
+    """A PageSource over the entries of an async iterator, e.g. rows streamed out of a database.
+
+    Entries are only read as far as the pages asked for, so the number of pages is unknown
+    until the iterator runs out. Iterators can't go backwards, so `factory` is called for a
+    fresh one when an earlier page is asked for, the paginator's page cache makes that rare.
+
+    Override `format_page` to turn a page's entries into a page.
+
+    Parameters
+    ----------
+    factory : Callable[[], AsyncIterator[E]]
+        Creates a new iterator over the entries, from the start.
+    per_page : int
+        The number of entries on each page.
+    """
+    def __init__(self, factory: Callable[[], AsyncIterator[E]], *, per_page: int) -> None:
+        self.factory = factory
+        self.per_page = per_page
+        self._iterator: Optional[AsyncIterator[E]] = None
+        self._next_index = 0 # the page the iterator is at
+        self._peeked: List[E] = [] # read ahead to tell whether there is another page
+        self._max_pages: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    def get_max_pages(self) -> Optional[int]:
+        return self._max_pages
+
+    async def get_page(self, index: int) -> T:
+        return await self.format_page(await self._entries(index), index)
+
+    async def _entries(self, index: int) -> List[E]:
+        async with self._lock:
+            if self._max_pages is not None and index >= self._max_pages:
+                raise IndexError(index)
+
+            if self._iterator is None or index < self._next_index:
+                await self._restart()
+
+            entries = await self._read_page()
+            while self._next_index <= index:
+                if self._max_pages is not None and index >= self._max_pages:
+                    raise IndexError(index)
+                entries = await self._read_page()
+
+        return entries
+
+    async def _restart(self) -> None:
+        await self.close()
+        self._iterator = self.factory()
+        self._next_index = 0
+        self._peeked = []
+
+    async def _read_page(self) -> List[E]:
+        # Reads the page at `_next_index` plus one entry, so we know the last page when we get to it.
+        assert self._iterator is not None
+
+        entries, self._peeked = self._peeked, []
+        while len(entries) <= self.per_page:
+            try:
+                entries.append(await self._iterator.__anext__())
+            except StopAsyncIteration:
+                self._max_pages = self._next_index + 1
+                break
+
+        if len(entries) > self.per_page:
+            self._peeked = entries[self.per_page:]
+            entries = entries[:self.per_page]
+
+        self._next_index += 1
+        return entries
+
+    async def close(self) -> None:
+        """coro that closes the current iterator, if it supports closing.
+
+        A later `get_page` starts a new one.
+        """
+        aclose = getattr(self._iterator, "aclose", None)
+        self._iterator = None
+        if aclose is not None:
+            await aclose()
+
+    @abstractmethod
+    async def format_page(self, entries: List[E], index: int) -> T:
+        """coro that turns the entries on a page into the page.
+
+        Parameters
+        ----------
+        entries : List[E]
+            The entries on the page, empty if the iterator had no entries at all.
+        index : int
+            The 0 based index of the page.
+
+        Returns
+        -------
+        T
+            The page data for that index.
+        """
+        ...
+
+
+class TextFilePageSource(PageSource[str]):
+    """A PageSource over text that may be far too large to keep in memory, e.g. the output of some code.
+
+    Write to it like a file (it can be passed to `contextlib.redirect_stdout`), the text is spooled to a
+    temporary file and split into pages on line boundaries as it's written. Only the offset of each page
+    is kept in memory, pages are read from a memory map of the file when they are asked for.
+
+    Call `finish` once everything has been written, and `close` when done with it.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum number of characters on a page, including the prefix and suffix.
+    prefix : str
+        Put before the text on every page, by default a codeblock.
+    suffix : str
+        Put after the text on every page.
+    """
+    def __init__(self, *, max_size: int = 2000, prefix: str = "```", suffix: str = "```") -> None:
+        self.prefix = prefix
+        self.suffix = suffix
+        self._limit = max_size - len(prefix) - len(suffix) - 2 # Newlines after the prefix and before the suffix.
+        assert self._limit > 0
+
+        self._file = tempfile.TemporaryFile()
+        self._map: Optional[mmap.mmap] = None
+        self._offsets = array("q", [0]) # where each page starts in the file
+        self._page_chars = 0 # characters on the page being written
+        self._partial = "" # the end of the last write, if it wasn't a whole line
+        self.size = 0 # bytes written
+
+    def write(self, text: str) -> int:
+        if self._map is not None:
+            raise ValueError("Can't write to a finished TextFilePageSource.")
+
+        *lines, self._partial = (self._partial + text).split("\n")
+        for line in lines:
+            self._add_line(line + "\n")
+
+        # Don't let a line that never ends build up in memory.
+        while len(self._partial) > self._limit:
+            self._add_line(self._partial[:self._limit])
+            self._partial = self._partial[self._limit:]
+
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def _add_line(self, line: str, /) -> None:
+        while line:
+            piece, line = line[:self._limit], line[self._limit:] # Lines longer than a page are split.
+
+            if self._page_chars and self._page_chars + len(piece) > self._limit:
+                self._offsets.append(self.size)
+                self._page_chars = 0
+
+            data = piece.encode()
+            self._file.write(data)
+            self.size += len(data)
+            self._page_chars += len(piece)
+
+    def finish(self) -> None:
+        """Ends writing and maps what was written, so that pages can be read. Does nothing if already finished."""
+        if self._map is not None or self._file.closed:
+            return
+
+        if self._partial:
+            self._add_line(self._partial)
+            self._partial = ""
+
+        self._file.flush()
+        if self.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get_max_pages(self) -> int:
+        return len(self._offsets)
+
+    async def get_page(self, index: int) -> str:
+        return f"{self.prefix}\n{await self.get_page_text(index)}\n{self.suffix}"
+
+    async def get_page_text(self, index: int) -> str:
+        self.finish()
+
+        if not 0 <= index < len(self._offsets):
+            raise IndexError(index)
+
+        if self._map is None:
+            return ""
+
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self.size
+        return self._map[self._offsets[index]:end].decode(errors="replace").rstrip("\n")
+
+    def to_file(self, filename: str, /) -> discord.File:
+        """Gets all of the text as a file to send, without reading it into memory."""
+        self.finish()
+        self._file.seek(0)
+        return discord.File(self._file, filename=filename) # type: ignore # BufferedRandom is a readable file.
+
+    async def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class PageSearchIndex:
+    """An inverted index from words to the pages of a source they are on.
+
+    Pages are only read when a search gets to them, and each page is read once,
+    after that searches are answered from the index.
+
+    Parameters
+    ----------
+    source : PageSource[Any]
+        The source being searched, for its number of pages.
+    get_page : Callable[[int], Awaitable[Any]]
+        Gets a page by index, e.g. a paginator's `get_page` so pages read by a search
+        land in its cache and the page found is shown without being read again.
+    """
+    def __init__(self, source: PageSource[Any], get_page: Callable[[int], Awaitable[Any]], /) -> None:
+        self.source = source
+        self.get_page = get_page
+        self._postings: Dict[str, Set[int]] = {} # word -> pages it's on
+        self._indexed: Set[int] = set()
+
+    async def _index_page(self, index: int, /) -> None:
+        for word in set(_WORD_RE.findall(page_text(await self.get_page(index)).casefold())):
+            self._postings.setdefault(word, set()).add(index)
+        self._indexed.add(index)
+
+    async def find_next(self, query: str, /, *, after: int, scan_limit: int = SEARCH_SCAN_LIMIT) -> Tuple[Optional[int], bool]:
+        """coro that finds the next page that has every word in a query on it, wrapping around to the start.
+
+        Parameters
+        ----------
+        query : str
+            The words to look for, matched as whole words ignoring case.
+        after : int
+            The page to search after.
+        scan_limit : int, optional
+            How many pages that haven't been indexed yet to read before giving up.
+
+        Returns
+        -------
+        Tuple[Optional[int], bool]
+            The matching page, or None, and whether every page was searched.
+        """
+        words = set(_WORD_RE.findall(query.casefold()))
+        if not words:
+            return None, True
+
+        scanned = 0
+        index = after
+        wrapped = False
+
+        while True:
+            index += 1
+            max_pages = self.source.get_max_pages()
+
+            if max_pages is not None and index >= max_pages:
+                if wrapped:
+                    return None, True
+                index, wrapped = 0, True
+
+            if wrapped and index > after:
+                return None, True
+
+            if index not in self._indexed:
+                if scanned >= scan_limit:
+                    return None, False
+
+                try:
+                    await self._index_page(index)
+                except IndexError: # The end of a source that didn't know its length.
+                    if wrapped:
+                        return None, True
+                    index, wrapped = -1, True
+                    continue
+
+                scanned += 1
+
+            if all(index in self._postings.get(word, ()) for word in words):
+                return index, True
+
+
+class BasePaginatorView(ABC, Generic[T], TrackedView):
     """A base class for Paginator Views, you'll need to override some methods with your own behavior"""
-    def __init__(self, *, owner: discord.Member | discord.User, pages: List[T], timeout: float = 30.0) -> None:
+    def __init__(self, *, owner: discord.Member | discord.User, pages: List[T] | PageSource[T], timeout: float = 30.0) -> None:
         super().__init__(timeout=timeout)
-        assert len(pages) > 0
         self.message: discord.Message | None = None # should be set when the paginator is sent.
         self.owner = owner
-        self.pages = pages
-        self.max_index = len(pages) - 1 # List indecies
+        self.source: PageSource[T] = pages if isinstance(pages, PageSource) else ListPageSource(pages)
+        self.max_index: Optional[int] = None # List indecies, None until the source knows how many pages it has
+        self._refresh_max_index()
+        assert self.max_index is None or self.max_index >= 0
         self.current_index = 0
+        self._page_cache: OrderedDict[int, T] = OrderedDict()
+        self._search_index: Optional[PageSearchIndex] = None # built as it's searched
+        self._last_query: Optional[str] = None
 
         self._update_state()
 
+    def _refresh_max_index(self) -> None:
+        max_pages = self.source.get_max_pages()
+        self.max_index = max_pages - 1 if max_pages is not None else None
+
     async def on_timeout(self) -> None:
+        await self.source.close()
+
         if self.message is not None:
             try:
                 await self.message.edit(view=None)
@@ -135,13 +523,14 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
 
     @discord.ui.button(emoji="➡️", style=discord.ButtonStyle.green)
     async def fwd_btn(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
-        if self.current_index < self.max_index:
+        if self.max_index is None or self.current_index < self.max_index:
             self.current_index += 1
         await self.update(interaction)
 
     @discord.ui.button(emoji="⏭️", style= discord.ButtonStyle.gray)
     async def to_last_btn(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
-        self.current_index = self.max_index
+        if self.max_index is not None: # Disabled until the last page is known.
+            self.current_index = self.max_index
         await self.update(interaction)
 
     @discord.ui.button(label="Go To Page...", style=discord.ButtonStyle.blurple)
@@ -149,7 +538,7 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
         if self.message is None:
             return
 
-        modal = ToPageModal(max_pages=self.max_index + 1) # Their index is one higher than ours.
+        modal = ToPageModal(max_pages=self.max_index + 1 if self.max_index is not None else None) # Their index is one higher than ours.
         await interaction.response.send_modal(modal)
         timed_out = await modal.wait()
 
@@ -166,7 +555,7 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
             return
 
         value = int(value)
-        if not 0 < value <= self.max_index + 1:
+        if not 0 < value <= (self.max_index + 1 if self.max_index is not None else value):
             if not modal.interaction.response.is_done():
                 error = modal.new_page.placeholder.replace("Enter", "Expected") # type: ignore
                 await modal.interaction.response.send_message(error, ephemeral=True)
@@ -175,6 +564,43 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
         self.current_index = value - 1 # Our index is one lower than theirs
         await self.update(modal.interaction)
 
+    @discord.ui.button(label="Search...", style=discord.ButtonStyle.blurple)
+    async def search_modal(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        if self.message is None:
+            return
+
+        modal = SearchModal(default=self._last_query)
+        await interaction.response.send_modal(modal)
+        timed_out = await modal.wait()
+
+        if timed_out:
+            await interaction.followup.send('Took too long', ephemeral=True)
+            return
+        elif self.is_finished():
+            await modal.interaction.response.send_message('Took too long', ephemeral=True)
+            return
+
+        query = self._last_query = str(modal.query.value)
+
+        # Reading unindexed pages can take longer than Discord waits for a response.
+        await modal.interaction.response.defer()
+
+        if self._search_index is None:
+            self._search_index = PageSearchIndex(self.source, self.get_page)
+
+        found, complete = await self._search_index.find_next(query, after=self.current_index)
+
+        if found is None:
+            if complete:
+                error = f"No pages match {query!r}."
+            else:
+                error = f"No match in the next {SEARCH_SCAN_LIMIT} pages, search again to keep looking."
+            await modal.interaction.followup.send(error, ephemeral=True)
+            return
+
+        self.current_index = found
+        await self.update(modal.interaction)
+
     @discord.ui.button(label="Quit", style=discord.ButtonStyle.red)
     async def stop_btn(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
         try:
@@ -182,6 +608,7 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
         except NotImplementedError:
             await interaction.response.edit_message(view=None)
         self.stop()
+        await self.source.close()
 
     def _update_state(self) -> None:
         _logger.debug(f"{self!r} _update called.")
@@ -193,7 +620,7 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
         else:
             self.fwd_btn.style = discord.ButtonStyle.green
             self.fwd_btn.disabled = False
-            self.to_last_btn.disabled = False
+            self.to_last_btn.disabled = self.max_index is None
 
         if self.current_index == 0:
             self.back_btn.style = discord.ButtonStyle.grey
@@ -204,18 +631,72 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
             self.back_btn.disabled = False
             self.to_first_btn.disabled = False
 
-        self.count_btn.label = f"{self.current_index + 1}/{len(self.pages)}" # Start at 1 instead of 0.
+        total = self.max_index + 1 if self.max_index is not None else "?"
+        self.count_btn.label = f"{self.current_index + 1}/{total}" # Start at 1 instead of 0.
 
     async def update(self, interaction: discord.Interaction) -> None:
+        await self.get_current_page() # May find the end of the source, so the buttons are right. Cached for show_page.
         self._update_state()
         await self.show_page(interaction)
 
+    @property
+    def pages(self) -> List[T]:
+        """The pages of a list backed paginator. Use `get_current_page` for other sources."""
+        assert isinstance(self.source, ListPageSource)
+        return self.source.entries
+
     @property
     def current_page(self) -> T:
         return self.pages[self.current_index]
 
+    async def get_page(self, index: int) -> T:
+        """coro that gets a page, from this paginator's cache of recent pages if possible.
+
+        Parameters
+        ----------
+        index : int
+            The 0 based index of the page to get.
+
+        Returns
+        -------
+        T
+            The page data for that index.
+        """
+        if index in self._page_cache:
+            self._page_cache.move_to_end(index)
+            return self._page_cache[index]
+
+        page = await self.source.get_page(index)
+        self._refresh_max_index() # Sources that didn't know their length may have found the end.
+
+        self._page_cache[index] = page
+        if len(self._page_cache) > PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+
+        return page
+
+    async def get_current_page(self) -> T:
+        """coro that gets the current page from this paginator's source.
+
+        If the current page is past the end of a source that didn't know its length,
+        moves back to the last page there is.
+        """
+        try:
+            return await self.get_page(self.current_index)
+        except IndexError:
+            if self.current_index == 0:
+                raise
+
+            self._refresh_max_index()
+            if self.max_index is None:
+                self.max_index = self.current_index - 1 # At most, the source will say when it knows.
+            self.current_index = self.max_index
+            self._update_state()
+
+            return await self.get_page(self.current_index)
+
     @classmethod
-    async def start(cls, ctx_or_interaction: commands.Context[commands.Bot] | discord.Interaction, /, owner: discord.Member | discord.User, pages: List[T], timeout: float = 30.0) -> BasePaginatorView[T]:
+    async def start(cls, ctx_or_interaction: commands.Context[commands.Bot] | discord.Interaction, /, owner: discord.Member | discord.User, pages: List[T] | PageSource[T], timeout: float = 30.0) -> BasePaginatorView[T]:
         """A method that creates and starts the paginator
 
         Parameters
@@ -224,13 +705,14 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
             The context to start in
         owner : discord.Member | discord.User
             The owner of the paginator
-        pages : List[Any]
-            The page data for this paginator
+        pages : List[Any] | PageSource[Any]
+            The page data for this paginator, or a source to fetch it from.
         timeout : float, optional
             The paginator timeout, by default 30.0
         """
         view = cls(owner=owner, pages=pages, timeout=timeout)
         initial = await view.format_page()
+        view._update_state() # Getting the first page may have told us how many there are.
 
         args: List[str] = []
         kwargs: Dict[str, Any] = {"view": view}
@@ -273,7 +755,8 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
         of the next page, and update the view on the message as well
         likely through `interaction.response.edit_message
         (i.e. interaction.response.edit_message(embed=new_embed, view=self))
-        current page data is accessed via `self.current_page` or a `self.format_page` coro if you've overwritten it.
+        or `interaction.edit_original_response` if the interaction was already deferred, as searches are.
+        current page data is accessed via `self.get_current_page()` or a `self.format_page` coro if you've overwritten it.
 
         Parameters
         ----------
@@ -296,13 +779,65 @@ class BasePaginatorView(ABC, Generic[T], discord.ui.View):
 
 
 class EmbedPaginator(BasePaginatorView[discord.Embed]):
-    def __init__(self, *, owner: discord.Member | discord.User, pages: List[discord.Embed], timeout: float = 30) -> None:
+    def __init__(self, *, owner: discord.Member | discord.User, pages: List[discord.Embed] | PageSource[discord.Embed], timeout: float = 30) -> None:
         super().__init__(owner=owner, pages=pages, timeout=timeout)
 
     async def format_page(self) -> discord.Embed:
-        return self.current_page
+        return await self.get_current_page()
 
     async def show_page(self, interaction: discord.Interaction) -> None:
         current_page = await self.format_page()
-        await interaction.response.edit_message(embed=current_page, view=self)
+        if interaction.response.is_done():
+            await interaction.edit_original_response(embed=current_page, view=self)
+        else:
+            await interaction.response.edit_message(embed=current_page, view=self)
 
+
+class TextPaginator(BasePaginatorView[str]):
+    def __init__(self, *, owner: discord.Member | discord.User, pages: List[str] | PageSource[str], timeout: float = 30) -> None:
+        super().__init__(owner=owner, pages=pages, timeout=timeout)
+
+    async def format_page(self) -> str:
+        return await self.get_current_page()
+
+    async def show_page(self, interaction: discord.Interaction) -> None:
+        current_page = await self.format_page()
+        if interaction.response.is_done():
+            await interaction.edit_original_response(content=current_page, view=self)
+        else:
+            await interaction.response.edit_message(content=current_page, view=self)
+
+
+async def send_text(ctx: commands.Context[commands.Bot], source: TextFilePageSource, /, *, filename: str = "output.txt", timeout: float = 300.0) -> None:
+    """coro that sends the text written to a TextFilePageSource, then closes it once it isn't needed.
+
+    One page is sent as a message. Text over `ATTACHMENT_THRESHOLD` bytes is sent as a file if
+    it fits under the upload limit, anything else is paginated.
+
+    Parameters
+    ----------
+    ctx : commands.Context
+        The context to send in, its author owns the paginator.
+    source : TextFilePageSource
+        The text to send.
+    filename : str, optional
+        The name of the file, if the text is sent as one.
+    timeout : float, optional
+        The paginator timeout, by default 300.0
+    """
+    source.finish()
+
+    upload_limit = ctx.guild.filesize_limit if ctx.guild is not None else DM_UPLOAD_LIMIT
+
+    if source.size == 0:
+        await source.close()
+    elif source.get_max_pages() == 1:
+        await ctx.send(await source.get_page(0))
+        await source.close()
+    elif ATTACHMENT_THRESHOLD < source.size <= upload_limit:
+        try:
+            await ctx.send(f"Output is {source.size:,} bytes, sending it as a file.", file=source.to_file(filename))
+        finally:
+            await source.close()
+    else:
+        await TextPaginator.start(ctx, owner=ctx.author, pages=source, timeout=timeout)
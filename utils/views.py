@@ -0,0 +1,133 @@
+"""
+Copyright 2022-present fretgfr
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+import discord
+
+__all__ = ["TrackedView", "ViewRegistry", "registry"]
+
+MAX_LIVE_VIEWS = 5_000 # past this the least recently used views are timed out early
+SWEEP_INTERVAL = 5.0 # seconds between checks for timed out views
+
+_logger = logging.getLogger(__name__)
+
+
+class ViewRegistry:
+    """Keeps track of live `TrackedView`s and times them out.
+
+    One sweeper task expires every idle view, rather than each view running a timer of its own,
+    and the number of live views is capped, the least recently used ones are timed out first.
+    The sweeper only runs while there are views to sweep.
+    """
+    def __init__(self, *, max_views: int = MAX_LIVE_VIEWS, sweep_interval: float = SWEEP_INTERVAL) -> None:
+        self.max_views = max_views
+        self.sweep_interval = sweep_interval
+        self._views: OrderedDict[str, TrackedView] = OrderedDict() # view id -> view, least recently used first
+        self._sweeper: Optional[asyncio.Task[None]] = None
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def add(self, view: TrackedView, /) -> None:
+        self._views[view.id] = view
+
+        while len(self._views) > self.max_views:
+            _, oldest = self._views.popitem(last=False)
+            _logger.debug(f"Evicting {oldest!r}, {self.max_views} views are live.")
+            self.evictions += 1
+            oldest._expire()
+
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep(), name="view-registry-sweeper")
+
+    def touch(self, view: TrackedView, /) -> None:
+        """Marks a view as just used, pushing back its timeout and eviction."""
+        view.last_used = time.monotonic()
+        if view.id in self._views:
+            self._views.move_to_end(view.id)
+
+    def discard(self, view: TrackedView, /) -> None:
+        self._views.pop(view.id, None)
+
+    def counts(self) -> Dict[str, int]:
+        """The number of live views of each type, by class name."""
+        return dict(Counter(type(view).__name__ for view in self._views.values()))
+
+    async def _sweep(self) -> None:
+        while self._views:
+            await asyncio.sleep(self.sweep_interval)
+
+            now = time.monotonic()
+            expired = [
+                view for view in self._views.values()
+                if view.idle_timeout is not None and now - view.last_used >= view.idle_timeout
+            ]
+
+            for view in expired:
+                self.discard(view)
+                view._expire()
+
+# Shared by every extension, it lives as long as the process rather than any one cog.
+registry = ViewRegistry()
+
+
+class TrackedView(discord.ui.View):
+    """A View that is timed out by the shared `registry` instead of a timer of its own.
+
+    Use it like `discord.ui.View`, `timeout` is how long the view can go without
+    being interacted with and `on_timeout` is called when it runs out. Views can
+    also time out early if too many are live at once.
+    """
+    def __init__(self, *, timeout: Optional[float] = 180.0) -> None:
+        super().__init__(timeout=None) # The registry handles timing out.
+        self.idle_timeout = timeout
+        self.last_used = time.monotonic()
+        registry.add(self)
+
+    async def _scheduled_task(self, item: discord.ui.Item, interaction: discord.Interaction) -> None:
+        # discord.py's hook for every interaction on this view, mirrored so only interactions
+        # that pass `interaction_check` push back the timeout. Anyone else's clicks don't keep it alive.
+        try:
+            item._refresh_state(interaction, interaction.data)  # type: ignore
+
+            if not await self.interaction_check(interaction):
+                return
+
+            registry.touch(self)
+            await item.callback(interaction)
+        except Exception as e:
+            await self.on_error(interaction, e, item)
+
+    def _expire(self) -> None:
+        # Stops the view the way discord.py does on a timeout, so `wait` returns True and `on_timeout` is called.
+        self._dispatch_timeout()
+
+    def stop(self) -> None:
+        super().stop()
+        registry.discard(self)